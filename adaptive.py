@@ -0,0 +1,119 @@
+from __future__ import annotations
+from typing import Callable, Optional, Tuple
+from lazy import lazy_import
+import output
+
+np = lazy_import('numpy')
+
+
+# Количество точек грубой сетки по умолчанию и наименьший разумный бюджет
+INITIAL_POINTS = 65
+MIN_BUDGET = INITIAL_POINTS
+
+
+def array_evaluator(func: Callable) -> Callable[[np.ndarray], np.ndarray]:
+    """
+    Вычисление функции на массиве: векторизованный путь, если он есть,
+    иначе поточечно с NaN для точек, где функция выбрасывает исключение
+    """
+    if hasattr(func, 'vectorized'):
+        return func.vectorized
+
+    def evaluate(x: np.ndarray) -> np.ndarray:
+        y = np.empty(len(x))
+        for i, value in enumerate(x.tolist()):
+            try:
+                y[i] = func(value)
+            except Exception:
+                y[i] = np.nan
+        return y
+    return evaluate
+
+
+def adaptive_sample(func: Callable, a: float, b: float,
+                    tolerance: float = 1e-3,
+                    max_points: int = 10000,
+                    initial_points: int = INITIAL_POINTS,
+                    min_step: Optional[float] = None) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Адаптивная выборка точек: сгущение там, где функция быстро меняется
+
+    Начиная с равномерной грубой сетки, каждый интервал проверяется по
+    середине: если значение в середине отличается от линейной интерполяции
+    по концам больше чем на tolerance * (размах Y на грубой сетке), обе
+    половины интервала проверяются на следующем шаге. Интервалы, где
+    функция определена только на одном конце (граница области, асимптота),
+    тоже делятся. Все вычисленные середины входят в результат.
+
+    Args:
+        func: Функция (векторизованная или скалярная)
+        a: Начало интервала
+        b: Конец интервала
+        tolerance: Допустимая относительная ошибка линейной интерполяции
+        max_points: Максимальное количество вычислений функции
+        initial_points: Количество точек грубой сетки
+        min_step: Минимальная ширина делимого интервала (по умолчанию (b - a) * 1e-9)
+
+    Returns:
+        Отсортированные неравномерные массивы X и Y (NaN вне области определения)
+    """
+    if a >= b:
+        raise ValueError(f"a должно быть меньше b: a={a}, b={b}")
+    if initial_points < 2:
+        raise ValueError(f"Грубая сетка должна содержать не менее 2 точек, получено {initial_points}")
+    if max_points < initial_points:
+        raise ValueError(f"Бюджет точек ({max_points}) меньше грубой сетки ({initial_points})")
+    if min_step is None:
+        min_step = (b - a) * 1e-9
+
+    evaluate = array_evaluator(func)
+    x_parts = [np.linspace(a, b, initial_points)]
+    y_parts = [evaluate(x_parts[0])]
+    total = initial_points
+
+    finite = y_parts[0][np.isfinite(y_parts[0])]
+    scale = float(finite.max() - finite.min()) if len(finite) else 1.0
+    threshold = tolerance * (scale if scale > 0 else 1.0)
+
+    # Интервалы, которые нужно проверить: концы и значения в концах
+    left_x, right_x = x_parts[0][:-1], x_parts[0][1:]
+    left_y, right_y = y_parts[0][:-1], y_parts[0][1:]
+    priority = np.full(len(left_x), np.inf)
+
+    while len(left_x) and total < max_points:
+        # При нехватке бюджета проверяются интервалы с наибольшей ошибкой родителя
+        budget = max_points - total
+        if len(left_x) > budget:
+            keep = np.argsort(priority)[::-1][:budget]
+            left_x, right_x, left_y, right_y = left_x[keep], right_x[keep], left_y[keep], right_y[keep]
+
+        mid_x = (left_x + right_x) / 2
+        mid_y = evaluate(mid_x)
+        x_parts.append(mid_x)
+        y_parts.append(mid_y)
+        total += len(mid_x)
+
+        with np.errstate(invalid='ignore'):
+            error = np.abs(mid_y - (left_y + right_y) / 2)
+        defined = np.isfinite(np.stack([left_y, mid_y, right_y]))
+        # Частично определенный интервал содержит границу области или асимптоту
+        error[defined.any(axis=0) & ~defined.all(axis=0)] = np.inf
+        error[~defined.any(axis=0)] = 0.0
+
+        refine = (error > threshold) & (right_x - left_x > 2 * min_step)
+        error = error[refine]
+        left_x, mid_x, right_x = left_x[refine], mid_x[refine], right_x[refine]
+        left_y, mid_y, right_y = left_y[refine], mid_y[refine], right_y[refine]
+
+        left_x, right_x = np.concatenate((left_x, mid_x)), np.concatenate((mid_x, right_x))
+        left_y, right_y = np.concatenate((left_y, mid_y)), np.concatenate((mid_y, right_y))
+        priority = np.concatenate((error, error))
+
+    x = np.concatenate(x_parts)
+    y = np.concatenate(y_parts)
+    order = np.argsort(x, kind='stable')
+
+    if output.enabled(output.SUMMARY):
+        output.emit(output.SUMMARY, f"  Адаптивная выборка: {total} вычислений "
+                                    f"(допуск {tolerance:g}, бюджет {max_points})")
+    return x[order], y[order]
@@ -0,0 +1,349 @@
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+from typing import Callable, Dict, List, Optional, Tuple
+from lazy import lazy_import
+import function as funcs
+import grid
+import main
+import output
+import visualization as vis
+from store import ResultStore
+
+np = lazy_import('numpy')
+
+
+# Размеры сеток по умолчанию для каждой группы замеров
+FUNCTION_SIZES = [10**k for k in range(2, 8)]
+SCALAR_SIZES = [10**2, 10**3, 10**4]
+CALCULATE_SIZES = [10**4, 10**6]
+TABLE_SIZES = [10**3, 10**5, 10**6]
+PLOT_SIZES = [10**3, 10**5, 10**6]
+LRU_SIZE = 1000
+
+# Модули, которые не должны загружаться при запуске без графиков и вычислений
+HEAVY_MODULES = ('numpy', 'matplotlib')
+
+# Количество модулей в разбивке времени запуска
+STARTUP_TOP = 15
+
+# Относительное замедление, считающееся регрессией
+DEFAULT_THRESHOLD = 0.10
+
+
+def measure(action: Callable[[], None], repeat: int = 3,
+            setup: Optional[Callable[[], None]] = None) -> float:
+    """
+    Лучшее время выполнения action из repeat попыток в секундах
+
+    setup вызывается перед каждой попыткой и в замер не входит.
+    """
+    best = float('inf')
+    for _ in range(repeat):
+        if setup is not None:
+            setup()
+        start = time.perf_counter()
+        action()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def _grid_for(func: Callable, n_points: int):
+    """
+    Параметры сетки из n_points точек внутри области определения функции
+    """
+    domain = getattr(func, 'domain', None)
+    min_val, max_val = (domain.min, domain.max) if domain is not None else (-10.0, 10.0)
+    a = max(min_val, -10.0) + 0.01
+    b = min(max_val, 10.0) - 0.01
+    return a, b, (b - a) / (n_points - 1)
+
+
+def _record(results: Dict[str, dict], name: str, seconds: float, points: Optional[int]) -> None:
+    results[name] = {
+        'seconds': seconds,
+        'points': points,
+        'points_per_sec': points / seconds if points and seconds > 0 else None,
+    }
+    if points is None:
+        print(f"  {name:<55} {seconds:10.6f} с")
+    else:
+        print(f"  {name:<55} {seconds:10.6f} с  {points / seconds if seconds > 0 else 0:14.0f} точек/с")
+
+
+def bench_functions(results: Dict[str, dict], sizes: List[int], scalar_sizes: List[int],
+                    repeat: int) -> None:
+    """
+    Векторизованное и поточечное вычисление каждой функции реестра
+    """
+    for _, (_, func) in funcs.get_available_functions().items():
+        for n in sizes:
+            a, b, step = _grid_for(func, n)
+            x = grid.build_grid(a, b, step)
+            _record(results, f"function/{func.__name__}/vectorized/{n}",
+                    measure(lambda: func.vectorized(x), repeat), len(x))
+        for n in scalar_sizes:
+            a, b, step = _grid_for(func, n)
+            x_values = grid.build_grid(a, b, step).tolist()
+            _record(results, f"function/{func.__name__}/scalar/{n}",
+                    measure(lambda: [func(v) for v in x_values], repeat,
+                            setup=func.clear_cache), len(x_values))
+
+
+def bench_calculate(results: Dict[str, dict], sizes: List[int], repeat: int) -> None:
+    """
+    calculate_vectors без кэша, с холодным и с прогретым хранилищем результатов,
+    а также поточечный расчет с холодным и прогретым LRU-кэшем функции
+    """
+    func = funcs.sin_function
+    for n in sizes:
+        a, b, step = _grid_for(func, n)
+        _record(results, f"calculate_vectors/nocache/{n}",
+                measure(lambda: main.calculate_vectors(a, b, step, func), repeat), n)
+
+        with tempfile.TemporaryDirectory() as directory:
+            store = ResultStore(directory)
+            _record(results, f"calculate_vectors/store_cold/{n}",
+                    measure(lambda: main.calculate_vectors(a, b, step, func, store=store),
+                            repeat, setup=store.clear), n)
+            main.calculate_vectors(a, b, step, func, store=store)
+            _record(results, f"calculate_vectors/store_warm/{n}",
+                    measure(lambda: main.calculate_vectors(a, b, step, func, store=store),
+                            repeat), n)
+
+    # Поточечный путь без векторизации; сетка помещается в LRU-кэш функции
+    scalar = funcs.sin_function.__wrapped__
+    n = LRU_SIZE
+    a, b, step = _grid_for(func, n)
+    _record(results, f"calculate_vectors/lru_cold/{n}",
+            measure(lambda: main.calculate_vectors(a, b, step, scalar), repeat,
+                    setup=scalar.clear_cache), n)
+    _record(results, f"calculate_vectors/lru_warm/{n}",
+            measure(lambda: main.calculate_vectors(a, b, step, scalar), repeat), n)
+
+
+def bench_table(results: Dict[str, dict], sizes: List[int], repeat: int) -> None:
+    """
+    Краткая таблица в stdout и потоковая запись полной таблицы в файл
+    """
+    for n in sizes:
+        x = grid.build_grid(0.0, 1.0, 1.0 / (n - 1))
+        y = np.sin(x)
+        x_values, y_values = x.tolist(), y.tolist()
+
+        def print_table():
+            with contextlib.redirect_stdout(io.StringIO()):
+                vis.print_xy_table(x_values, y_values, precision=6, max_rows=20)
+        _record(results, f"print_xy_table/{n}", measure(print_table, repeat), n)
+
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'table.txt')
+            _record(results, f"write_xy_table/{n}",
+                    measure(lambda: vis.write_xy_table(path, x, y), repeat), n)
+
+
+def bench_plot(results: Dict[str, dict], sizes: List[int], repeat: int) -> None:
+    """
+    Отрисовка графика в PNG без графического интерфейса
+    """
+    renderer = vis.HeadlessRenderer()
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, 'plot.png')
+        for n in sizes:
+            x = grid.build_grid(-1.5, 1.5, 3.0 / (n - 1))
+            series = vis.PlotSeries(x, np.tan(x), -1.5, 1.5)
+            _record(results, f"plot_function/headless/{n}",
+                    measure(lambda: renderer.render(series, path), repeat), n)
+
+
+def _python(args: List[str], **kwargs) -> subprocess.CompletedProcess:
+    """
+    Запуск интерпретатора в каталоге программы
+    """
+    return subprocess.run([sys.executable, *args], cwd=os.path.dirname(os.path.abspath(__file__)),
+                          capture_output=True, text=True, check=True, **kwargs)
+
+
+def import_times(module: str) -> Dict[str, Tuple[int, int]]:
+    """
+    Время импорта модуля и всех его зависимостей в отдельном процессе
+
+    Returns:
+        Словарь: имя модуля -> (собственное время, время с зависимостями) в мкс
+    """
+    stderr = _python(['-X', 'importtime', '-c', f"import {module}"]).stderr
+    times = {}
+    for line in stderr.splitlines():
+        if not line.startswith('import time:') or 'self [us]' in line:
+            continue
+        own, cumulative, name = line[len('import time:'):].split('|')
+        times[name.strip()] = (int(own), int(cumulative))
+    return times
+
+
+def _wall_time(args: List[str], repeat: int) -> float:
+    """
+    Лучшее время работы процесса интерпретатора с аргументами args
+    """
+    return measure(lambda: _python(args, stdin=subprocess.DEVNULL), repeat)
+
+
+def bench_startup(results: Dict[str, dict], repeat: int) -> Dict[str, Tuple[int, int]]:
+    """
+    Время запуска: импорт main и пакетный запуск с выводом только таблицы
+
+    Returns:
+        Разбивка времени импорта main по модулям (лучшая из repeat попыток)
+    """
+    best = None
+    for _ in range(repeat):
+        times = import_times('main')
+        if best is None or times['main'][1] < best['main'][1]:
+            best = times
+    _record(results, "startup/import_main", best['main'][1] / 1e6, None)
+
+    _record(results, "startup/python", _wall_time(['-c', 'pass'], repeat), None)
+    with tempfile.TemporaryDirectory() as directory:
+        jobs_path = os.path.join(directory, 'jobs.json')
+        with open(jobs_path, 'w', encoding='utf-8') as f:
+            json.dump([{'function': 1, 'a': 0, 'b': 10, 'step': 0.1, 'table': '-'}], f)
+        _record(results, "startup/batch_table",
+                _wall_time(['main.py', '-v', 'silent', '--batch', jobs_path], repeat), None)
+    return best
+
+
+def print_startup(times: Dict[str, Tuple[int, int]], top: int = STARTUP_TOP) -> None:
+    """
+    Вывод разбивки времени импорта по модулям с наибольшим временем
+    """
+    print(f"\n{'Модуль':<45} {'Свое, мс':>10} {'Всего, мс':>10}")
+    print("-" * 67)
+    for name, (own, cumulative) in sorted(times.items(), key=lambda item: -item[1][1])[:top]:
+        print(f"{name:<45} {own / 1000:10.2f} {cumulative / 1000:10.2f}")
+
+    heavy = sorted(name for name in times if name.split('.')[0] in HEAVY_MODULES)
+    if heavy:
+        print(f"\nПри запуске загружаются тяжелые модули: {', '.join(heavy[:10])}")
+    else:
+        print(f"\nТяжелые модули ({', '.join(HEAVY_MODULES)}) при запуске не загружаются")
+
+
+def run(output_path: str, max_size: int, repeat: int) -> dict:
+    """
+    Запуск всех замеров и запись результатов в JSON
+    """
+    def limit(sizes: List[int]) -> List[int]:
+        return [n for n in sizes if n <= max_size] or [min(sizes)]
+
+    output.set_verbosity(output.SILENT)
+    results = {}
+    print("Вычисление функций:")
+    bench_functions(results, limit(FUNCTION_SIZES), limit(SCALAR_SIZES), repeat)
+    print("calculate_vectors:")
+    bench_calculate(results, limit(CALCULATE_SIZES), repeat)
+    print("Таблицы:")
+    bench_table(results, limit(TABLE_SIZES), repeat)
+    print("Графики:")
+    bench_plot(results, limit(PLOT_SIZES), repeat)
+    print("Запуск программы:")
+    bench_startup(results, repeat)
+
+    report = {
+        'meta': {
+            'created': time.strftime('%Y-%m-%dT%H:%M:%S'),
+            'python': platform.python_version(),
+            'numpy': np.__version__,
+            'platform': platform.platform(),
+            'repeat': repeat,
+        },
+        'results': results,
+    }
+    with open(output_path, 'w', encoding='utf-8') as f:
+        json.dump(report, f, ensure_ascii=False, indent=2)
+    print(f"\nРезультаты записаны в {output_path}")
+    return report
+
+
+def compare(baseline_path: str, current_path: str,
+            threshold: float = DEFAULT_THRESHOLD) -> List[str]:
+    """
+    Сравнение результатов с сохраненной базовой линией
+
+    Returns:
+        Названия замеров, замедлившихся больше чем на threshold
+    """
+    with open(baseline_path, encoding='utf-8') as f:
+        baseline = json.load(f)['results']
+    with open(current_path, encoding='utf-8') as f:
+        current = json.load(f)['results']
+
+    regressions = []
+    print(f"{'Замер':<55} {'База, с':>10} {'Сейчас, с':>10} {'Изменение':>10}")
+    print("-" * 88)
+    for name in sorted(set(baseline) & set(current)):
+        old, new = baseline[name]['seconds'], current[name]['seconds']
+        change = new / old - 1 if old > 0 else 0.0
+        mark = ""
+        if change > threshold:
+            regressions.append(name)
+            mark = "  РЕГРЕССИЯ"
+        print(f"{name:<55} {old:10.6f} {new:10.6f} {change:+10.1%}{mark}")
+
+    missing = sorted(set(baseline) - set(current))
+    if missing:
+        print(f"\nОтсутствуют в текущих результатах: {', '.join(missing)}")
+    print(f"\nРегрессий (порог {threshold:.0%}): {len(regressions)}")
+    return regressions
+
+
+def parse_args(argv: List[str] = None) -> argparse.Namespace:
+    """
+    Разбор аргументов командной строки
+    """
+    parser = argparse.ArgumentParser(description="Замеры производительности")
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    run_parser = commands.add_parser('run', help="выполнить замеры")
+    run_parser.add_argument('-o', '--output', default='bench_results.json',
+                            help="файл для результатов в формате JSON")
+    run_parser.add_argument('--max-size', type=int, default=10**7,
+                            help="максимальный размер сетки")
+    run_parser.add_argument('--repeat', type=int, default=3,
+                            help="количество повторов каждого замера")
+
+    startup_parser = commands.add_parser('startup', help="разбивка времени запуска по модулям")
+    startup_parser.add_argument('--repeat', type=int, default=3,
+                                help="количество повторов замера")
+    startup_parser.add_argument('--top', type=int, default=STARTUP_TOP,
+                                help="количество модулей в разбивке")
+    startup_parser.add_argument('--max-ms', type=float, default=None,
+                                help="допустимое время импорта main в мс; "
+                                     "при превышении код возврата 1")
+
+    compare_parser = commands.add_parser('compare', help="сравнить с базовой линией")
+    compare_parser.add_argument('baseline', help="сохраненные результаты")
+    compare_parser.add_argument('current', help="текущие результаты")
+    compare_parser.add_argument('--threshold', type=float, default=DEFAULT_THRESHOLD,
+                                help="допустимое относительное замедление (0.1 = 10%%)")
+    return parser.parse_args(argv)
+
+
+if __name__ == "__main__":
+    args = parse_args()
+    if args.command == 'run':
+        run(args.output, args.max_size, args.repeat)
+    elif args.command == 'startup':
+        results = {}
+        times = bench_startup(results, args.repeat)
+        print_startup(times, args.top)
+        import_ms = results['startup/import_main']['seconds'] * 1000
+        sys.exit(1 if args.max_ms is not None and import_ms > args.max_ms else 0)
+    else:
+        sys.exit(1 if compare(args.baseline, args.current, args.threshold) else 0)
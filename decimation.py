@@ -0,0 +1,166 @@
+from __future__ import annotations
+from typing import Tuple
+from lazy import lazy_import
+from stats import CHUNK_SIZE
+
+np = lazy_import('numpy')
+
+
+# Доступные методы прореживания
+METHODS = ('minmax', 'lttb')
+
+# Ряды длиннее этого порога прореживаются методом minmax порциями
+CHUNKED_THRESHOLD = 1 << 22
+
+
+def _as_finite_arrays(x_values, y_values) -> Tuple[np.ndarray, np.ndarray]:
+    x = np.asarray(x_values, dtype=float)
+    y = np.asarray(y_values, dtype=float)
+    if len(x) != len(y):
+        raise ValueError(f"Длины массивов не совпадают: X={len(x)}, Y={len(y)}")
+    finite = np.isfinite(y)
+    if not finite.all():
+        x, y = x[finite], y[finite]
+    return x, y
+
+
+def decimate_minmax(x_values, y_values, n_buckets: int) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Прореживание min/max: в каждой из n_buckets корзин по индексу
+    остаются точки с минимальным и максимальным Y
+
+    Пики и выбросы у асимптот сохраняются, итоговое количество точек
+    вместе с первой и последней не превышает 2 * n_buckets + 2.
+    """
+    x, y = _as_finite_arrays(x_values, y_values)
+    n = len(x)
+    if n_buckets <= 0:
+        raise ValueError(f"Количество корзин должно быть положительным, получено {n_buckets}")
+    if n <= 2 * n_buckets + 2:
+        return x, y
+
+    edges = np.linspace(0, n, n_buckets + 1).astype(np.intp)
+    starts = edges[:-1]
+    counts = np.diff(edges)
+
+    # Первое вхождение минимума/максимума в каждой корзине
+    def first_match(extremes: np.ndarray) -> np.ndarray:
+        matches = np.flatnonzero(y == np.repeat(extremes, counts))
+        return matches[np.searchsorted(matches, starts)]
+
+    argmin = first_match(np.minimum.reduceat(y, starts))
+    argmax = first_match(np.maximum.reduceat(y, starts))
+
+    indices = np.unique(np.concatenate(([0, n - 1], argmin, argmax)))
+    return x[indices], y[indices]
+
+
+def decimate_minmax_chunked(x_values, y_values, n_buckets: int,
+                            chunk_size: int = CHUNK_SIZE) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Прореживание min/max с чтением ряда порциями
+
+    Для рядов, не помещающихся в память (например, отображенных в память
+    файлов): одновременно в памяти находятся только порция chunk_size
+    точек и экстремумы корзин. Корзины строятся по индексу всех точек,
+    а не только корректных, поэтому при наличии NaN результат может
+    немного отличаться от decimate_minmax.
+    """
+    n = len(y_values)
+    if len(x_values) != n:
+        raise ValueError(f"Длины массивов не совпадают: X={len(x_values)}, Y={n}")
+    if n_buckets <= 0:
+        raise ValueError(f"Количество корзин должно быть положительным, получено {n_buckets}")
+    if n <= 2 * n_buckets + 2:
+        return decimate_minmax(x_values, y_values, n_buckets)
+
+    edges = np.linspace(0, n, n_buckets + 1).astype(np.intp)
+    min_value = np.full(n_buckets, np.inf)
+    max_value = np.full(n_buckets, -np.inf)
+    min_index = np.full(n_buckets, -1, dtype=np.intp)
+    max_index = np.full(n_buckets, -1, dtype=np.intp)
+
+    for start in range(0, n, chunk_size):
+        y = np.asarray(y_values[start:start + chunk_size], dtype=float)
+        # Корзины, пересекающиеся с порцией, и их начала внутри порции
+        first = int(np.searchsorted(edges, start, side='right')) - 1
+        last = int(np.searchsorted(edges, start + len(y), side='left'))
+        starts = np.maximum(edges[first:last], start) - start
+        counts = np.diff(np.append(starts, len(y)))
+
+        finite = np.isfinite(y)
+        for values, extreme, reduce, better in (
+                (np.where(finite, y, np.inf), (min_value, min_index), np.minimum.reduceat, np.less),
+                (np.where(finite, y, -np.inf), (max_value, max_index), np.maximum.reduceat, np.greater)):
+            chunk_extreme = reduce(values, starts)
+            matches = np.flatnonzero(values == np.repeat(chunk_extreme, counts))
+            positions = matches[np.searchsorted(matches, starts)]
+            # При равенстве остается точка из более ранней порции
+            update = better(chunk_extreme, extreme[0][first:last])
+            extreme[0][first:last][update] = chunk_extreme[update]
+            extreme[1][first:last][update] = positions[update] + start
+
+    ends = [i for i in (0, n - 1) if np.isfinite(y_values[i])]
+    indices = np.unique(np.concatenate((ends, min_index[min_index >= 0],
+                                        max_index[max_index >= 0])).astype(np.intp))
+    return np.asarray(x_values[indices], dtype=float), np.asarray(y_values[indices], dtype=float)
+
+
+def decimate_lttb(x_values, y_values, n_out: int) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Прореживание Largest-Triangle-Three-Buckets до n_out точек
+
+    Из каждой корзины выбирается точка, образующая треугольник наибольшей
+    площади с уже выбранной точкой и средним следующей корзины.
+    """
+    x, y = _as_finite_arrays(x_values, y_values)
+    n = len(x)
+    if n_out < 3:
+        raise ValueError(f"Для LTTB нужно не менее 3 точек, получено {n_out}")
+    if n <= n_out:
+        return x, y
+
+    # Первая и последняя точки сохраняются, остальные делятся на n_out - 2 корзины
+    edges = np.linspace(1, n - 1, n_out - 1).astype(np.intp)
+    indices = np.empty(n_out, dtype=np.intp)
+    indices[0] = 0
+    indices[-1] = n - 1
+
+    selected = 0
+    for i in range(n_out - 2):
+        start, stop = edges[i], edges[i + 1]
+        if i + 2 < len(edges):
+            next_start, next_stop = edges[i + 1], edges[i + 2]
+            avg_x = x[next_start:next_stop].mean()
+            avg_y = y[next_start:next_stop].mean()
+        else:
+            avg_x, avg_y = x[-1], y[-1]
+
+        area = np.abs((x[selected] - avg_x) * (y[start:stop] - y[selected]) -
+                      (x[selected] - x[start:stop]) * (avg_y - y[selected]))
+        selected = start + int(np.argmax(area))
+        indices[i + 1] = selected
+
+    return x[indices], y[indices]
+
+
+def decimate(x_values, y_values, max_points: int,
+             method: str = 'minmax') -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Прореживание ряда до max_points точек выбранным методом
+
+    Args:
+        x_values: Значения X
+        y_values: Значения Y (NaN и бесконечности отбрасываются)
+        max_points: Допустимое количество точек (обычно около ширины графика в пикселях)
+        method: 'minmax' или 'lttb'
+    """
+    if method == 'minmax':
+        n_buckets = max(1, (max_points - 2) // 2)
+        if len(y_values) > CHUNKED_THRESHOLD:
+            return decimate_minmax_chunked(x_values, y_values, n_buckets)
+        return decimate_minmax(x_values, y_values, n_buckets)
+    if method == 'lttb':
+        return decimate_lttb(x_values, y_values, max_points)
+    raise ValueError(f"Неизвестный метод прореживания: {method}. "
+                     f"Допустимые значения: {', '.join(METHODS)}")
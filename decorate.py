@@ -1,77 +1,263 @@
-
-
+from __future__ import annotations
 import time
 import functools
-from typing import Callable, Any
-import math
+import sys
+import threading
+from collections import OrderedDict
+from typing import Callable, Any, Optional, Sequence
+from lazy import lazy_import
+from domain import Domain, Singularity, VALID, BELOW_MIN, ABOVE_MAX, SINGULAR
+import metrics
+import output
+
+np = lazy_import('numpy')
+
+
+def count_points(result: Any) -> int:
+    """
+    Количество точек в результате вычисления: размер массива,
+    длина первого вектора кортежа (X, Y) или 1 для скалярного значения
+    """
+    if isinstance(result, (int, float)):
+        return 1
+    if isinstance(result, np.ndarray):
+        return result.size
+    if isinstance(result, tuple) and result and hasattr(result[0], '__len__'):
+        return len(result[0])
+    return 1
 
 
 def timer_decorator(func: Callable) -> Callable:
     """
     Декоратор для измерения времени выполнения функции
+    
+    Время измеряется монотонным perf_counter_ns и записывается в реестр
+    метрик (если сбор включен); сообщение выводится на уровне 'summary'.
     """
     @functools.wraps(func)
     def wrapper(*args, **kwargs) -> Any:
-        start_time = time.time()
+        collect = metrics.enabled()
+        show = output.enabled(output.SUMMARY)
+        if not (collect or show):
+            return func(*args, **kwargs)
+        
+        start_time = time.perf_counter_ns()
         result = func(*args, **kwargs)
-        end_time = time.time()
-        print(f"⏱️  Функция '{func.__name__}' выполнена за {end_time - start_time:.6f} секунд")
+        elapsed = time.perf_counter_ns() - start_time
+        if collect:
+            metrics.registry.record(func.__name__, elapsed, count_points(result))
+        if show:
+            output.emit(output.SUMMARY,
+                        f"⏱️  Функция '{func.__name__}' выполнена за {elapsed / 1e9:.6f} секунд")
         return result
     return wrapper
 
 
 def validate_input_decorator(min_val: float = -float('inf'), 
-                            max_val: float = float('inf')) -> Callable:
+                            max_val: float = float('inf'),
+                            open_min: bool = False,
+                            singularities: Sequence[Singularity] = ()) -> Callable:
     """
     Декоратор для валидации входных параметров
+    
+    Область определения задается данными (Domain): границами, открытой
+    нижней границей и особыми точками. Она сохраняется в атрибуте domain,
+    а функция без проверок - в атрибуте unchecked, чтобы вычисление на
+    сетке внутри области могло не проверять каждую точку.
     """
+    domain = Domain(min_val, max_val, open_min, tuple(singularities))
+    
     def decorator(func: Callable) -> Callable:
         @functools.wraps(func)
         def wrapper(x: float) -> float:
             if not isinstance(x, (int, float)):
                 raise TypeError(f"Аргумент должен быть числом, получен {type(x)}")
             
-            if x < min_val or x > max_val:
+            reason = domain.reason(x)
+            if reason == BELOW_MIN and open_min and x == min_val:
+                raise ValueError(f"Для функции {func.__name__} аргумент должен быть > {min_val}")
+            if reason in (BELOW_MIN, ABOVE_MAX):
                 raise ValueError(f"Аргумент должен быть в пределах [{min_val}, {max_val}], получен {x}")
+            if reason == SINGULAR:
+                raise ValueError(f"Функция {func.__name__} не определена в особой точке x = {x}")
             
-            # Проверка на особые случаи для математических функций
-            if func.__name__ in ['sqrt_function', 'log_function'] and x <= 0:
-                raise ValueError(f"Для функции {func.__name__} аргумент должен быть > 0")
-            
-            if func.__name__ == 'tan_function':
-                # Проверка на аргументы, где тангенс не определен
-                if abs((x - math.pi/2) % math.pi) < 1e-10:
-                    raise ValueError(f"Тангенс не определен для x = {x}")
+            return func(x)
+        
+        wrapper.domain = domain
+        wrapper.unchecked = func
+        return wrapper
+    return decorator
+
+
+def vectorize_decorator(array_func: Callable) -> Callable:
+    """
+    Декоратор, добавляющий функции векторизованный путь вычисления
+    
+    Массив NumPy обрабатывается одним вызовом array_func, а точки вне
+    области определения (атрибут domain) получают значение NaN вместо
+    исключения. Если коды причин для x уже вычислены (domain.reasons),
+    их можно передать в reasons, чтобы область не проверялась повторно.
+    Скалярные аргументы вычисляются исходной функцией, как и раньше.
+    """
+    def decorator(func: Callable) -> Callable:
+        domain = getattr(func, 'domain', Domain())
+        
+        def evaluate_array(x: np.ndarray, reasons: Optional[np.ndarray] = None) -> np.ndarray:
+            x = np.asarray(x, dtype=float)
             
+            with np.errstate(all='ignore'):
+                y = np.array(np.broadcast_to(array_func(x), x.shape), dtype=float)
+            if reasons is not None:
+                y[reasons != VALID] = np.nan
+            else:
+                # Если сетка целиком внутри области, маска не строится
+                y[domain.mask(x)] = np.nan
+            return y
+        
+        @functools.wraps(func)
+        def wrapper(x: Any) -> Any:
+            # Скалярный вызов не должен загружать NumPy
+            if not isinstance(x, (int, float)) and isinstance(x, np.ndarray):
+                return evaluate_array(x)
             return func(x)
+        
+        wrapper.vectorized = evaluate_array
         return wrapper
     return decorator
 
 
-def cache_decorator(func: Callable) -> Callable:
+class LRUCache:
     """
-    Декоратор для кэширования результатов вычислений
+    Потокобезопасный кэш с вытеснением давно не использованных записей (LRU)
+    
+    Размер ограничивается числом записей и/или приблизительным объемом
+    в байтах. Вместо вывода на экран ведутся счетчики попаданий,
+    промахов и вытеснений.
     """
-    cache = {}
     
-    @functools.wraps(func)
-    def wrapper(x: float) -> float:
-        # Используем округление для ключа кэша
-        key = round(x, 10)
-        
-        if key not in cache:
-            cache[key] = func(x)
-            print(f"💾 Вычислено новое значение для x = {x}")
-        else:
-            print(f"⚡ Использовано кэшированное значение для x = {x}")
+    def __init__(self, max_entries: Optional[int] = 4096,
+                 max_bytes: Optional[int] = None):
+        if max_entries is not None and max_entries <= 0:
+            raise ValueError(f"max_entries должно быть положительным, получено {max_entries}")
+        if max_bytes is not None and max_bytes <= 0:
+            raise ValueError(f"max_bytes должно быть положительным, получено {max_bytes}")
         
-        return cache[key]
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+        self._bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
     
-    # Добавляем метод для очистки кэша
-    wrapper.clear_cache = lambda: cache.clear()
-    wrapper.get_cache_size = lambda: len(cache)
+    @staticmethod
+    def _entry_size(key: Any, value: Any) -> int:
+        return sys.getsizeof(key) + sys.getsizeof(value)
     
-    return wrapper
+    def get(self, key: Any, default: Any = None) -> Any:
+        """
+        Значение по ключу (default, если ключа нет); запись становится самой свежей
+        """
+        with self._lock:
+            try:
+                value = self._data[key]
+            except KeyError:
+                self.misses += 1
+                return default
+            self._data.move_to_end(key)
+            self.hits += 1
+            return value
+    
+    def put(self, key: Any, value: Any) -> None:
+        """
+        Сохранение значения с вытеснением самых старых записей при переполнении
+        """
+        size = self._entry_size(key, value)
+        with self._lock:
+            if key in self._data:
+                self._bytes -= self._entry_size(key, self._data.pop(key))
+            self._data[key] = value
+            self._bytes += size
+            
+            while self._data and (
+                    (self.max_entries is not None and len(self._data) > self.max_entries) or
+                    (self.max_bytes is not None and self._bytes > self.max_bytes)):
+                old_key, old_value = self._data.popitem(last=False)
+                self._bytes -= self._entry_size(old_key, old_value)
+                self.evictions += 1
+    
+    def clear(self) -> None:
+        """
+        Очистка кэша и сброс счетчиков
+        """
+        with self._lock:
+            self._data.clear()
+            self._bytes = 0
+            self.hits = self.misses = self.evictions = 0
+    
+    def __len__(self) -> int:
+        return len(self._data)
+    
+    def info(self) -> dict:
+        """
+        Статистика кэша: попадания, промахи, вытеснения и текущий размер
+        """
+        with self._lock:
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'size': len(self._data),
+                'bytes': self._bytes,
+                'max_entries': self.max_entries,
+                'max_bytes': self.max_bytes,
+            }
+
+
+_MISSING = object()
+
+
+def cache_decorator(func: Optional[Callable] = None, *,
+                    max_entries: Optional[int] = 4096,
+                    max_bytes: Optional[int] = None,
+                    name: Optional[str] = None) -> Callable:
+    """
+    Декоратор для кэширования результатов вычислений
+    
+    Используется как @cache_decorator или
+    @cache_decorator(max_entries=..., max_bytes=...). Кэш регистрируется
+    в метриках под именем name (по умолчанию - имя функции).
+    """
+    def decorator(func: Callable) -> Callable:
+        cache = LRUCache(max_entries, max_bytes)
+        
+        @functools.wraps(func)
+        def wrapper(x: float) -> float:
+            # Используем округление для ключа кэша
+            key = round(x, 10)
+            
+            result = cache.get(key, _MISSING)
+            if result is _MISSING:
+                result = func(x)
+                cache.put(key, result)
+                if output.enabled(output.POINTS):
+                    output.emit(output.POINTS, f"💾 Вычислено новое значение для x = {x}")
+            elif output.enabled(output.POINTS):
+                output.emit(output.POINTS, f"⚡ Использовано кэшированное значение для x = {x}")
+            return result
+        
+        # Методы для управления кэшем и его статистики
+        wrapper.clear_cache = cache.clear
+        wrapper.get_cache_size = lambda: len(cache)
+        wrapper.cache_info = cache.info
+        metrics.registry.register_cache(name or func.__name__, cache.info)
+        
+        return wrapper
+    
+    if func is not None:
+        return decorator(func)
+    return decorator
 
 
 def logging_decorator(func: Callable) -> Callable:
@@ -80,13 +266,16 @@ def logging_decorator(func: Callable) -> Callable:
     """
     @functools.wraps(func)
     def wrapper(*args, **kwargs) -> Any:
-        print(f"📝 Вызов функции '{func.__name__}' с аргументами:")
-        print(f"   args: {args}")
-        print(f"   kwargs: {kwargs}")
+        if not output.enabled(output.POINTS):
+            return func(*args, **kwargs)
+        
+        output.emit(output.POINTS, f"📝 Вызов функции '{func.__name__}' с аргументами:")
+        output.emit(output.POINTS, f"   args: {args}")
+        output.emit(output.POINTS, f"   kwargs: {kwargs}")
         
         result = func(*args, **kwargs)
         
-        print(f"📝 Функция '{func.__name__}' вернула: {result}")
+        output.emit(output.POINTS, f"📝 Функция '{func.__name__}' вернула: {result}")
         return result
     return wrapper
 
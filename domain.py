@@ -0,0 +1,116 @@
+from __future__ import annotations
+import math
+from typing import List, NamedTuple, Optional, Tuple
+from lazy import lazy_import
+
+np = lazy_import('numpy')
+
+
+# Коды причин, по которым точка не входит в область определения
+VALID = 0
+BELOW_MIN = 1
+ABOVE_MAX = 2
+SINGULAR = 3
+
+REASONS = {
+    BELOW_MIN: "аргумент меньше нижней границы области определения",
+    ABOVE_MAX: "аргумент больше верхней границы области определения",
+    SINGULAR: "аргумент попадает в особую точку функции",
+}
+
+
+class Singularity(NamedTuple):
+    """
+    Особые точки x = offset + k * period (одна точка, если period не задан)
+    """
+    offset: float
+    period: Optional[float] = None
+    tolerance: float = 1e-10
+
+    def distance(self, x: float) -> float:
+        """
+        Расстояние от x до ближайшей особой точки
+        """
+        if self.period is None:
+            return abs(x - self.offset)
+        return abs((x - self.offset + self.period / 2) % self.period - self.period / 2)
+
+    def points(self, a: float, b: float) -> List[float]:
+        """
+        Особые точки на отрезке [a, b] в порядке возрастания
+        """
+        if self.period is None:
+            return [self.offset] if a <= self.offset <= b else []
+        first = math.ceil((a - self.offset) / self.period)
+        last = math.floor((b - self.offset) / self.period)
+        return [self.offset + k * self.period for k in range(first, last + 1)]
+
+    def within(self, a: float, b: float) -> bool:
+        """
+        Есть ли особая точка на отрезке [a, b] (с учетом допуска)
+        """
+        a, b = a - self.tolerance, b + self.tolerance
+        if self.period is None:
+            return a <= self.offset <= b
+        return math.floor((b - self.offset) / self.period) >= math.ceil((a - self.offset) / self.period)
+
+
+class Domain(NamedTuple):
+    """
+    Область определения функции: отрезок [min, max] (или (min, max],
+    если open_min) без особых точек singularities
+    """
+    min: float = -math.inf
+    max: float = math.inf
+    open_min: bool = False
+    singularities: Tuple[Singularity, ...] = ()
+
+    def reason(self, x: float) -> int:
+        """
+        Код причины, по которой точка x не входит в область (VALID, если входит)
+        """
+        if x < self.min or (self.open_min and x == self.min):
+            return BELOW_MIN
+        if x > self.max:
+            return ABOVE_MAX
+        for singularity in self.singularities:
+            if singularity.distance(x) < singularity.tolerance:
+                return SINGULAR
+        return VALID
+
+    def contains_interval(self, a: float, b: float) -> bool:
+        """
+        Лежит ли весь отрезок [a, b] в области определения
+
+        В этом случае проверять отдельные точки не нужно.
+        """
+        if a < self.min or (self.open_min and a == self.min) or b > self.max:
+            return False
+        return not any(singularity.within(a, b) for singularity in self.singularities)
+
+    def reasons(self, x: np.ndarray) -> np.ndarray:
+        """
+        Коды причин для всех точек массива за несколько векторных операций
+        (uint8, VALID для точек внутри области)
+        """
+        x = np.asarray(x, dtype=float)
+        codes = np.zeros(x.shape, dtype=np.uint8)
+        for singularity in self.singularities:
+            if singularity.period is None:
+                distance = np.abs(x - singularity.offset)
+            else:
+                half = singularity.period / 2
+                distance = np.abs((x - singularity.offset + half) % singularity.period - half)
+            codes[distance < singularity.tolerance] = SINGULAR
+        codes[x > self.max] = ABOVE_MAX
+        codes[(x <= self.min) if self.open_min else (x < self.min)] = BELOW_MIN
+        return codes
+
+    def mask(self, x: np.ndarray) -> np.ndarray:
+        """
+        Маска точек массива, не входящих в область определения
+        """
+        x = np.asarray(x, dtype=float)
+        if len(x) and self.contains_interval(float(x.min()), float(x.max())):
+            return np.zeros(x.shape, dtype=bool)
+        return self.reasons(x) != VALID
@@ -0,0 +1,235 @@
+from __future__ import annotations
+import argparse
+import json
+import os
+import struct
+from typing import Callable, Iterable, Iterator, List, Optional, Tuple
+from lazy import lazy_import
+import function as funcs
+import grid
+import output
+import parallel
+from stats import Summary
+
+np = lazy_import('numpy')
+
+
+Chunk = Tuple['np.ndarray', 'np.ndarray']
+
+# Размер порции по умолчанию при потоковой выгрузке
+DEFAULT_CHUNK_SIZE = grid.DEFAULT_CHUNK_SIZE
+
+# Столбцовый формат: фиксированный заголовок, метаданные JSON, столбцы X и Y (float64 LE)
+COLUMNAR_MAGIC = b'PZZCOL\x00\x01'
+COLUMNAR_EXTENSION = '.pzc'
+
+# Расширения файлов, которые умеет записывать export_series
+EXPORT_EXTENSIONS = ('.csv', '.npy', COLUMNAR_EXTENSION)
+_HEADER = struct.Struct('<8sIIQQQ')   # сигнатура, версия, столбцы, точки, смещения X и Y
+_HEADER_SIZE = 64
+_ALIGNMENT = 64
+
+
+def evaluate_chunks(func: Callable, a: float, b: float, step: float,
+                    chunk_size: int = DEFAULT_CHUNK_SIZE) -> Iterator[Chunk]:
+    """
+    Потоковое вычисление функции на сетке: порции (X, Y) по chunk_size точек
+
+    Точки с ошибками получают значение NaN, полная сетка в памяти не создается.
+    Количество ошибок поточечного вычисления и первая из них выводятся
+    в конце (уровень SUMMARY).
+    """
+    n_errors = 0
+    first_error = None
+    for x in grid.iter_grid(a, b, step, chunk_size):
+        if hasattr(func, 'vectorized'):
+            yield x, func.vectorized(x)
+        else:
+            y_values, errors = parallel.evaluate_chunk(func, x.tolist())
+            if errors and first_error is None:
+                index, message = errors[0]
+                first_error = (float(x[index]), message)
+            n_errors += len(errors)
+            yield x, np.array(y_values, dtype=float)
+    if n_errors and output.enabled(output.SUMMARY):
+        x_error, message = first_error
+        output.emit(output.SUMMARY, f"  Ошибок при вычислении: {n_errors} (записаны как NaN), "
+                                    f"первая при x = {x_error:.4f}: {message}")
+
+
+def array_chunks(x_values, y_values, chunk_size: int = DEFAULT_CHUNK_SIZE) -> Iterator[Chunk]:
+    """
+    Разбиение готовых векторов X и Y на порции
+    """
+    if len(x_values) != len(y_values):
+        raise ValueError(f"Длины массивов не совпадают: X={len(x_values)}, Y={len(y_values)}")
+    x = np.asarray(x_values, dtype=float)
+    y = np.asarray(y_values, dtype=float)
+    for start in range(0, len(x), chunk_size):
+        yield x[start:start + chunk_size], y[start:start + chunk_size]
+
+
+def write_csv(path: str, chunks: Iterable[Chunk]) -> int:
+    """
+    Запись порций в CSV с колонками x,y (NaN записывается как nan)
+
+    Returns:
+        Количество записанных точек
+    """
+    written = 0
+    with open(path, 'w', encoding='utf-8', newline='') as f:
+        f.write("x,y\n")
+        for x, y in chunks:
+            np.savetxt(f, np.column_stack((x, y)), fmt='%.17g', delimiter=',')
+            written += len(x)
+    return written
+
+
+def _check_count(written: int, n_points: int) -> None:
+    if written != n_points:
+        raise ValueError(f"Получено {written} точек вместо объявленных {n_points}")
+
+
+def write_npy(path: str, chunks: Iterable[Chunk], n_points: int) -> int:
+    """
+    Запись порций в файл NumPy .npy формы (n_points, 2): столбцы X и Y
+
+    Файл создается заранее и заполняется через отображение в память.
+    """
+    array = np.lib.format.open_memmap(path, mode='w+', dtype='<f8', shape=(n_points, 2))
+    written = 0
+    try:
+        for x, y in chunks:
+            if written + len(x) > n_points:
+                raise ValueError(f"Получено больше точек, чем объявлено ({n_points})")
+            array[written:written + len(x), 0] = x
+            array[written:written + len(x), 1] = y
+            written += len(x)
+        _check_count(written, n_points)
+        array.flush()
+    finally:
+        del array
+    return written
+
+
+def _aligned(offset: int) -> int:
+    return (offset + _ALIGNMENT - 1) // _ALIGNMENT * _ALIGNMENT
+
+
+def write_columnar(path: str, chunks: Iterable[Chunk], n_points: int,
+                   meta: Optional[dict] = None) -> int:
+    """
+    Запись порций в компактный столбцовый формат (.pzc)
+
+    Структура файла: 64-байтный заголовок (сигнатура, версия, количество
+    столбцов и точек, смещения столбцов), метаданные JSON, затем столбцы X
+    и Y подряд в формате float64 little-endian, выровненные по 64 байтам.
+    """
+    meta_bytes = json.dumps(meta or {}, ensure_ascii=False).encode('utf-8')
+    x_offset = _aligned(_HEADER_SIZE + 4 + len(meta_bytes))
+    y_offset = x_offset + 8 * n_points
+
+    written = 0
+    with open(path, 'wb') as f:
+        header = _HEADER.pack(COLUMNAR_MAGIC, 1, 2, n_points, x_offset, y_offset)
+        f.write(header.ljust(_HEADER_SIZE, b'\0'))
+        f.write(struct.pack('<I', len(meta_bytes)) + meta_bytes)
+        f.truncate(y_offset + 8 * n_points)
+
+        for x, y in chunks:
+            if written + len(x) > n_points:
+                raise ValueError(f"Получено больше точек, чем объявлено ({n_points})")
+            f.seek(x_offset + 8 * written)
+            f.write(np.ascontiguousarray(x, dtype='<f8').tobytes())
+            f.seek(y_offset + 8 * written)
+            f.write(np.ascontiguousarray(y, dtype='<f8').tobytes())
+            written += len(x)
+    _check_count(written, n_points)
+    return written
+
+
+def read_columnar(path: str) -> Tuple[np.memmap, np.memmap, dict]:
+    """
+    Чтение столбцового формата без копирования: X и Y отображаются в память
+
+    Returns:
+        Массивы X и Y (только для чтения) и метаданные
+    """
+    with open(path, 'rb') as f:
+        header = f.read(_HEADER_SIZE)
+        if len(header) < _HEADER_SIZE or header[:8] != COLUMNAR_MAGIC:
+            raise ValueError(f"Файл {path} не является файлом формата {COLUMNAR_EXTENSION}")
+        _, version, columns, n_points, x_offset, y_offset = _HEADER.unpack(header[:_HEADER.size])
+        if version != 1 or columns != 2:
+            raise ValueError(f"Неподдерживаемая версия формата: {version}, столбцов: {columns}")
+        meta_length, = struct.unpack('<I', f.read(4))
+        meta = json.loads(f.read(meta_length).decode('utf-8'))
+
+    if n_points == 0:
+        return np.empty(0), np.empty(0), meta
+    x = np.memmap(path, dtype='<f8', mode='r', offset=x_offset, shape=(n_points,))
+    y = np.memmap(path, dtype='<f8', mode='r', offset=y_offset, shape=(n_points,))
+    return x, y, meta
+
+
+def export_series(path: str, chunks: Iterable[Chunk], n_points: int,
+                  meta: Optional[dict] = None) -> int:
+    """
+    Запись порций в формате, выбранном по расширению: .csv, .npy или .pzc
+    """
+    extension = os.path.splitext(path)[1].lower()
+    if extension == '.csv':
+        return write_csv(path, chunks)
+    if extension == '.npy':
+        return write_npy(path, chunks, n_points)
+    if extension == COLUMNAR_EXTENSION:
+        return write_columnar(path, chunks, n_points, meta)
+    raise ValueError(f"Неизвестный формат файла {path}: "
+                     f"ожидается расширение {', '.join(EXPORT_EXTENSIONS)}")
+
+
+def _summarized(chunks: Iterable[Chunk], summary: Summary) -> Iterator[Chunk]:
+    for x, y in chunks:
+        summary.update(y)
+        yield x, y
+
+
+def export_sweep(path: str, func: Callable, a: float, b: float, step: float,
+                 chunk_size: int = DEFAULT_CHUNK_SIZE) -> Summary:
+    """
+    Вычисление функции на сетке с одновременной записью в файл порциями
+
+    Returns:
+        Статистика значений Y, накопленная по порциям во время записи
+    """
+    meta = {'function': getattr(func, '__name__', repr(func)), 'a': a, 'b': b, 'step': step}
+    summary = Summary()
+    export_series(path, _summarized(evaluate_chunks(func, a, b, step, chunk_size), summary),
+                  grid.grid_size(a, b, step), meta)
+    return summary
+
+
+def parse_args(argv: List[str] = None) -> argparse.Namespace:
+    """
+    Разбор аргументов командной строки
+    """
+    parser = argparse.ArgumentParser(description="Потоковая выгрузка значений функции на сетке")
+    parser.add_argument('function', type=int, help="номер функции из реестра")
+    parser.add_argument('a', type=float, help="начало интервала")
+    parser.add_argument('b', type=float, help="конец интервала")
+    parser.add_argument('step', type=float, help="шаг сетки")
+    parser.add_argument('path', help=f"файл для записи: .csv, .npy или {COLUMNAR_EXTENSION}")
+    parser.add_argument('--chunk-size', type=int, default=DEFAULT_CHUNK_SIZE,
+                        help="количество точек в одной порции")
+    return parser.parse_args(argv)
+
+
+if __name__ == "__main__":
+    args = parse_args()
+    output.set_verbosity(output.SILENT)
+    func_desc, func = funcs.get_available_functions()[args.function]
+    summary = export_sweep(args.path, func, args.a, args.b, args.step, args.chunk_size)
+    print(f"{func_desc}: записано {summary.count} точек в {args.path}")
+    if summary.valid_count:
+        print(f"  Y ∈ [{summary.min:.6g}, {summary.max:.6g}], среднее {summary.mean:.6g}, "
+              f"σ = {summary.std:.6g}, некорректных значений: {summary.nan_count}")
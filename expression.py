@@ -0,0 +1,172 @@
+from __future__ import annotations
+import ast
+import functools
+import math
+from typing import Callable, NamedTuple, Tuple
+from lazy import lazy_import
+
+np = lazy_import('numpy')
+
+
+# Разрешенные функции: имя -> (скалярная реализация, имя функции NumPy)
+FUNCTIONS = {
+    'sin': (math.sin, 'sin'),
+    'cos': (math.cos, 'cos'),
+    'tan': (math.tan, 'tan'),
+    'asin': (math.asin, 'arcsin'),
+    'acos': (math.acos, 'arccos'),
+    'atan': (math.atan, 'arctan'),
+    'sinh': (math.sinh, 'sinh'),
+    'cosh': (math.cosh, 'cosh'),
+    'tanh': (math.tanh, 'tanh'),
+    'exp': (math.exp, 'exp'),
+    'log': (math.log, 'log'),
+    'log10': (math.log10, 'log10'),
+    'log2': (math.log2, 'log2'),
+    'sqrt': (math.sqrt, 'sqrt'),
+    'abs': (abs, 'abs'),
+    'floor': (math.floor, 'floor'),
+    'ceil': (math.ceil, 'ceil'),
+}
+
+# Разрешенные константы
+CONSTANTS = {
+    'pi': math.pi,
+    'e': math.e,
+    'tau': math.tau,
+}
+
+# Имя переменной выражения
+VARIABLE = 'x'
+
+# Наибольшая длина текста выражения: глубоко вложенные выражения
+# не должны исчерпывать стек и память разбора
+MAX_LENGTH = 1000
+
+_BINARY_OPERATORS = (ast.Add, ast.Sub, ast.Mult, ast.Div, ast.Pow, ast.Mod)
+_UNARY_OPERATORS = (ast.UAdd, ast.USub)
+
+
+class CompiledExpression(NamedTuple):
+    """
+    Выражение, скомпилированное в скалярную и векторизованную функции
+    """
+    text: str
+    scalar: Callable[[float], float]
+    vectorized: Callable[[np.ndarray], np.ndarray]
+
+
+def _check_node(node: ast.AST, text: str) -> None:
+    """
+    Проверка, что узел дерева содержит только разрешенные конструкции
+    """
+    if isinstance(node, ast.Expression):
+        _check_node(node.body, text)
+    elif isinstance(node, ast.BinOp) and isinstance(node.op, _BINARY_OPERATORS):
+        _check_node(node.left, text)
+        _check_node(node.right, text)
+    elif isinstance(node, ast.UnaryOp) and isinstance(node.op, _UNARY_OPERATORS):
+        _check_node(node.operand, text)
+    elif isinstance(node, ast.Constant) and type(node.value) in (int, float):
+        pass
+    elif isinstance(node, ast.Name) and (node.id == VARIABLE or node.id in CONSTANTS):
+        pass
+    elif (isinstance(node, ast.Call) and isinstance(node.func, ast.Name)
+          and node.func.id in FUNCTIONS and not node.keywords):
+        for arg in node.args:
+            _check_node(arg, text)
+    elif isinstance(node, ast.Name):
+        raise ValueError(f"Неизвестное имя '{node.id}' в выражении '{text}'")
+    elif isinstance(node, ast.Call):
+        name = node.func.id if isinstance(node.func, ast.Name) else type(node.func).__name__
+        raise ValueError(f"Недопустимый вызов '{name}' в выражении '{text}'")
+    else:
+        raise ValueError(f"Недопустимая конструкция {type(node).__name__} в выражении '{text}'")
+
+
+class _FloatConstants(ast.NodeTransformer):
+    """
+    Замена целых констант вещественными, чтобы выражения вроде 9**9**9
+    переполнялись сразу, а не вычислялись как огромные целые числа
+    """
+
+    def visit_Constant(self, node: ast.Constant) -> ast.Constant:
+        return ast.copy_location(ast.Constant(value=float(node.value)), node)
+
+
+def parse_expression(text: str) -> ast.Expression:
+    """
+    Разбор выражения с проверкой по белому списку операторов и имен
+    """
+    if len(text) > MAX_LENGTH:
+        raise ValueError(f"Выражение длиннее {MAX_LENGTH} символов")
+    try:
+        tree = ast.parse(text.strip(), mode='eval')
+        _check_node(tree, text)
+        return _FloatConstants().visit(tree)
+    except SyntaxError as e:
+        raise ValueError(f"Синтаксическая ошибка в выражении '{text}': {e.msg}")
+    except (RecursionError, MemoryError):
+        raise ValueError(f"Слишком глубокая вложенность в выражении '{text}'")
+
+
+def _build_function(tree: ast.Expression, namespace: dict) -> Callable:
+    """
+    Компиляция выражения в функцию lambda x: <выражение> с заданными именами
+    """
+    lambda_node = ast.Lambda(
+        args=ast.arguments(posonlyargs=[], args=[ast.arg(arg=VARIABLE)], kwonlyargs=[],
+                           kw_defaults=[], defaults=[]),
+        body=tree.body)
+    module = ast.fix_missing_locations(ast.Expression(body=lambda_node))
+    return eval(compile(module, '<expression>', 'eval'), {'__builtins__': {}, **namespace})
+
+
+@functools.lru_cache(maxsize=256)
+def compile_expression(text: str) -> CompiledExpression:
+    """
+    Разбор и компиляция выражения (результат кэшируется по тексту)
+    """
+    tree = parse_expression(text)
+    try:
+        scalar_impl = _build_function(tree, {**CONSTANTS,
+                                             **{name: impl[0] for name, impl in FUNCTIONS.items()}})
+        vectorized = _build_function(tree, {**CONSTANTS,
+                                            **{name: getattr(np, impl[1])
+                                               for name, impl in FUNCTIONS.items()}})
+    except (RecursionError, MemoryError):
+        raise ValueError(f"Слишком глубокая вложенность в выражении '{text}'")
+
+    def scalar(x: float) -> float:
+        result = scalar_impl(x)
+        if isinstance(result, complex):
+            raise ValueError(f"Выражение '{text}' имеет комплексное значение при x = {x}")
+        return float(result)
+
+    # Имя с текстом выражения отличает функции друг от друга
+    # (в ключах хранилища результатов, метриках и сообщениях)
+    scalar.__name__ = scalar.__qualname__ = f"expression[{text}]"
+    scalar.__module__ = __name__
+    scalar.__doc__ = f"Пользовательское выражение: y = {text}"
+    return CompiledExpression(text, scalar, vectorized)
+
+
+def parse_spec(value: str) -> Tuple[str, float, float]:
+    """
+    Разбор описания "ВЫРАЖЕНИЕ[@MIN,MAX]" из командной строки
+
+    Выражение проверяется сразу, чтобы ошибка в нем была ошибкой
+    аргумента, а не исключением при регистрации функции.
+
+    Returns:
+        Текст выражения и границы области определения
+    """
+    text, _, domain = value.partition('@')
+    parse_expression(text)
+    if not domain:
+        return text, -float('inf'), float('inf')
+    try:
+        min_val, max_val = (float(v) for v in domain.split(','))
+    except ValueError:
+        raise ValueError(f"Область определения должна иметь вид MIN,MAX: {domain}")
+    return text, min_val, max_val
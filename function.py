@@ -1,8 +1,15 @@
 import math
-from decorate import validate_input_decorator, timer_decorator, cache_decorator, logging_decorator
+from lazy import lazy_import
+import expression
+from domain import Singularity
+from decorate import (validate_input_decorator, timer_decorator, cache_decorator,
+                      logging_decorator, vectorize_decorator)
+
+np = lazy_import('numpy')
 
 
 # Базовые математические функции
+@vectorize_decorator(lambda x: 2 * x + 3)
 @validate_input_decorator(-100, 100)
 @cache_decorator
 def linear_function(x: float) -> float:
@@ -12,6 +19,7 @@ def linear_function(x: float) -> float:
     return 2 * x + 3
 
 
+@vectorize_decorator(lambda x: x**2 - 4)
 @validate_input_decorator(-10, 10)
 @cache_decorator
 def quadratic_function(x: float) -> float:
@@ -21,6 +29,7 @@ def quadratic_function(x: float) -> float:
     return x**2 - 4
 
 
+@vectorize_decorator(lambda x: np.sin(x))
 @validate_input_decorator(-2*math.pi, 2*math.pi)
 @cache_decorator
 def sin_function(x: float) -> float:
@@ -30,6 +39,7 @@ def sin_function(x: float) -> float:
     return math.sin(x)
 
 
+@vectorize_decorator(lambda x: np.cos(x))
 @validate_input_decorator(-2*math.pi, 2*math.pi)
 @cache_decorator
 def cos_function(x: float) -> float:
@@ -39,7 +49,9 @@ def cos_function(x: float) -> float:
     return math.cos(x)
 
 
-@validate_input_decorator(-math.pi/2 + 0.01, math.pi/2 - 0.01)
+@vectorize_decorator(lambda x: np.tan(x))
+@validate_input_decorator(-math.pi/2 + 0.01, math.pi/2 - 0.01,
+                          singularities=[Singularity(math.pi/2, math.pi)])
 @cache_decorator
 def tan_function(x: float) -> float:
     """
@@ -48,6 +60,7 @@ def tan_function(x: float) -> float:
     return math.tan(x)
 
 
+@vectorize_decorator(lambda x: np.log(x))
 @validate_input_decorator(0.01, 100)
 @cache_decorator
 def log_function(x: float) -> float:
@@ -57,7 +70,8 @@ def log_function(x: float) -> float:
     return math.log(x)
 
 
-@validate_input_decorator(0, 100)
+@vectorize_decorator(lambda x: np.sqrt(x))
+@validate_input_decorator(0, 100, open_min=True)
 @cache_decorator
 def sqrt_function(x: float) -> float:
     """
@@ -66,6 +80,7 @@ def sqrt_function(x: float) -> float:
     return math.sqrt(x)
 
 
+@vectorize_decorator(lambda x: np.exp(x))
 @validate_input_decorator(-10, 10)
 @cache_decorator
 def exp_function(x: float) -> float:
@@ -75,6 +90,7 @@ def exp_function(x: float) -> float:
     return math.exp(x)
 
 
+@vectorize_decorator(lambda x: x**3 - 3*x)
 @validate_input_decorator(-10, 10)
 @cache_decorator
 def cubic_function(x: float) -> float:
@@ -84,6 +100,7 @@ def cubic_function(x: float) -> float:
     return x**3 - 3*x
 
 
+@vectorize_decorator(lambda x: 1 / (x**2 + 1))
 @validate_input_decorator(-5, 5)
 @cache_decorator
 def rational_function(x: float) -> float:
@@ -93,12 +110,52 @@ def rational_function(x: float) -> float:
     return 1 / (x**2 + 1)
 
 
+# Функции, зарегистрированные во время работы программы
+_registered_functions = {}
+_registered_numbers = {}
+
+
+def register_expression(text: str,
+                        min_val: float = -float('inf'),
+                        max_val: float = float('inf'),
+                        description: str = None) -> int:
+    """
+    Регистрация пользовательского выражения, например "x**3 - 2*sin(x)"
+    
+    Выражение компилируется один раз в скалярную и векторизованную формы
+    и получает те же проверку области определения и кэширование,
+    что и встроенные функции.
+    
+    Returns:
+        Номер функции в словаре get_available_functions()
+    """
+    key = (text.strip(), min_val, max_val)
+    if key in _registered_numbers:
+        return _registered_numbers[key]
+    
+    compiled = expression.compile_expression(text.strip())
+    # Кэш каждого выражения виден в метриках отдельно
+    name = f"expression[{compiled.text}]"
+    if (min_val, max_val) != (-float('inf'), float('inf')):
+        name += f"@{min_val:g},{max_val:g}"
+    func = vectorize_decorator(compiled.vectorized)(
+        validate_input_decorator(min_val, max_val)(
+            cache_decorator(compiled.scalar, name=name)))
+    # Под этим именем функция видна в метриках и в экспортированных файлах
+    func.__name__ = name
+    
+    number = max(get_available_functions()) + 1
+    _registered_functions[number] = (description or f"Выражение (y = {compiled.text})", func)
+    _registered_numbers[key] = number
+    return number
+
+
 # Функция для получения списка доступных функций
 def get_available_functions() -> dict:
     """
     Возвращает словарь доступных функций
     """
-    return {
+    functions = {
         1: ("Линейная (y = 2x + 3)", linear_function),
         2: ("Квадратичная (y = x² - 4)", quadratic_function),
         3: ("Синус (y = sin(x))", sin_function),
@@ -110,6 +167,9 @@ def get_available_functions() -> dict:
         9: ("Кубическая (y = x³ - 3x)", cubic_function),
         10: ("Рациональная (y = 1/(x² + 1))", rational_function)
     }
+    functions.update(_registered_functions)
+    return functions
+
 
 
 
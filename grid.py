@@ -0,0 +1,66 @@
+from __future__ import annotations
+import math
+from typing import Iterator
+from lazy import lazy_import
+
+np = lazy_import('numpy')
+
+
+# Размер порции по умолчанию для ленивого обхода сетки
+DEFAULT_CHUNK_SIZE = 65536
+
+
+def grid_size(a: float, b: float, step: float) -> int:
+    """
+    Количество точек сетки x_i = a + i*step, не выходящих за b
+
+    Отношение (b - a) / step, отличающееся от целого только ошибкой
+    округления, считается целым, поэтому точка b всегда попадает в сетку.
+    """
+    if step <= 0:
+        raise ValueError(f"Шаг должен быть положительным, получен {step}")
+    if a > b:
+        raise ValueError(f"Начало интервала больше конца: a={a}, b={b}")
+
+    ratio = (b - a) / step
+    nearest = round(ratio)
+    if abs(ratio - nearest) <= 1e-9 * max(1.0, abs(ratio)):
+        return int(nearest) + 1
+    return int(math.floor(ratio)) + 1
+
+
+def _fill_grid(a: float, b: float, step: float, start: int, stop: int) -> np.ndarray:
+    """
+    Заполнение массива узлами сетки с индексами [start, stop)
+    """
+    x = np.arange(start, stop, dtype=float)
+    x *= step
+    x += a
+    # Последний узел не должен выходить за b из-за ошибки округления
+    np.minimum(x, b, out=x)
+    return x
+
+
+def build_grid(a: float, b: float, step: float) -> np.ndarray:
+    """
+    Построение сетки X в виде заранее выделенного массива
+
+    Узлы вычисляются по индексу как a + i*step, поэтому ошибка округления
+    не накапливается и количество точек всегда равно grid_size(a, b, step).
+    """
+    return _fill_grid(a, b, step, 0, grid_size(a, b, step))
+
+
+def iter_grid(a: float, b: float, step: float,
+              chunk_size: int = DEFAULT_CHUNK_SIZE) -> Iterator[np.ndarray]:
+    """
+    Ленивый обход сетки X порциями не более chunk_size точек
+
+    Значения узлов совпадают с build_grid, но полный массив не создается.
+    """
+    if chunk_size <= 0:
+        raise ValueError(f"Размер порции должен быть положительным, получен {chunk_size}")
+
+    n = grid_size(a, b, step)
+    for start in range(0, n, chunk_size):
+        yield _fill_grid(a, b, step, start, min(start + chunk_size, n))
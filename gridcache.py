@@ -0,0 +1,211 @@
+from __future__ import annotations
+import threading
+from collections import OrderedDict
+from typing import Callable, Dict, List, NamedTuple, Optional, Tuple
+from lazy import lazy_import
+from series import Series
+
+np = lazy_import('numpy')
+
+
+# Ограничение объема кэша по умолчанию: всего точек во всех сетках
+DEFAULT_MAX_POINTS = 10_000_000
+
+# Допуск, с которым отношение шагов и смещение сеток считаются целыми
+_TOLERANCE = 1e-9
+
+
+class _Entry(NamedTuple):
+    a: float
+    step: float
+    series: Series
+
+
+def _as_integer(value: float) -> Optional[int]:
+    """
+    Ближайшее целое к value, если value отличается от него только ошибкой округления
+    """
+    nearest = round(value)
+    if abs(value - nearest) <= _TOLERANCE * max(1.0, abs(value)):
+        return int(nearest)
+    return None
+
+
+def grid_overlap(a_old: float, step_old: float, n_old: int,
+                 a_new: float, step_new: float, n_new: int) -> Optional[Tuple[np.ndarray, np.ndarray]]:
+    """
+    Общие узлы двух сеток x = a + i*step
+
+    Сетки совместимы, если один шаг делится на другой нацело, а начала
+    отличаются на целое число меньших шагов. Тогда общие узлы находятся
+    в целочисленной арифметике без сравнения значений X.
+
+    Returns:
+        Индексы общих узлов в новой и в старой сетке или None,
+        если сетки несовместимы или не пересекаются
+    """
+    small = min(step_old, step_new)
+    ratio_old = _as_integer(step_old / small)
+    ratio_new = _as_integer(step_new / small)
+    offset = _as_integer((a_new - a_old) / small)
+    if ratio_old is None or ratio_new is None or offset is None:
+        return None
+    if a_new > a_old + (n_old - 1) * step_old or a_old > a_new + (n_new - 1) * step_new:
+        return None
+
+    # Узел j новой сетки совпадает с узлом i старой, если offset + j*ratio_new = i*ratio_old
+    position = np.arange(n_new, dtype=np.int64) * ratio_new + offset
+    new_index = np.flatnonzero((position % ratio_old == 0) &
+                               (position >= 0) & (position < n_old * ratio_old))
+    if not len(new_index):
+        return None
+    return new_index, position[new_index] // ratio_old
+
+
+class GridCache:
+    """
+    Кэш вычисленных сеток в памяти с учетом их взаимного расположения
+
+    В отличие от cache_decorator, который находит значение только по
+    совпадающему (округленному) аргументу, кэш сопоставляет сетки целиком:
+    если новая сетка перекрывает прежнюю, сдвинута на целое число шагов
+    или получена делением шага на целое число (и наоборот), общие узлы
+    берутся из прежних рядов, а вычисляются только новые точки. Объем
+    ограничивается суммарным числом точек, самые старые сетки вытесняются
+    первыми, а сетки, целиком вошедшие в новую, удаляются сразу.
+    """
+
+    def __init__(self, max_points: int = DEFAULT_MAX_POINTS):
+        if max_points <= 0:
+            raise ValueError(f"max_points должно быть положительным, получено {max_points}")
+        self.max_points = max_points
+        self._entries: Dict[Callable, List[_Entry]] = {}
+        self._order = OrderedDict()
+        self._lock = threading.Lock()
+        self._points = 0
+        self.reused = 0
+        self.computed = 0
+        self.evictions = 0
+
+    def _matches(self, func: Callable, a: float, step: float,
+                 x_array: np.ndarray) -> List[Tuple[Series, np.ndarray, np.ndarray]]:
+        with self._lock:
+            entries = list(self._entries.get(func, ()))
+        matches = []
+        # Более свежие сетки просматриваются первыми
+        for entry in reversed(entries):
+            overlap = grid_overlap(entry.a, entry.step, len(entry.series),
+                                   a, step, len(x_array))
+            if overlap is not None:
+                matches.append((entry.series, *overlap))
+        return matches
+
+    def evaluate(self, func: Callable, a: float, step: float, x_array: np.ndarray,
+                 compute: Callable[[np.ndarray], Series]) -> Tuple[Series, int]:
+        """
+        Ряд функции на сетке x_array = a + i*step с повторным использованием точек
+
+        Args:
+            func: Функция (ключ кэша)
+            a: Начало сетки
+            step: Шаг сетки
+            x_array: Узлы сетки
+            compute: Вычисление ряда для массива узлов, которых нет в кэше
+
+        Returns:
+            Ряд на всей сетке и количество точек, взятых из кэша
+        """
+        n = len(x_array)
+        y = np.empty(n)
+        known = np.zeros(n, dtype=bool)
+        errors = {}
+        reasons = None
+        superseded = []
+
+        for series, new_index, old_index in self._matches(func, a, step, x_array):
+            # Прежняя сетка целиком входит в новую и больше не нужна
+            if len(new_index) == len(series):
+                superseded.append(series)
+            fresh = ~known[new_index]
+            new_index, old_index = new_index[fresh], old_index[fresh]
+            if not len(new_index):
+                continue
+            y[new_index] = series.y[old_index]
+            known[new_index] = True
+            if series.n_errors:
+                invalid = np.flatnonzero(~np.isfinite(y[new_index])).tolist()
+                errors.update((int(new_index[k]), series.errors[int(old_index[k])])
+                              for k in invalid if int(old_index[k]) in series.errors)
+            if series.reasons is not None:
+                if reasons is None:
+                    reasons = np.zeros(n, dtype=np.uint8)
+                reasons[new_index] = series.reasons[old_index]
+
+        reused = int(np.count_nonzero(known))
+        if reused == n:
+            result = Series(x_array, y, errors, reasons=reasons)
+        elif reused == 0:
+            result = compute(x_array)
+        else:
+            missing = np.flatnonzero(~known)
+            part = compute(x_array[missing])
+            y[missing] = part.y
+            errors.update((int(missing[i]), message) for i, message in part.errors.items())
+            if part.reasons is not None:
+                if reasons is None:
+                    reasons = np.zeros(n, dtype=np.uint8)
+                reasons[missing] = part.reasons
+            result = Series(x_array, y, errors, reasons=reasons)
+
+        self._put(func, _Entry(a, step, result), superseded)
+        with self._lock:
+            self.reused += reused
+            self.computed += n - reused
+        return result, reused
+
+    def _put(self, func: Callable, entry: _Entry, superseded: List[Series]) -> None:
+        with self._lock:
+            for old_entry in list(self._entries.get(func, ())):
+                if any(old_entry.series is series for series in superseded):
+                    self._remove(func, old_entry)
+            self._entries.setdefault(func, []).append(entry)
+            self._order[id(entry)] = (func, entry)
+            self._points += len(entry.series)
+
+            # Старые сетки вытесняются, но последняя вычисленная остается всегда
+            while self._points > self.max_points and len(self._order) > 1:
+                old_func, old_entry = next(iter(self._order.values()))
+                self._remove(old_func, old_entry)
+                self.evictions += 1
+
+    def _remove(self, func: Callable, entry: _Entry) -> None:
+        del self._order[id(entry)]
+        self._entries[func].remove(entry)
+        if not self._entries[func]:
+            del self._entries[func]
+        self._points -= len(entry.series)
+
+    def clear(self) -> None:
+        """
+        Очистка кэша и сброс счетчиков
+        """
+        with self._lock:
+            self._entries.clear()
+            self._order.clear()
+            self._points = 0
+            self.reused = self.computed = self.evictions = 0
+
+    def info(self) -> dict:
+        """
+        Статистика кэша в точках: попадания (взятые из кэша), промахи
+        (вычисленные заново), а также вытеснения и текущий размер в сетках
+        """
+        with self._lock:
+            return {
+                'hits': self.reused,
+                'misses': self.computed,
+                'evictions': self.evictions,
+                'size': len(self._order),
+                'points': self._points,
+                'max_points': self.max_points,
+            }
@@ -0,0 +1,84 @@
+import importlib
+import importlib.util
+import sys
+import threading
+from types import ModuleType
+
+
+# Один замок на все отложенные импорты: загрузка модуля выполняется один раз
+_lock = threading.Lock()
+_proxies = {}
+
+
+class _LazyModule(ModuleType):
+    """
+    Заместитель модуля, загружающий его при первом обращении к атрибуту
+
+    Загрузка выполняется под замком, поэтому потоки, одновременно
+    обратившиеся к еще не загруженному модулю, дожидаются ее окончания
+    и получают полностью инициализированный модуль. После загрузки
+    атрибуты модуля копируются в заместитель, и дальнейшие обращения
+    не проходят через __getattr__.
+    """
+
+    def __init__(self, name: str):
+        super().__init__(name)
+        self.__dict__['_module'] = None
+
+    def _load(self) -> ModuleType:
+        module = self.__dict__['_module']
+        if module is None:
+            with _lock:
+                module = self.__dict__['_module']
+                if module is None:
+                    module = importlib.import_module(self.__name__)
+                    self.__dict__.update((key, value) for key, value in vars(module).items()
+                                         if not key.startswith('__'))
+                    self.__dict__['_module'] = module
+        return module
+
+    def __getattr__(self, attr: str):
+        return getattr(self._load(), attr)
+
+    def __dir__(self):
+        return dir(self._load())
+
+
+def lazy_import(name: str) -> ModuleType:
+    """
+    Отложенный импорт модуля
+
+    Возвращает модуль, который загружается при первом обращении к любому
+    его атрибуту. Так тяжелые зависимости (NumPy) не замедляют запуск
+    программы, если вычисления на массивах не понадобились. Если модуль
+    уже импортирован, он возвращается как есть.
+
+    Возвращается заместитель, а не сам модуль: в sys.modules он не
+    записывается, поэтому обычный "import name" в другом месте программы
+    загружает модуль как обычно. Первая загрузка защищена замком
+    (importlib.util.LazyLoader в Python 3.11 не потокобезопасен: другие
+    потоки могли получить еще не загруженный модуль).
+    """
+    module = sys.modules.get(name)
+    if module is not None:
+        return module
+
+    with _lock:
+        proxy = _proxies.get(name)
+        if proxy is None:
+            if importlib.util.find_spec(name) is None:
+                raise ImportError(f"Модуль {name} не найден")
+            proxy = _proxies[name] = _LazyModule(name)
+    return proxy
+
+
+def preload(module: ModuleType) -> ModuleType:
+    """
+    Немедленная загрузка модуля, полученного из lazy_import
+
+    Нужна там, где первое обращение к модулю иначе произошло бы
+    во время обработки запросов, например перед запуском сервиса.
+    """
+    if isinstance(module, _LazyModule):
+        return module._load()
+    return module
@@ -1,13 +1,34 @@
-
+from __future__ import annotations
 import sys
-from typing import Tuple, List
+import argparse
+import atexit
+import csv
+import json
+import os
+import time
+from typing import Tuple, List, Optional, NamedTuple, Sequence
+import domain
+import expression
 import function as funcs
+import grid
+from lazy import lazy_import
+import metrics
+import output
+import parallel
+from gridcache import GridCache
+from series import Series
+from store import ResultStore
 import visualization as vis
 
+np = lazy_import('numpy')
+
 
-def get_user_input() -> Tuple[float, float, float, int]:
+def get_user_input(max_points: Optional[int] = 10000) -> Tuple[float, float, float, int]:
     """
     Получение входных данных от пользователя
+    
+    Если сетка больше max_points точек, запрашивается подтверждение
+    (None - без ограничения, например при вычислении вне памяти).
     """
     print("=" * 60)
     print("ПРОГРАММА ДЛЯ ИССЛЕДОВАНИЯ МАТЕМАТИЧЕСКИХ ФУНКЦИЙ")
@@ -22,13 +43,13 @@ def get_user_input() -> Tuple[float, float, float, int]:
     # Выбор функции
     while True:
         try:
-            choice = int(input("\nВыберите номер функции (1-10): "))
+            choice = int(input(f"\nВыберите номер функции (1-{max(available_funcs)}): "))
             if choice in available_funcs:
                 func_desc, selected_func = available_funcs[choice]
                 print(f"✓ Выбрана функция: {func_desc}")
                 break
             else:
-                print(" Ошибка: введите число от 1 до 10")
+                print(f" Ошибка: введите число от 1 до {max(available_funcs)}")
         except ValueError:
             print(" Ошибка: введите целое число")
     
@@ -43,10 +64,12 @@ def get_user_input() -> Tuple[float, float, float, int]:
                 print(" Ошибка: a должно быть меньше b")
                 continue
                 
-            # Проверка интервала для выбранной функции
-            func_name = selected_func.__name__
-            if 'tan' in func_name and (abs(a % (3.14159/2)) < 0.1 or abs(b % (3.14159/2)) < 0.1):
-                print("  Внимание: тангенс не определен в точках π/2 + πk")
+            # Проверка интервала по объявленной области определения функции
+            domain_info = getattr(selected_func, 'domain', None)
+            if domain_info is not None and not domain_info.contains_interval(a, b):
+                print(f"  Внимание: интервал выходит за область определения функции "
+                      f"[{domain_info.min:g}, {domain_info.max:g}] или содержит ее особые точки,"
+                      f" в этих точках значения не будут вычислены")
                 response = input("  Продолжить? (да/нет): ").lower()
                 if response not in ['да', 'yes', 'y', 'д']:
                     continue
@@ -64,9 +87,10 @@ def get_user_input() -> Tuple[float, float, float, int]:
                 continue
             
             # Проверка на слишком мелкий/крупный шаг
-            n_points = int((b - a) / step) + 1
-            if n_points > 10000:
-                print(f"  Будет создано {n_points} точек - это много!")
+            n_points = grid.grid_size(a, b, step)
+            if max_points is not None and n_points > max_points:
+                print(f"  Будет создано {n_points} точек - это много! "
+                      f"Для больших сеток используйте режим --out-of-core")
                 response = input("  Продолжить? (да/нет): ").lower()
                 if response not in ['да', 'yes', 'y', 'д']:
                     continue
@@ -83,96 +107,379 @@ def get_user_input() -> Tuple[float, float, float, int]:
     return a, b, step, selected_func, func_desc
 
 
-def calculate_vectors(a: float, b: float, step: float, func) -> Tuple[List[float], List[float]]:
+def _report_errors(series: Series, label: str = "") -> None:
     """
-    Расчет векторов X и Y
+    Сообщение об ошибках вычисления ряда (первые 5 ошибок)
     """
-    print("\n" + "=" * 60)
-    print("РАСЧЕТ ЗНАЧЕНИЙ ФУНКЦИИ...")
-    print("=" * 60)
+    if series.n_errors and output.enabled(output.SUMMARY):
+        suffix = f" ({label})" if label else ""
+        output.emit(output.SUMMARY, f"\n  Обнаружено {series.n_errors} ошибок при вычислениях{suffix}:")
+        for x, error in series.error_list(5):
+            output.emit(output.SUMMARY, f"   x = {x:.4f}: {error}")
+        if series.n_errors > 5:
+            output.emit(output.SUMMARY, f"   ... и еще {series.n_errors - 5} ошибок")
+
+
+def _domain_reasons(func, x_array: np.ndarray) -> Optional[np.ndarray]:
+    """
+    Коды причин для точек сетки вне области определения функции
     
-    x_values = []
-    y_values = []
-    errors = []
+    Если функция не объявляет область или сетка целиком лежит в ней,
+    возвращается None и отдельные точки не проверяются.
+    """
+    domain = getattr(func, 'domain', None)
+    if domain is None or not len(x_array) or domain.contains_interval(x_array[0], x_array[-1]):
+        return None
+    return domain.reasons(x_array)
+
+
+def _evaluate_pointwise(func, x_array: np.ndarray,
+                        workers: Optional[int] = 1,
+                        chunk_size: int = parallel.DEFAULT_CHUNK_SIZE,
+                        x_list: Optional[List[float]] = None) -> Series:
+    """
+    Поточечное вычисление функции на сетке (при workers > 1 - в пуле процессов)
     
-    # Генерация значений X
-    current = a
-    while current <= b + step/100:  # Добавляем небольшую погрешность для включения b
-        x_values.append(current)
-        current += step
+    Если функция объявляет область определения, точки вне ее отмечаются
+    одной векторной маской (NaN и код причины) и не вычисляются, а точки
+    внутри области вычисляются без повторной проверки в каждой точке.
+    x_list - уже построенный x_array.tolist(), если сетка общая для
+    нескольких функций.
+    """
+    reasons = _domain_reasons(func, x_array)
+    # В другой процесс функция передается по имени, поэтому в пуле
+    # используется обертка с проверками, а не func.unchecked
+    point_func = getattr(func, 'unchecked', func) if workers == 1 else func
+    if reasons is None:
+        if x_list is None:
+            x_list = x_array.tolist()
+        y_values, errors = parallel.evaluate(point_func, x_list, workers, chunk_size)
+        return Series(x_array, y_values, errors)
     
-    # Расчет значений Y
-    for i, x in enumerate(x_values):
-        try:
-            y = func(x)
-            y_values.append(y)
-            print(f"  f({x:.4f}) = {y:.6f}")
-        except Exception as e:
-            errors.append((x, str(e)))
-            y_values.append(float('nan'))  # Используем NaN для ошибок
-            print(f"  f({x:.4f}) = ОШИБКА: {e}")
+    inside = np.flatnonzero(reasons == domain.VALID)
+    y_array = np.full(len(x_array), np.nan)
+    y_inside, errors = parallel.evaluate(point_func, x_array[inside].tolist(), workers, chunk_size)
+    y_array[inside] = y_inside
+    return Series(x_array, y_array, ((int(inside[i]), message) for i, message in errors),
+                  reasons=reasons)
+
+
+def _compute_series(func, x_array: np.ndarray,
+                    workers: Optional[int] = 1,
+                    chunk_size: int = parallel.DEFAULT_CHUNK_SIZE) -> Series:
+    """
+    Вычисление ряда функции на массиве узлов X
+    """
+    show_points = output.enabled(output.POINTS)
+    if hasattr(func, 'vectorized'):
+        # Векторизованный путь: весь массив X за один вызов,
+        # точки вне области определения получают NaN
+        reasons = _domain_reasons(func, x_array)
+        series = Series(x_array, func.vectorized(x_array, reasons), reasons=reasons)
+        if show_points:
+            for x, y in zip(series.x.tolist(), series.y.tolist()):
+                output.emit(output.POINTS, f"  f({x:.4f}) = {y:.6f}")
+        if output.enabled(output.SUMMARY):
+            output.emit(output.SUMMARY,
+                        f"  Вычислено {len(series)} значений за один векторизованный вызов")
+    else:
+        # Поточечное вычисление, для больших сеток - в пуле процессов
+        series = _evaluate_pointwise(func, x_array, workers, chunk_size)
+        if show_points:
+            for i, (x, y) in enumerate(zip(series.x.tolist(), series.y.tolist())):
+                error = series.error(i)
+                if error is not None:
+                    output.emit(output.POINTS, f"  f({x:.4f}) = ОШИБКА: {error}")
+                else:
+                    output.emit(output.POINTS, f"  f({x:.4f}) = {y:.6f}")
+    return series
+
+
+def calculate_vectors(a: float, b: float, step: float, func,
+                      workers: Optional[int] = 1,
+                      chunk_size: int = parallel.DEFAULT_CHUNK_SIZE,
+                      store: Optional[ResultStore] = None,
+                      cache: Optional[GridCache] = None) -> Series:
+    """
+    Расчет векторов X и Y
+    
+    Результат - ряд Series на массивах float64 с маской корректных точек
+    и сообщениями об ошибках по индексам.
+    Подробность сообщений задается модулем output: в тихом режиме
+    строки не форматируются, в режиме 'points' выводится каждая точка.
+    Функции без векторизованного пути при workers > 1 (или None - по числу
+    ядер) вычисляются в пуле процессов порциями по chunk_size точек.
+    Если передано хранилище store, результат сначала ищется в нем,
+    а новые результаты записываются обратно. Кэш сеток cache позволяет
+    при расширении интервала, сдвиге или дроблении шага вычислять только
+    новые точки. При включенном сборе метрик время и количество точек
+    учитываются под именем функции.
+    """
+    collect_metrics = metrics.enabled()
+    if collect_metrics:
+        start_time = time.perf_counter_ns()
+    
+    if output.enabled(output.SUMMARY):
+        output.emit(output.SUMMARY, "\n" + "=" * 60)
+        output.emit(output.SUMMARY, "РАСЧЕТ ЗНАЧЕНИЙ ФУНКЦИИ...")
+        output.emit(output.SUMMARY, "=" * 60)
+    
+    series = store.load(func, a, b, step) if store is not None else None
+    if series is not None:
+        if output.enabled(output.SUMMARY):
+            output.emit(output.SUMMARY, f"  Загружено {len(series)} значений из хранилища результатов")
+    else:
+        # Генерация значений X: узлы a + i*step без накопления погрешности
+        x_array = grid.build_grid(a, b, step)
+        
+        # Расчет значений Y (при наличии кэша сеток - только в новых точках)
+        if cache is not None:
+            series, reused = cache.evaluate(
+                func, a, step, x_array,
+                lambda x: _compute_series(func, x, workers, chunk_size))
+            if reused and output.enabled(output.SUMMARY):
+                output.emit(output.SUMMARY, f"  Повторно использовано {reused} из {len(series)} "
+                                            f"значений ранее вычисленных сеток")
+        else:
+            series = _compute_series(func, x_array, workers, chunk_size)
+        
+        if store is not None:
+            store.save(func, a, b, step, series)
     
     # Сообщение об ошибках
-    if errors:
-        print(f"\n  Обнаружено {len(errors)} ошибок при вычислениях:")
-        for x, error in errors[:5]:  # Показываем только первые 5 ошибок
-            print(f"   x = {x:.4f}: {error}")
-        if len(errors) > 5:
-            print(f"   ... и еще {len(errors) - 5} ошибок")
+    _report_errors(series)
     
-    return x_values, y_values
+    if collect_metrics:
+        metrics.registry.record(getattr(func, '__name__', repr(func)),
+                                time.perf_counter_ns() - start_time, len(series))
+    
+    output.flush()
+    return series
 
 
-def main():
+def sweep_file(directory: str, func) -> str:
+    """
+    Новый файл для результатов расчета вне памяти в каталоге directory
+    
+    Файл с уникальным именем вида <функция>_XXXX.pzc создается пустым;
+    удалять его после использования должен вызывающий код.
+    """
+    import export
+    import re
+    import tempfile
+    
+    os.makedirs(directory, exist_ok=True)
+    # Имя выражения может содержать символы, недопустимые в имени файла
+    name = re.sub(r'[^\w.-]+', '_', getattr(func, '__name__', 'function'))
+    fd, path = tempfile.mkstemp(prefix=f"{name}_", suffix=export.COLUMNAR_EXTENSION, dir=directory)
+    os.close(fd)
+    return path
+
+
+def calculate_out_of_core(a: float, b: float, step: float, func, path: str,
+                          chunk_size: int = grid.DEFAULT_CHUNK_SIZE) -> Series:
+    """
+    Расчет сетки вне оперативной памяти
+    
+    Сетка вычисляется порциями по chunk_size точек и записывается
+    в столбцовый файл path (.pzc, см. sweep_file), поэтому объем памяти
+    ограничен размером порции, а не числом точек. Статистика Y
+    накапливается по порциям и объединяется (stats.Summary.merge).
+    Возвращается ряд на отображенных в память столбцах файла: таблица
+    и прореженный график читают из него только нужные части.
+    """
+    import export
+    
+    n_points = grid.grid_size(a, b, step)
+    if output.enabled(output.SUMMARY):
+        output.emit(output.SUMMARY, "\n" + "=" * 60)
+        output.emit(output.SUMMARY, "РАСЧЕТ ЗНАЧЕНИЙ ФУНКЦИИ ВНЕ ПАМЯТИ...")
+        output.emit(output.SUMMARY, "=" * 60)
+    
+    start = time.perf_counter()
+    summary = export.export_sweep(path, func, a, b, step, chunk_size)
+    x_values, y_values, _ = export.read_columnar(path)
+    series = Series(x_values, y_values, summary=summary)
+    
+    if output.enabled(output.SUMMARY):
+        output.emit(output.SUMMARY, f"  Вычислено {n_points} значений порциями по {chunk_size} точек "
+                                    f"за {time.perf_counter() - start:.2f} с")
+        output.emit(output.SUMMARY, f"  Файл результатов: {path} "
+                                    f"({os.path.getsize(path) / 2**20:.1f} МБ)")
+    _report_errors(series)
+    output.flush()
+    return series
+
+
+def calculate_many(a: float, b: float, step: float, functions: Sequence,
+                   workers: Optional[int] = 1,
+                   chunk_size: int = parallel.DEFAULT_CHUNK_SIZE) -> List[Series]:
+    """
+    Расчет нескольких функций на одной сетке X
+    
+    Сетка строится один раз, и все ряды ссылаются на один массив X.
+    Векторизованные функции вычисляются за общий проход по сетке
+    порциями grid.DEFAULT_CHUNK_SIZE: порция X остается в кэше процессора,
+    пока ее обрабатывают все функции. Остальные функции вычисляются
+    поточечно по общему списку X (при workers > 1 - в пуле процессов).
+    """
+    if output.enabled(output.SUMMARY):
+        output.emit(output.SUMMARY, "\n" + "=" * 60)
+        output.emit(output.SUMMARY, "РАСЧЕТ ЗНАЧЕНИЙ ФУНКЦИЙ...")
+        output.emit(output.SUMMARY, "=" * 60)
+    
+    x_array = grid.build_grid(a, b, step)
+    y_arrays = {i: np.empty(len(x_array)) for i, func in enumerate(functions)
+                if hasattr(func, 'vectorized')}
+    # Коды причин строятся один раз и служат и для NaN, и для ряда
+    reasons = {i: _domain_reasons(functions[i], x_array) for i in y_arrays}
+    for start in range(0, len(x_array), grid.DEFAULT_CHUNK_SIZE):
+        part = slice(start, start + grid.DEFAULT_CHUNK_SIZE)
+        for i, y in y_arrays.items():
+            part_reasons = reasons[i][part] if reasons[i] is not None else None
+            y[part] = functions[i].vectorized(x_array[part], part_reasons)
+    
+    # Список X для поточечных функций строится один раз на все функции
+    x_list = x_array.tolist() if len(y_arrays) < len(functions) else None
+    series_list = []
+    for i, func in enumerate(functions):
+        if i in y_arrays:
+            series = Series(x_array, y_arrays[i], reasons=reasons[i])
+        else:
+            series = _evaluate_pointwise(func, x_array, workers, chunk_size, x_list)
+        series_list.append(series)
+        _report_errors(series, getattr(func, '__name__', repr(func)))
+    
+    if output.enabled(output.SUMMARY):
+        output.emit(output.SUMMARY, f"  Вычислено {len(functions)} функций на общей сетке "
+                                    f"из {len(x_array)} точек "
+                                    f"(векторизованных: {len(y_arrays)})")
+    output.flush()
+    return series_list
+
+
+def _short_label(func_desc: str) -> str:
+    """
+    Короткая подпись функции: формула из описания "Название (y = формула)"
+    """
+    if "(y = " in func_desc and func_desc.endswith(")"):
+        return func_desc[func_desc.index("(y = ") + 5:-1]
+    return func_desc
+
+
+def compare_functions(function_ids: Sequence[int], a: float, b: float, step: float,
+                      workers: Optional[int] = 1,
+                      chunk_size: int = parallel.DEFAULT_CHUNK_SIZE,
+                      plot_path: Optional[str] = None) -> None:
+    """
+    Сравнение нескольких функций реестра на одной сетке
+    
+    Выводит общую таблицу с колонкой для каждой функции и строит
+    все функции на одном графике (в файл plot_path, если он задан).
+    """
+    available_funcs = funcs.get_available_functions()
+    unknown = [number for number in function_ids if number not in available_funcs]
+    if unknown:
+        raise ValueError(f"Неизвестные номера функций: {', '.join(map(str, unknown))}")
+    if a >= b:
+        raise ValueError("a должно быть меньше b")
+    if step <= 0:
+        raise ValueError("Шаг должен быть положительным")
+    
+    series_list = calculate_many(a, b, step, [available_funcs[number][1] for number in function_ids],
+                                 workers, chunk_size)
+    labels = [_short_label(available_funcs[number][0]) for number in function_ids]
+    
+    print("\n" + "=" * 60)
+    print("ТАБЛИЧНОЕ ПРЕДСТАВЛЕНИЕ")
+    print("=" * 60)
+    vis.print_xy_table(series_list, precision=6, max_rows=20, labels=labels)
+    
+    print("\n" + "=" * 60)
+    print("ПОСТРОЕНИЕ ГРАФИКА...")
+    print("=" * 60)
+    vis.plot_functions(series_list, labels, a, b,
+                       title="Сравнение функций", path=plot_path)
+
+
+def main(workers: Optional[int] = 1, chunk_size: int = parallel.DEFAULT_CHUNK_SIZE,
+         store: Optional[ResultStore] = None,
+         adaptive_tolerance: Optional[float] = None,
+         surrogate_tolerance: Optional[float] = None,
+         out_of_core: Optional[str] = None,
+         out_of_core_chunk: int = grid.DEFAULT_CHUNK_SIZE,
+         keep_files: bool = False):
     """
     Основная функция программы
+    
+    Если задан adaptive_tolerance, вместо равномерной сетки используется
+    адаптивная выборка с бюджетом, равным числу точек равномерной сетки.
+    Если задан surrogate_tolerance, равномерная сетка вычисляется по
+    аппроксимации Чебышева с этим допуском (для дорогих функций).
+    Если задан каталог out_of_core, сетка любого размера вычисляется
+    порциями по out_of_core_chunk точек в файл в этом каталоге и читается
+    через отображение в память; при выходе файлы удаляются, если не
+    задан keep_files.
+    Вычисленные сетки сохраняются в кэше на время сеанса, поэтому при
+    изменении интервала или шага вычисляются только новые точки.
     """
+    cache = GridCache()
+    metrics.registry.register_cache('grid_cache', cache.info)
+    sweep_files = []
+    series = None
     try:
-        # Получение данных от пользователя
-        a, b, step, func, func_desc = get_user_input()
-        
-        # Расчет векторов
-        x_values, y_values = calculate_vectors(a, b, step, func)
-        
-        # Проверка на наличие корректных данных
-        valid_y = [y for y in y_values if not (isinstance(y, float) and (y != y or abs(y) == float('inf')))]
-        if not valid_y:
-            print("\n Нет корректных значений функции для отображения")
-            return
-        
-        # Вывод таблицы
-        print("\n" + "=" * 60)
-        print("ТАБЛИЧНОЕ ПРЕДСТАВЛЕНИЕ")
-        print("=" * 60)
-        vis.print_xy_table(x_values, y_values, precision=6, max_rows=20)
-        
-        # Построение графика
-        print("\n" + "=" * 60)
-        print("ПОСТРОЕНИЕ ГРАФИКА...")
-        print("=" * 60)
-        
-        # Удаляем NaN значения для графика
-        clean_x = []
-        clean_y = []
-        for x, y in zip(x_values, y_values):
-            if isinstance(y, (int, float)) and not (y != y or abs(y) == float('inf')):
-                clean_x.append(x)
-                clean_y.append(y)
-        
-        if clean_x:
-            vis.plot_function(clean_x, clean_y, a, b, 
-                             title=f"График функции: {func_desc}")
-        else:
-            print(" Нет данных для построения графика")
-        
-        # Предложение продолжить
-        print("\n" + "=" * 60)
-        response = input("Хотите исследовать другую функцию? (да/нет): ").lower()
-        if response in ['да', 'yes', 'y', 'д']:
-            main()
-        else:
-            print("\nСпасибо за использование программы! До свидания!")
+        while True:
+            # Получение данных от пользователя
+            a, b, step, func, func_desc = get_user_input(None if out_of_core is not None else 10000)
+            
+            # Расчет векторов
+            if adaptive_tolerance is not None:
+                import adaptive
+                x_array, y_array = adaptive.adaptive_sample(
+                    func, a, b, adaptive_tolerance,
+                    max_points=max(grid.grid_size(a, b, step), adaptive.MIN_BUDGET))
+                output.flush()
+                series = Series(x_array, y_array)
+            elif out_of_core is not None:
+                path = sweep_file(out_of_core, func)
+                if not keep_files:
+                    sweep_files.append(path)
+                series = calculate_out_of_core(a, b, step, func, path, out_of_core_chunk)
+            elif surrogate_tolerance is not None:
+                import surrogate
+                series = surrogate.surrogate_sample(
+                    func, grid.build_grid(a, b, step), surrogate_tolerance).series
+                output.flush()
+            else:
+                series = calculate_vectors(a, b, step, func, workers, chunk_size, store, cache)
+            
+            # Проверка на наличие корректных данных
+            if series.n_valid == 0:
+                print("\n Нет корректных значений функции для отображения")
+                return
+            
+            # Вывод таблицы
+            print("\n" + "=" * 60)
+            print("ТАБЛИЧНОЕ ПРЕДСТАВЛЕНИЕ")
+            print("=" * 60)
+            vis.print_xy_table(series, precision=6, max_rows=20)
+            
+            # Построение графика
+            print("\n" + "=" * 60)
+            print("ПОСТРОЕНИЕ ГРАФИКА...")
             print("=" * 60)
+            
+            # Некорректные точки отбрасываются при прореживании по маске ряда;
+            # при масштабировании видимый участок пересчитывается заново
+            vis.plot_function(series, a=a, b=b, title=f"График функции: {func_desc}", func=func)
+            
+            # Предложение продолжить
+            print("\n" + "=" * 60)
+            response = input("Хотите исследовать другую функцию? (да/нет): ").lower()
+            if response not in ['да', 'yes', 'y', 'д']:
+                print("\nСпасибо за использование программы! До свидания!")
+                print("=" * 60)
+                break
     
     except KeyboardInterrupt:
         print("\n\nПрограмма прервана пользователем")
@@ -180,10 +487,239 @@ def main():
         print(f"\n Критическая ошибка: {e}")
         import traceback
         traceback.print_exc()
+    finally:
+        # Файл отображен в память рядом, поэтому удаляется после освобождения ряда
+        series = None
+        for path in sweep_files:
+            try:
+                os.remove(path)
+            except OSError as e:
+                print(f"Не удалось удалить файл результатов {path}: {e}")
+
+
+class Job(NamedTuple):
+    """
+    Задание пакетного режима
+    
+    table - путь к файлу полной таблицы или '-' для краткой таблицы в stdout,
+    plot - путь к файлу графика (PNG/SVG/PDF), export - путь к файлу данных
+    (.csv, .npy или .pzc); пустые значения отключают вывод.
+    """
+    function: int
+    a: float
+    b: float
+    step: float
+    table: Optional[str] = None
+    plot: Optional[str] = None
+    export: Optional[str] = None
+
+
+def load_jobs(path: str) -> List[Job]:
+    """
+    Чтение файла заданий в формате JSON или CSV
+    
+    JSON - список объектов (или объект с ключом "jobs") с полями
+    function, a, b, step и необязательными table, plot и export; в CSV те же
+    поля являются заголовками колонок.
+    """
+    with open(path, encoding='utf-8', newline='') as f:
+        if path.lower().endswith('.csv'):
+            rows = list(csv.DictReader(f))
+        else:
+            data = json.load(f)
+            rows = data['jobs'] if isinstance(data, dict) else data
+    
+    available_funcs = funcs.get_available_functions()
+    jobs = []
+    for number, row in enumerate(rows, 1):
+        try:
+            job = Job(int(row['function']), float(row['a']), float(row['b']), float(row['step']),
+                      row.get('table') or None, row.get('plot') or None,
+                      row.get('export') or None)
+        except (KeyError, TypeError, ValueError) as e:
+            raise ValueError(f"Задание {number}: некорректное описание ({e})")
+        
+        if job.function not in available_funcs:
+            raise ValueError(f"Задание {number}: неизвестный номер функции {job.function}")
+        if job.a >= job.b:
+            raise ValueError(f"Задание {number}: a должно быть меньше b")
+        if job.step <= 0:
+            raise ValueError(f"Задание {number}: шаг должен быть положительным")
+        if job.export:
+            import export
+            if os.path.splitext(job.export)[1].lower() not in export.EXPORT_EXTENSIONS:
+                raise ValueError(f"Задание {number}: неизвестный формат файла {job.export}, "
+                                 f"ожидается {', '.join(export.EXPORT_EXTENSIONS)}")
+        jobs.append(job)
+    return jobs
+
+
+def run_batch(jobs: List[Job], workers: Optional[int] = 1,
+              chunk_size: int = parallel.DEFAULT_CHUNK_SIZE,
+              store: Optional[ResultStore] = None) -> None:
+    """
+    Выполнение заданий без запросов ввода
+    
+    Задания с одинаковыми функцией и сеткой вычисляются один раз.
+    Графики рисуются в файлы одной переиспользуемой фигурой. В конце
+    выводится время и производительность (точек в секунду) по каждому заданию.
+    """
+    available_funcs = funcs.get_available_functions()
+    
+    # Группировка одинаковых сеток: каждая вычисляется один раз и сразу освобождается
+    groups = {}
+    for index, job in enumerate(jobs):
+        groups.setdefault((job.function, job.a, job.b, job.step), []).append(index)
+    
+    renderer = None
+    report = [None] * len(jobs)
+    for (function_id, a, b, step), indices in groups.items():
+        func_desc, func = available_funcs[function_id]
+        
+        start = time.perf_counter()
+        series = calculate_vectors(a, b, step, func, workers, chunk_size, store)
+        compute_time = time.perf_counter() - start
+        
+        for position, index in enumerate(indices):
+            job = jobs[index]
+            job_start = time.perf_counter()
+            
+            if job.table == '-':
+                vis.print_xy_table(series, precision=6, max_rows=20)
+            elif job.table:
+                vis.write_xy_table(job.table, series.x, series.y, precision=6)
+            
+            if job.plot:
+                if renderer is None:
+                    renderer = vis.HeadlessRenderer()
+                renderer.render(vis.PlotSeries(series.x, series.y, a, b,
+                                               f"График функции: {func_desc}", series.summary),
+                                job.plot)
+            
+            if job.export:
+                import export
+                export.export_series(job.export, export.array_chunks(series.x, series.y),
+                                     len(series), {'function': func.__name__,
+                                                     'a': a, 'b': b, 'step': step})
+            
+            # Время расчета учитывается только у первого задания группы
+            job_compute = compute_time if position == 0 else 0.0
+            report[index] = (func_desc, len(series), job_compute,
+                             job_compute + time.perf_counter() - job_start, position > 0)
+        
+        del series
+    
+    print_batch_report(report)
+
+
+def print_batch_report(report: List[Tuple[str, int, float, float, bool]]) -> None:
+    """
+    Вывод отчета пакетного режима: время и производительность по заданиям
+    
+    Для повторов уже вычисленной сетки производительность не указывается:
+    их время - только вывод результатов, и точки в нем не вычислялись.
+    """
+    print("\n" + "=" * 92)
+    print("ОТЧЕТ ПО ЗАДАНИЯМ")
+    print("=" * 92)
+    print(f"{'№':>3}  {'Функция':<32} {'Точек':>10} {'Расчет, с':>11} {'Всего, с':>10} {'Точек/с':>14}")
+    print("-" * 92)
+    
+    total_points = 0
+    total_time = 0.0
+    for number, (func_desc, n_points, compute_time, job_time, reused) in enumerate(report, 1):
+        if reused or job_time <= 0:
+            throughput = f"{'—':>14}"
+        else:
+            throughput = f"{n_points / job_time:14.0f}"
+            total_points += n_points
+        note = "  (повтор сетки)" if reused else ""
+        print(f"{number:3d}  {func_desc:<32} {n_points:10d} {compute_time:11.4f} "
+              f"{job_time:10.4f} {throughput}{note}")
+        total_time += job_time
+    
+    print("-" * 92)
+    print(f"Заданий: {len(report)}, уникальных сеток: {sum(1 for *_, reused in report if not reused)}, "
+          f"общее время: {total_time:.4f} с")
+    if total_time > 0:
+        print(f"Средняя производительность: {total_points / total_time:.0f} точек/с")
+    print("=" * 92)
+
+
+def parse_args(argv: List[str] = None) -> argparse.Namespace:
+    """
+    Разбор аргументов командной строки
+    """
+    parser = argparse.ArgumentParser(description="Исследование математических функций")
+    parser.add_argument('-v', '--verbosity', choices=list(output.VERBOSITY_LEVELS),
+                        default='summary',
+                        help="подробность вывода вычислений: silent, summary или points")
+    parser.add_argument('--log-file', default=None,
+                        help="файл для сообщений вычислений вместо stdout")
+    parser.add_argument('-j', '--workers', type=int, default=1,
+                        help="число процессов для поточечного вычисления (0 - по числу ядер)")
+    parser.add_argument('--chunk-size', type=int, default=parallel.DEFAULT_CHUNK_SIZE,
+                        help="размер порции точек для одного процесса")
+    parser.add_argument('--store', nargs='?', const='', default=None, metavar='DIR',
+                        help="использовать хранилище результатов на диске "
+                             "(по умолчанию в ~/.cache/pzz33)")
+    parser.add_argument('--store-max-mb', type=float, default=512,
+                        help="максимальный объем хранилища в мегабайтах")
+    parser.add_argument('--adaptive', nargs='?', type=float, const=1e-3, default=None,
+                        metavar='TOL',
+                        help="адаптивная выборка точек с допуском TOL (по умолчанию 1e-3); "
+                             "шаг задает бюджет точек")
+    parser.add_argument('--out-of-core', nargs='?', const='.', default=None, metavar='DIR',
+                        help="вычислять сетку порциями в файл в каталоге DIR "
+                             "(по умолчанию текущий) без ограничения размера сетки; "
+                             "файлы удаляются при выходе")
+    parser.add_argument('--out-of-core-chunk', type=int, default=grid.DEFAULT_CHUNK_SIZE,
+                        metavar='N',
+                        help="размер порции, вычисляемой в памяти в режиме --out-of-core "
+                             f"(по умолчанию {grid.DEFAULT_CHUNK_SIZE})")
+    parser.add_argument('--keep-files', action='store_true',
+                        help="не удалять файлы результатов режима --out-of-core при выходе")
+    parser.add_argument('--surrogate', nargs='?', type=float, const=1e-8, default=None,
+                        metavar='TOL',
+                        help="вычислять сетку по кусочной аппроксимации Чебышева "
+                             "с абсолютной погрешностью TOL (по умолчанию 1e-8)")
+    parser.add_argument('-e', '--expression', action='append', default=[],
+                        type=expression.parse_spec, metavar='EXPR[@MIN,MAX]',
+                        help="добавить функцию-выражение, например \"x**3 - 2*sin(x)@-10,10\"")
+    parser.add_argument('--metrics', metavar='PATH',
+                        help="собирать метрики и записать их при выходе "
+                             "(*.prom - формат Prometheus, иначе JSON)")
+    parser.add_argument('--batch', metavar='JOBS',
+                        help="выполнить задания из файла JSON или CSV без запросов ввода")
+    parser.add_argument('--compare', nargs=4, metavar=('FUNCTIONS', 'A', 'B', 'STEP'),
+                        help="сравнить функции с номерами FUNCTIONS (через запятую) "
+                             "на общей сетке [A, B] с шагом STEP")
+    parser.add_argument('--plot', metavar='PATH',
+                        help="сохранить график режима --compare в файл вместо показа")
+    return parser.parse_args(argv)
 
 
 if __name__ == "__main__":
-    main()
+    args = parse_args()
+    output.configure(args.verbosity, args.log_file)
+    for text, min_val, max_val in args.expression:
+        funcs.register_expression(text, min_val, max_val)
+    if args.metrics:
+        metrics.enable()
+        atexit.register(metrics.registry.export, args.metrics)
+    store = None
+    if args.store is not None:
+        store = ResultStore(args.store or None, int(args.store_max_mb * 1024 * 1024))
+    if args.batch:
+        run_batch(load_jobs(args.batch), args.workers or None, args.chunk_size, store)
+    elif args.compare:
+        numbers, a, b, step = args.compare
+        compare_functions([int(number) for number in numbers.split(',')],
+                          float(a), float(b), float(step),
+                          args.workers or None, args.chunk_size, args.plot)
+    else:
+        main(args.workers or None, args.chunk_size, store, args.adaptive, args.surrogate,
+             args.out_of_core, args.out_of_core_chunk, args.keep_files)
 
 
 
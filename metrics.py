@@ -0,0 +1,216 @@
+import bisect
+import json
+import threading
+from typing import Callable, Dict, List, Optional
+
+
+# Верхние границы корзин гистограммы задержек в наносекундах: от 1 мкс до ~134 с
+BUCKET_BOUNDS_NS = [1000 * 2**k for k in range(28)]
+
+_enabled = False
+
+
+def enable(on: bool = True) -> None:
+    """
+    Включение или отключение сбора метрик
+    """
+    global _enabled
+    _enabled = on
+
+
+def enabled() -> bool:
+    """
+    Проверка, собираются ли метрики
+
+    Вызывающий код проверяет флаг до замера времени, поэтому
+    при отключенных метриках затраты сводятся к одному вызову.
+    """
+    return _enabled
+
+
+class Histogram:
+    """
+    Гистограмма задержек с экспоненциальными корзинами
+    """
+
+    def __init__(self, bounds: List[int] = BUCKET_BOUNDS_NS):
+        self.bounds = bounds
+        self.counts = [0] * (len(bounds) + 1)
+        self.count = 0
+        self.total = 0
+        self.min = None
+        self.max = None
+
+    def observe(self, value: int) -> None:
+        self.counts[bisect.bisect_left(self.bounds, value)] += 1
+        self.count += 1
+        self.total += value
+        self.min = value if self.min is None else min(self.min, value)
+        self.max = value if self.max is None else max(self.max, value)
+
+    def percentile(self, q: float) -> Optional[float]:
+        """
+        Оценка перцентиля q (от 0 до 1) по верхней границе корзины
+        """
+        if self.count == 0:
+            return None
+        rank = q * self.count
+        cumulative = 0
+        for i, bucket_count in enumerate(self.counts):
+            cumulative += bucket_count
+            if cumulative >= rank and bucket_count:
+                upper = self.bounds[i] if i < len(self.bounds) else self.max
+                return float(min(upper, self.max))
+        return float(self.max)
+
+
+class FunctionMetrics:
+    """
+    Метрики одной функции: вызовы, обработанные точки и задержки
+    """
+
+    def __init__(self):
+        self.calls = 0
+        self.points = 0
+        self.latency = Histogram()
+
+
+def _label(name: str) -> str:
+    """
+    Метка function="..." с экранированием по правилам формата Prometheus
+    """
+    value = name.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+    return f'function="{value}"'
+
+
+class MetricsRegistry:
+    """
+    Реестр метрик функций и кэшей с экспортом в JSON и формат Prometheus
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._functions: Dict[str, FunctionMetrics] = {}
+        self._caches: Dict[str, Callable[[], dict]] = {}
+
+    def record(self, name: str, elapsed_ns: int, points: int = 1) -> None:
+        """
+        Учет одного вызова функции name длительностью elapsed_ns
+        """
+        with self._lock:
+            entry = self._functions.get(name)
+            if entry is None:
+                entry = self._functions[name] = FunctionMetrics()
+            entry.calls += 1
+            entry.points += points
+            entry.latency.observe(elapsed_ns)
+
+    def register_cache(self, name: str, info: Callable[[], dict]) -> None:
+        """
+        Регистрация кэша: info возвращает словарь со счетчиками hits/misses/evictions
+        """
+        self._caches[name] = info
+
+    def reset(self) -> None:
+        """
+        Сброс собранных метрик функций (кэши остаются зарегистрированными)
+        """
+        with self._lock:
+            self._functions.clear()
+
+    def snapshot(self) -> dict:
+        """
+        Текущие значения всех метрик
+        """
+        functions = {}
+        with self._lock:
+            for name, entry in self._functions.items():
+                latency = entry.latency
+                functions[name] = {
+                    'calls': entry.calls,
+                    'points': entry.points,
+                    'total_seconds': latency.total / 1e9,
+                    'min_seconds': latency.min / 1e9,
+                    'max_seconds': latency.max / 1e9,
+                    'mean_seconds': latency.total / latency.count / 1e9,
+                    'p50_seconds': latency.percentile(0.50) / 1e9,
+                    'p90_seconds': latency.percentile(0.90) / 1e9,
+                    'p99_seconds': latency.percentile(0.99) / 1e9,
+                }
+
+        caches = {}
+        for name, info in self._caches.items():
+            stats = info()
+            lookups = stats['hits'] + stats['misses']
+            if lookups == 0:
+                continue
+            caches[name] = {
+                'hits': stats['hits'],
+                'misses': stats['misses'],
+                'evictions': stats['evictions'],
+                'size': stats['size'],
+                'hit_ratio': stats['hits'] / lookups,
+            }
+        return {'functions': functions, 'caches': caches}
+
+    def to_json(self) -> str:
+        """
+        Экспорт метрик в JSON
+        """
+        return json.dumps(self.snapshot(), ensure_ascii=False, indent=2)
+
+    def to_prometheus(self) -> str:
+        """
+        Экспорт метрик в текстовом формате Prometheus
+
+        Каждое семейство метрик выводится одной группой: строки HELP и TYPE,
+        затем значения для всех функций.
+        """
+        lines = []
+
+        def family(name: str, kind: str, description: str, samples: List[str]) -> None:
+            lines.append(f"# HELP {name} {description}")
+            lines.append(f"# TYPE {name} {kind}")
+            lines.extend(samples)
+
+        with self._lock:
+            functions = [(_label(name), entry) for name, entry in sorted(self._functions.items())]
+            family("pzz33_calls_total", "counter", "Количество вызовов функции",
+                   [f"pzz33_calls_total{{{label}}} {entry.calls}" for label, entry in functions])
+            family("pzz33_points_total", "counter", "Количество обработанных точек",
+                   [f"pzz33_points_total{{{label}}} {entry.points}" for label, entry in functions])
+            samples = []
+            for label, entry in functions:
+                cumulative = 0
+                for bound, bucket_count in zip(entry.latency.bounds, entry.latency.counts):
+                    cumulative += bucket_count
+                    samples.append(f'pzz33_call_duration_seconds_bucket{{{label},le="{bound / 1e9:g}"}} '
+                                   f'{cumulative}')
+                samples.append(f'pzz33_call_duration_seconds_bucket{{{label},le="+Inf"}} '
+                               f'{entry.latency.count}')
+                samples.append(f"pzz33_call_duration_seconds_sum{{{label}}} {entry.latency.total / 1e9}")
+                samples.append(f"pzz33_call_duration_seconds_count{{{label}}} {entry.latency.count}")
+            family("pzz33_call_duration_seconds", "histogram", "Длительность вызова функции", samples)
+
+        caches = [(_label(name), stats) for name, stats in sorted(self.snapshot()['caches'].items())]
+        if caches:
+            for metric, key, kind, description in (
+                    ("pzz33_cache_hits_total", 'hits', "counter", "Попадания в кэш"),
+                    ("pzz33_cache_misses_total", 'misses', "counter", "Промахи кэша"),
+                    ("pzz33_cache_evictions_total", 'evictions', "counter", "Вытеснения из кэша"),
+                    ("pzz33_cache_hit_ratio", 'hit_ratio', "gauge", "Доля попаданий в кэш")):
+                family(metric, kind, description,
+                       [f"{metric}{{{label}}} {stats[key]}" for label, stats in caches])
+        return "\n".join(lines) + "\n"
+
+    def export(self, path: str) -> None:
+        """
+        Запись метрик в файл: *.prom - формат Prometheus, иначе JSON
+        """
+        text = self.to_prometheus() if path.endswith('.prom') else self.to_json()
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write(text)
+
+
+# Общий реестр метрик программы
+registry = MetricsRegistry()
@@ -0,0 +1,138 @@
+import atexit
+import sys
+from typing import List, Optional, TextIO, Union
+
+
+# Уровни подробности вывода
+SILENT = 0    # никакого вывода из вычислений и декораторов
+SUMMARY = 1   # итоговые сообщения: время, количество точек, ошибки
+POINTS = 2    # вывод по каждой точке (для отладки)
+
+VERBOSITY_LEVELS = {
+    'silent': SILENT,
+    'summary': SUMMARY,
+    'points': POINTS,
+}
+
+
+class BufferedHandler:
+    """
+    Буферизованный вывод строк в поток или файл
+
+    Строки накапливаются в памяти и записываются одной операцией,
+    когда их становится batch_size, или при явном вызове flush().
+    """
+
+    def __init__(self, stream: TextIO, batch_size: int = 1000,
+                 close_stream: bool = False):
+        if batch_size <= 0:
+            raise ValueError(f"Размер пакета должен быть положительным, получен {batch_size}")
+        self.stream = stream
+        self.batch_size = batch_size
+        self.close_stream = close_stream
+        self._lines: List[str] = []
+
+    def write(self, message: str) -> None:
+        self._lines.append(message)
+        if len(self._lines) >= self.batch_size:
+            self.flush()
+
+    def flush(self) -> None:
+        if self._lines:
+            self.stream.write("\n".join(self._lines) + "\n")
+            self._lines.clear()
+        self.stream.flush()
+
+    def close(self) -> None:
+        self.flush()
+        if self.close_stream:
+            self.stream.close()
+
+
+_verbosity = SUMMARY
+_handler: Optional[BufferedHandler] = None
+
+
+def _parse_level(level: Union[int, str]) -> int:
+    if isinstance(level, str):
+        try:
+            return VERBOSITY_LEVELS[level.lower()]
+        except KeyError:
+            raise ValueError(f"Неизвестный уровень вывода: {level}. "
+                             f"Допустимые значения: {', '.join(VERBOSITY_LEVELS)}")
+    if level not in VERBOSITY_LEVELS.values():
+        raise ValueError(f"Неизвестный уровень вывода: {level}")
+    return level
+
+
+def configure(verbosity: Union[int, str, None] = None,
+              path: Optional[str] = None,
+              batch_size: int = 1000) -> None:
+    """
+    Настройка уровня подробности и приемника вывода
+
+    Args:
+        verbosity: Уровень (SILENT/SUMMARY/POINTS или 'silent'/'summary'/'points')
+        path: Файл для вывода; по умолчанию используется stdout
+        batch_size: Количество строк, записываемых за одну операцию
+    """
+    global _handler
+    if verbosity is not None:
+        set_verbosity(verbosity)
+
+    if _handler is not None:
+        _handler.close()
+    if path is not None:
+        _handler = BufferedHandler(open(path, 'w', encoding='utf-8'),
+                                   batch_size, close_stream=True)
+    else:
+        _handler = BufferedHandler(sys.stdout, batch_size)
+
+
+def set_verbosity(level: Union[int, str]) -> None:
+    """
+    Установка уровня подробности вывода
+    """
+    global _verbosity
+    _verbosity = _parse_level(level)
+
+
+def get_verbosity() -> int:
+    """
+    Текущий уровень подробности вывода
+    """
+    return _verbosity
+
+
+def enabled(level: int) -> bool:
+    """
+    Проверка, выводятся ли сообщения уровня level
+
+    Вызывающий код проверяет уровень до форматирования сообщения,
+    чтобы в тихом режиме не тратить время на построение строк.
+    """
+    return _verbosity >= level
+
+
+def emit(level: int, message: str) -> None:
+    """
+    Вывод сообщения, если текущий уровень подробности это позволяет
+    """
+    if _verbosity >= level:
+        if _handler is None:
+            configure()
+        _handler.write(message)
+
+
+def flush() -> None:
+    """
+    Запись накопленных сообщений (например, перед запросом ввода)
+    """
+    if _handler is not None:
+        _handler.flush()
+
+
+@atexit.register
+def _close() -> None:
+    if _handler is not None:
+        _handler.close()
@@ -0,0 +1,99 @@
+import os
+import pickle
+from itertools import repeat
+from typing import Callable, List, Optional, Sequence, Tuple
+import output
+
+
+# Размер порции точек, отправляемой одному процессу
+DEFAULT_CHUNK_SIZE = 10000
+
+# Меньшие сетки считаются последовательно: запуск пула обойдется дороже
+MIN_PARALLEL_POINTS = 20000
+
+
+def evaluate_chunk(func: Callable, x_values: Sequence[float]) -> Tuple[List[float], List[Tuple[int, str]]]:
+    """
+    Последовательное вычисление функции на порции точек
+
+    Returns:
+        Значения Y (NaN для точек с ошибкой) и список ошибок
+        в виде пар (индекс точки в порции, сообщение)
+    """
+    y_values = []
+    errors = []
+    for i, x in enumerate(x_values):
+        try:
+            y_values.append(func(x))
+        except Exception as e:
+            errors.append((i, str(e)))
+            y_values.append(float('nan'))  # Используем NaN для ошибок
+    return y_values, errors
+
+
+def is_picklable(func: Callable) -> bool:
+    try:
+        pickle.dumps(func)
+    except (pickle.PicklingError, AttributeError, TypeError):
+        return False
+    return True
+
+
+def evaluate(func: Callable, x_values: Sequence[float],
+             workers: Optional[int] = 1,
+             chunk_size: int = DEFAULT_CHUNK_SIZE,
+             min_points: int = MIN_PARALLEL_POINTS) -> Tuple[List[float], List[Tuple[int, str]]]:
+    """
+    Вычисление функции на сетке, при необходимости в пуле процессов
+
+    Сетка делится на порции по chunk_size точек, которые вычисляются
+    в ProcessPoolExecutor и собираются в исходном порядке. Для малых сеток,
+    одного процесса или функций, которые нельзя передать в другой процесс
+    (например, lambda), используется последовательное вычисление.
+
+    Args:
+        func: Скалярная функция одного аргумента
+        x_values: Значения X
+        workers: Количество процессов (None - по числу ядер)
+        chunk_size: Размер порции точек
+        min_points: Минимальный размер сетки для параллельного режима
+
+    Returns:
+        Значения Y и список ошибок в виде пар (индекс точки, сообщение)
+    """
+    if workers is None:
+        workers = os.cpu_count() or 1
+    if workers <= 0:
+        raise ValueError(f"Количество процессов должно быть положительным, получено {workers}")
+    if chunk_size <= 0:
+        raise ValueError(f"Размер порции должен быть положительным, получен {chunk_size}")
+
+    n = len(x_values)
+    use_pool = workers > 1 and n >= min_points
+    if use_pool and not is_picklable(func):
+        use_pool = False
+        if output.enabled(output.SUMMARY):
+            output.emit(output.SUMMARY, f"  Функцию '{getattr(func, '__name__', func)}' нельзя "
+                                        f"передать в процесс, вычисление будет последовательным")
+
+    if not use_pool:
+        return evaluate_chunk(func, x_values)
+
+    from concurrent.futures import ProcessPoolExecutor
+
+    starts = range(0, n, chunk_size)
+    y_values = []
+    errors = []
+    # В дочерних процессах вывод отключается, чтобы сообщения не перемешивались
+    with ProcessPoolExecutor(max_workers=workers,
+                             initializer=output.set_verbosity,
+                             initargs=(output.SILENT,)) as pool:
+        chunks = (x_values[start:start + chunk_size] for start in starts)
+        for start, (chunk_y, chunk_errors) in zip(starts, pool.map(evaluate_chunk, repeat(func), chunks)):
+            y_values.extend(chunk_y)
+            errors.extend((start + i, message) for i, message in chunk_errors)
+
+    if output.enabled(output.SUMMARY):
+        output.emit(output.SUMMARY, f"  Вычислено {n} значений в {workers} процессах "
+                                    f"порциями по {chunk_size} точек")
+    return y_values, errors
@@ -0,0 +1,158 @@
+from __future__ import annotations
+from typing import Dict, Iterable, List, Optional, Tuple, Union
+from lazy import lazy_import
+from stats import CHUNK_SIZE, Summary, summarize
+from domain import REASONS
+
+np = lazy_import('numpy')
+
+
+# Сообщение для некорректных точек без явно сохраненной ошибки
+DEFAULT_ERROR = "аргумент вне области определения функции"
+
+
+class Series:
+    """
+    Ряд значений функции на непрерывных буферах float64
+
+    X и Y хранятся в массивах float64 (8 байт на значение вместо объекта
+    float и ссылки на него в списке), корректность точек - в битовой маске
+    (1 бит на точку), а сообщения об ошибках - только для точек, где они
+    есть, по индексу. Точка корректна, если значение Y конечно; для
+    некорректных точек без сообщения используется описание кода причины
+    из reasons (uint8, коды модуля domain), а если его нет - DEFAULT_ERROR.
+    Значения X упорядочены по возрастанию.
+
+    Статистика Y (summary) считается один раз при создании ряда вместе
+    с маской, и вывод таблиц и графиков использует ее без повторного
+    просмотра данных. Если статистика передана готовой (например, накоплена
+    порциями при вычислении в отображенный в память файл), данные при
+    создании не просматриваются, а маска строится при первом обращении.
+    """
+
+    __slots__ = ('x', 'y', 'errors', 'reasons', 'summary', 'n_valid', '_mask')
+
+    def __init__(self, x_values, y_values,
+                 errors: Union[Dict[int, str], Iterable[Tuple[int, str]], None] = None,
+                 summary: Optional[Summary] = None,
+                 reasons: Optional[np.ndarray] = None):
+        # Массивы нужного типа (в том числе отображенные в память) не копируются
+        self.x = np.ascontiguousarray(x_values, dtype=np.float64)
+        self.y = np.ascontiguousarray(y_values, dtype=np.float64)
+        if self.x.shape != self.y.shape or self.x.ndim != 1:
+            raise ValueError(f"Длины массивов не совпадают: X={len(self.x)}, Y={len(self.y)}")
+        self.errors: Dict[int, str] = dict(errors or {})
+        self.reasons = None if reasons is None else np.asarray(reasons, dtype=np.uint8)
+        if self.reasons is not None and self.reasons.shape != self.x.shape:
+            raise ValueError(f"Длина массива причин {len(self.reasons)} не совпадает с длиной ряда {len(self.x)}")
+
+        if summary is None:
+            finite = np.isfinite(self.y)
+            summary = summarize(self.y, finite)
+            self._mask = np.packbits(finite)
+        else:
+            self._mask = None
+        self.summary = summary
+        self.n_valid = summary.valid_count
+
+    def __len__(self) -> int:
+        return len(self.x)
+
+    def __repr__(self) -> str:
+        return f"Series(points={len(self)}, valid={self.n_valid})"
+
+    @property
+    def n_errors(self) -> int:
+        """
+        Количество некорректных точек
+        """
+        return len(self) - self.n_valid
+
+    @property
+    def valid(self) -> np.ndarray:
+        """
+        Маска корректных точек в виде массива bool
+
+        Маска распаковывается при каждом обращении (1 байт на точку),
+        поэтому результат стоит сохранять, а не обращаться к свойству повторно.
+        """
+        if self._mask is None:
+            # Порции кратны 8 точкам, поэтому упакованные части просто склеиваются
+            self._mask = np.concatenate(
+                [np.packbits(np.isfinite(self.y[start:start + CHUNK_SIZE]))
+                 for start in range(0, len(self), CHUNK_SIZE)] or [np.empty(0, dtype=np.uint8)])
+        return np.unpackbits(self._mask, count=len(self)).view(bool)
+
+    @property
+    def nbytes(self) -> int:
+        """
+        Объем буферов ряда в байтах (без сообщений об ошибках)
+        """
+        mask_bytes = self._mask.nbytes if self._mask is not None else 0
+        return self.x.nbytes + self.y.nbytes + mask_bytes
+
+    def valid_xy(self) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Значения X и Y корректных точек (без копирования, если все точки корректны)
+
+        Маска распаковывается один раз на оба массива; если нужны и X, и Y,
+        этот метод дешевле пары valid_x() и valid_y().
+        """
+        if self.n_valid == len(self):
+            return self.x, self.y
+        valid = self.valid
+        return self.x[valid], self.y[valid]
+
+    def valid_x(self) -> np.ndarray:
+        """
+        Значения X корректных точек (без копирования, если все точки корректны)
+        """
+        return self.x if self.n_valid == len(self) else self.x[self.valid]
+
+    def valid_y(self) -> np.ndarray:
+        """
+        Значения Y корректных точек (без копирования, если все точки корректны)
+        """
+        return self.y if self.n_valid == len(self) else self.y[self.valid]
+
+    def segments(self) -> List[slice]:
+        """
+        Срезы непрерывных участков корректных точек
+
+        x[s] и y[s] для каждого среза - представления без копирования.
+        """
+        if self.n_valid == len(self):
+            return [slice(0, len(self))] if len(self) else []
+        edges = np.flatnonzero(np.diff(np.concatenate(([0], self.valid.view(np.int8), [0]))))
+        return [slice(start, stop) for start, stop in zip(edges[::2].tolist(), edges[1::2].tolist())]
+
+    def error(self, index: int) -> Optional[str]:
+        """
+        Сообщение об ошибке в точке index или None для корректной точки
+        """
+        if np.isfinite(self.y[index]):
+            return None
+        return self._message(index)
+
+    def error_list(self, limit: Optional[int] = None) -> List[Tuple[float, str]]:
+        """
+        Ошибки в виде пар (x, сообщение) в порядке возрастания индекса
+
+        Y просматривается порциями до первых limit ошибок.
+        """
+        if self.n_errors == 0:
+            return []
+        indices = []
+        for start in range(0, len(self), CHUNK_SIZE):
+            invalid = np.flatnonzero(~np.isfinite(self.y[start:start + CHUNK_SIZE]))
+            indices.extend((invalid + start).tolist())
+            if limit is not None and len(indices) >= limit:
+                break
+        indices = indices[:limit]
+        return [(float(self.x[i]), self._message(i)) for i in indices]
+
+    def _message(self, index: int) -> str:
+        message = self.errors.get(index)
+        if message is None and self.reasons is not None:
+            message = REASONS.get(int(self.reasons[index]))
+        return message or DEFAULT_ERROR
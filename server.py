@@ -0,0 +1,401 @@
+from __future__ import annotations
+import argparse
+import asyncio
+import json
+import os
+from collections import OrderedDict
+from concurrent.futures import Executor
+from typing import Callable, Dict, List, Optional, Tuple
+from urllib.parse import parse_qs, urlsplit
+from lazy import lazy_import, preload
+import expression
+import function as funcs
+import grid
+import output
+import parallel
+
+np = lazy_import('numpy')
+
+
+# Ограничение размера сетки одного запроса
+MAX_POINTS = 10**7
+
+# Количество точек в одном фрагменте потокового ответа
+STREAM_CHUNK_POINTS = 65536
+
+# Количество последних результатов, доступных для повторного использования
+RECENT_RESULTS = 8
+
+Key = Tuple[int, float, float, float]
+
+
+def evaluate_points(func, x: np.ndarray) -> np.ndarray:
+    """
+    Значения функции в узлах x (NaN для ошибок)
+    """
+    if hasattr(func, 'vectorized'):
+        return func.vectorized(x)
+    y_values, _ = parallel.evaluate(func, x.tolist())
+    return np.array(y_values, dtype=float)
+
+
+def evaluate_grid(func, a: float, b: float, step: float,
+                  known: Optional[slice] = None,
+                  known_y: Optional[np.ndarray] = None) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Вычисление функции на сетке в виде массивов (NaN для ошибок)
+
+    Если задан срез known с уже вычисленными значениями known_y,
+    вычисляются только точки слева и справа от него.
+    """
+    x = grid.build_grid(a, b, step)
+    if known is None:
+        return x, evaluate_points(func, x)
+    y = np.empty(len(x))
+    y[known] = known_y
+    for part in (slice(0, known.start), slice(known.stop, len(x))):
+        if part.start < part.stop:
+            y[part] = evaluate_points(func, x[part])
+    return x, y
+
+
+class EvaluationCoalescer:
+    """
+    Объединение одинаковых и перекрывающихся запросов на вычисление
+
+    Если сетка запроса содержится в уже вычисленной или вычисляемой сетке
+    той же функции с тем же шагом и выравниванием, результат вырезается
+    из нее. Если она лишь частично перекрывает вычисленную сетку,
+    общие точки берутся из нее, а вычисляются только недостающие части
+    слева и справа (как в gridcache.GridCache). Иначе запускается одно
+    вычисление в исполнителе, которого дожидаются все совпадающие запросы.
+
+    Векторизованные функции вычисляются в executor (NumPy освобождает GIL),
+    а поточечные - в process_executor, если он задан и функцию можно
+    передать в другой процесс, чтобы вычисление не занимало GIL
+    и не задерживало цикл событий.
+    """
+
+    def __init__(self, executor: Optional[Executor] = None,
+                 recent_results: int = RECENT_RESULTS,
+                 process_executor: Optional[Executor] = None):
+        self.executor = executor
+        self.process_executor = process_executor
+        self.recent_results = recent_results
+        self._pending: Dict[Key, asyncio.Future] = {}
+        self._results: "OrderedDict[Key, Tuple[np.ndarray, np.ndarray]]" = OrderedDict()
+        self.computations = 0
+        self.coalesced = 0
+        self.reused_points = 0
+
+    @staticmethod
+    def _overlap(key: Key, outer: Key) -> Optional[Tuple[slice, slice]]:
+        """
+        Общие узлы сеток key и outer: срез в сетке key и срез в сетке outer
+        (None, если функции, шаги или выравнивание не совпадают
+        или сетки не пересекаются)
+        """
+        function_id, a, b, step = key
+        outer_id, outer_a, outer_b, outer_step = outer
+        if function_id != outer_id or step != outer_step:
+            return None
+        offset = (a - outer_a) / step
+        shift = round(offset)
+        if abs(offset - shift) > 1e-9 * max(1.0, abs(offset)):
+            return None
+        start = max(0, -shift)
+        stop = min(grid.grid_size(a, b, step), grid.grid_size(outer_a, outer_b, step) - shift)
+        if start >= stop:
+            return None
+        return slice(start, stop), slice(start + shift, stop + shift)
+
+    def _slice(self, key: Key, outer: Key) -> Optional[slice]:
+        """
+        Срез сетки outer, совпадающий со всей сеткой key, или None
+        """
+        overlap = self._overlap(key, outer)
+        if overlap is None:
+            return None
+        inner, outer_part = overlap
+        if inner.start != 0 or inner.stop != grid.grid_size(key[1], key[2], key[3]):
+            return None
+        return outer_part
+
+    async def evaluate(self, function_id: int, a: float, b: float,
+                       step: float) -> Tuple[np.ndarray, np.ndarray]:
+        key = (function_id, a, b, step)
+
+        for outer, (x, y) in self._results.items():
+            part = self._slice(key, outer)
+            if part is not None:
+                self._results.move_to_end(outer)
+                self.coalesced += 1
+                return x[part], y[part]
+
+        for outer, future in list(self._pending.items()):
+            part = self._slice(key, outer)
+            if part is not None:
+                self.coalesced += 1
+                x, y = await asyncio.shield(future)
+                return x[part], y[part]
+
+        # Частичное перекрытие: из вычисленных сеток берется наибольшая общая часть
+        known, known_y = None, None
+        for outer, (x, y) in self._results.items():
+            overlap = self._overlap(key, outer)
+            if overlap is not None and (known is None or
+                                        overlap[0].stop - overlap[0].start > known.stop - known.start):
+                known, known_y = overlap[0], y[overlap[1]]
+        if known is not None:
+            self.reused_points += known.stop - known.start
+
+        _, func = funcs.get_available_functions()[function_id]
+        executor = self.executor
+        if (self.process_executor is not None and not hasattr(func, 'vectorized')
+                and parallel.is_picklable(func)):
+            executor = self.process_executor
+        loop = asyncio.get_running_loop()
+        future = loop.run_in_executor(executor, evaluate_grid, func, a, b, step, known, known_y)
+        self._pending[key] = future
+        self.computations += 1
+        try:
+            x, y = await asyncio.shield(future)
+        finally:
+            self._pending.pop(key, None)
+
+        self._results[key] = (x, y)
+        while len(self._results) > self.recent_results:
+            self._results.popitem(last=False)
+        return x, y
+
+
+class HTTPError(Exception):
+    """
+    Ошибка запроса с кодом ответа HTTP
+    """
+
+    def __init__(self, status: int, message: str):
+        super().__init__(message)
+        self.status = status
+
+
+class ResponseAborted(Exception):
+    """
+    Ошибка после отправки заголовков ответа: ответ можно только оборвать
+    """
+
+
+_REASONS = {200: 'OK', 400: 'Bad Request', 404: 'Not Found',
+            405: 'Method Not Allowed', 500: 'Internal Server Error'}
+
+
+def _parse_grid_query(query: Dict[str, List[str]]) -> Tuple[int, float, float, float, str]:
+    """
+    Параметры запроса /evaluate: function, a, b, step и format
+    """
+    try:
+        function_id = int(query['function'][0])
+        a = float(query['a'][0])
+        b = float(query['b'][0])
+        step = float(query['step'][0])
+    except (KeyError, ValueError):
+        raise HTTPError(400, "Нужны числовые параметры function, a, b и step")
+
+    response_format = query.get('format', ['json'])[0]
+    if response_format not in ('json', 'binary'):
+        raise HTTPError(400, "format должен быть json или binary")
+    if function_id not in funcs.get_available_functions():
+        raise HTTPError(404, f"Неизвестный номер функции {function_id}")
+    if not a < b or not step > 0:
+        raise HTTPError(400, "Нужно a < b и step > 0")
+    n_points = grid.grid_size(a, b, step)
+    if n_points > MAX_POINTS:
+        raise HTTPError(400, f"Сетка из {n_points} точек превышает предел {MAX_POINTS}")
+    return function_id, a, b, step, response_format
+
+
+class EvaluationServer:
+    """
+    Локальный HTTP-сервис вычисления функций реестра на сетке
+
+    GET /functions - список функций;
+    GET /evaluate?function=N&a=A&b=B&step=S[&format=json|binary] - значения
+    на сетке. JSON передается частями (null вместо NaN), binary - массив X,
+    затем массив Y в формате float64 little-endian; количество точек
+    указано в заголовке X-Points.
+    """
+
+    def __init__(self, executor: Optional[Executor] = None,
+                 process_executor: Optional[Executor] = None):
+        self.coalescer = EvaluationCoalescer(executor, process_executor=process_executor)
+
+    async def handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        try:
+            request_line = (await reader.readline()).decode('latin-1').strip()
+            # Заголовки запроса не используются, но должны быть прочитаны
+            while (await reader.readline()) not in (b'\r\n', b'\n', b''):
+                pass
+
+            try:
+                method, target, _ = request_line.split(' ', 2)
+            except ValueError:
+                raise HTTPError(400, "Некорректная строка запроса")
+            if method != 'GET':
+                raise HTTPError(405, "Поддерживается только GET")
+
+            url = urlsplit(target)
+            if url.path == '/functions':
+                await self._send_functions(writer)
+            elif url.path == '/evaluate':
+                await self._send_evaluation(writer, *_parse_grid_query(parse_qs(url.query)))
+            else:
+                raise HTTPError(404, f"Неизвестный путь {url.path}")
+        except HTTPError as e:
+            await self._send_json(writer, {'error': str(e)}, e.status)
+        except (ConnectionError, ResponseAborted):
+            # Соединение закрывается без завершающего фрагмента,
+            # и клиент видит, что ответ не получен целиком
+            pass
+        except Exception as e:
+            await self._send_json(writer, {'error': str(e)}, 500)
+        finally:
+            writer.close()
+
+    @staticmethod
+    def _headers(status: int, content_type: str, extra: str = "") -> bytes:
+        return (f"HTTP/1.1 {status} {_REASONS.get(status, '')}\r\n"
+                f"Content-Type: {content_type}\r\n"
+                f"{extra}"
+                f"Connection: close\r\n\r\n").encode('latin-1')
+
+    async def _send_json(self, writer: asyncio.StreamWriter, data, status: int = 200) -> None:
+        body = json.dumps(data, ensure_ascii=False).encode('utf-8')
+        writer.write(self._headers(status, 'application/json; charset=utf-8',
+                                   f"Content-Length: {len(body)}\r\n") + body)
+        await writer.drain()
+
+    @staticmethod
+    def _domain_info(func: Callable) -> Optional[dict]:
+        domain = getattr(func, 'domain', None)
+        if domain is None:
+            return None
+        return {'min': domain.min, 'max': domain.max, 'open_min': domain.open_min,
+                'singularities': [[s.offset, s.period] for s in domain.singularities]}
+
+    async def _send_functions(self, writer: asyncio.StreamWriter) -> None:
+        await self._send_json(writer, [
+            {'id': number, 'description': desc, 'domain': self._domain_info(func)}
+            for number, (desc, func) in funcs.get_available_functions().items()])
+
+    @staticmethod
+    async def _write_chunk(writer: asyncio.StreamWriter, data: bytes) -> None:
+        if data:
+            writer.write(f"{len(data):x}\r\n".encode('latin-1') + data + b"\r\n")
+            await writer.drain()
+
+    @staticmethod
+    def _json_numbers(values: np.ndarray) -> str:
+        return ",".join(repr(v) if v == v and abs(v) != float('inf') else "null"
+                        for v in values.tolist())
+
+    async def _send_evaluation(self, writer: asyncio.StreamWriter, function_id: int,
+                               a: float, b: float, step: float, response_format: str) -> None:
+        x, y = await self.coalescer.evaluate(function_id, a, b, step)
+        try:
+            await self._stream_evaluation(writer, x, y, function_id, a, b, step, response_format)
+        except ConnectionError:
+            raise
+        except Exception as e:
+            raise ResponseAborted(str(e)) from e
+
+    async def _stream_evaluation(self, writer: asyncio.StreamWriter, x: np.ndarray, y: np.ndarray,
+                                 function_id: int, a: float, b: float, step: float,
+                                 response_format: str) -> None:
+        n = len(x)
+
+        if response_format == 'binary':
+            writer.write(self._headers(200, 'application/octet-stream',
+                                       f"X-Points: {n}\r\nTransfer-Encoding: chunked\r\n"))
+            for array in (x, y):
+                data = np.ascontiguousarray(array, dtype='<f8')
+                for start in range(0, n, STREAM_CHUNK_POINTS):
+                    await self._write_chunk(writer, data[start:start + STREAM_CHUNK_POINTS].tobytes())
+        else:
+            writer.write(self._headers(200, 'application/json; charset=utf-8',
+                                       "Transfer-Encoding: chunked\r\n"))
+            await self._write_chunk(writer, json.dumps(
+                {'function': function_id, 'a': a, 'b': b, 'step': step, 'points': n}
+            )[:-1].encode('utf-8'))
+            for name, array in (('x', x), ('y', y)):
+                await self._write_chunk(writer, f', "{name}": ['.encode('utf-8'))
+                for start in range(0, n, STREAM_CHUNK_POINTS):
+                    prefix = "," if start else ""
+                    await self._write_chunk(writer, (prefix + self._json_numbers(
+                        array[start:start + STREAM_CHUNK_POINTS])).encode('utf-8'))
+                await self._write_chunk(writer, b']')
+            await self._write_chunk(writer, b'}')
+        writer.write(b"0\r\n\r\n")
+        await writer.drain()
+
+
+async def serve(host: str = '127.0.0.1', port: int = 8033,
+                unix_path: Optional[str] = None,
+                workers: Optional[int] = None) -> None:
+    """
+    Запуск сервиса на TCP-порту или Unix-сокете
+
+    Вычисления выполняются в ограниченном пуле из workers потоков
+    (векторизованные функции) и в пуле из workers процессов
+    (поточечные функции); None - по числу ядер.
+    """
+    from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+    if workers is None:
+        workers = os.cpu_count() or 1
+    if workers <= 0:
+        raise ValueError(f"Количество исполнителей должно быть положительным, получено {workers}")
+
+    # NumPy загружается до приема запросов, а не в потоках исполнителя
+    preload(np)
+
+    # В дочерних процессах вывод отключается, как и в parallel.evaluate
+    with ThreadPoolExecutor(max_workers=workers) as threads, \
+            ProcessPoolExecutor(max_workers=workers, initializer=output.set_verbosity,
+                                initargs=(output.SILENT,)) as processes:
+        server = EvaluationServer(threads, processes)
+        if unix_path:
+            listener = await asyncio.start_unix_server(server.handle, path=unix_path)
+            address = unix_path
+        else:
+            listener = await asyncio.start_server(server.handle, host, port)
+            address = f"http://{host}:{port}"
+        print(f"Сервис вычисления функций запущен: {address}")
+        async with listener:
+            await listener.serve_forever()
+
+
+def parse_args(argv: List[str] = None) -> argparse.Namespace:
+    """
+    Разбор аргументов командной строки
+    """
+    parser = argparse.ArgumentParser(description="Локальный сервис вычисления функций")
+    parser.add_argument('--host', default='127.0.0.1', help="адрес для прослушивания")
+    parser.add_argument('--port', type=int, default=8033, help="TCP-порт")
+    parser.add_argument('--unix', metavar='PATH', help="Unix-сокет вместо TCP-порта")
+    parser.add_argument('-j', '--workers', type=int, default=0,
+                        help="число потоков и процессов для вычислений (0 - по числу ядер)")
+    parser.add_argument('-e', '--expression', action='append', default=[],
+                        type=expression.parse_spec, metavar='EXPR[@MIN,MAX]',
+                        help="добавить функцию-выражение в реестр")
+    return parser.parse_args(argv)
+
+
+if __name__ == "__main__":
+    args = parse_args()
+    output.set_verbosity(output.SILENT)
+    for text, min_val, max_val in args.expression:
+        funcs.register_expression(text, min_val, max_val)
+    try:
+        asyncio.run(serve(args.host, args.port, args.unix, args.workers or None))
+    except KeyboardInterrupt:
+        print("\nСервис остановлен")
@@ -0,0 +1,151 @@
+from __future__ import annotations
+import math
+from typing import Optional
+from lazy import lazy_import
+
+np = lazy_import('numpy')
+
+
+# Размер порции при подсчете статистики по большому массиву:
+# порция помещается в кэш процессора, и все величины считаются по ней
+CHUNK_SIZE = 65536
+
+
+class Summary:
+    """
+    Статистика ряда, накапливаемая за один проход
+
+    Учитываются количество точек, количество некорректных значений (NaN
+    и бесконечности), сумма, среднее и дисперсия корректных значений,
+    минимум и максимум с их индексами. Порции данных обрабатываются
+    векторно, а частичные результаты объединяются формулами Чана для
+    среднего и суммы квадратов отклонений, поэтому статистику можно
+    считать порциями и в разных процессах, а затем объединить.
+    """
+
+    __slots__ = ('count', 'nan_count', 'total', 'mean', 'm2',
+                 'min', 'max', 'argmin', 'argmax')
+
+    def __init__(self):
+        self.count = 0
+        self.nan_count = 0
+        self.total = 0.0
+        self.mean = 0.0
+        self.m2 = 0.0
+        self.min = math.nan
+        self.max = math.nan
+        self.argmin = -1
+        self.argmax = -1
+
+    def __repr__(self) -> str:
+        return (f"Summary(count={self.count}, nan_count={self.nan_count}, "
+                f"min={self.min!r}, max={self.max!r}, mean={self.mean!r})")
+
+    @property
+    def valid_count(self) -> int:
+        """
+        Количество корректных значений
+        """
+        return self.count - self.nan_count
+
+    @property
+    def variance(self) -> float:
+        """
+        Дисперсия корректных значений (NaN, если их нет)
+        """
+        return self.m2 / self.valid_count if self.valid_count else math.nan
+
+    @property
+    def std(self) -> float:
+        """
+        Стандартное отклонение корректных значений
+        """
+        return math.sqrt(self.variance)
+
+    def update(self, values, start: Optional[int] = None,
+               finite: Optional[np.ndarray] = None) -> 'Summary':
+        """
+        Учет порции значений
+
+        Args:
+            values: Значения порции
+            start: Индекс первого значения порции во всем ряду
+                (по умолчанию - сразу после уже учтенных точек)
+            finite: Готовая маска конечных значений, если она уже вычислена
+        """
+        values = np.asarray(values, dtype=float)
+        if start is None:
+            start = self.count
+        if finite is None:
+            finite = np.isfinite(values)
+
+        part = Summary()
+        part.count = len(values)
+        valid = values if finite.all() else values[finite]
+        part.nan_count = part.count - len(valid)
+        if len(valid):
+            positions = None if len(valid) == len(values) else np.flatnonzero(finite)
+            i_min, i_max = int(valid.argmin()), int(valid.argmax())
+            part.min, part.max = float(valid[i_min]), float(valid[i_max])
+            if positions is not None:
+                i_min, i_max = int(positions[i_min]), int(positions[i_max])
+            part.argmin, part.argmax = start + i_min, start + i_max
+            part.total = float(valid.sum())
+            part.mean = part.total / len(valid)
+            part.m2 = float(np.square(valid - part.mean).sum())
+        return self.merge(part)
+
+    def merge(self, other: 'Summary') -> 'Summary':
+        """
+        Объединение со статистикой другой части ряда (на месте)
+
+        Индексы минимума и максимума в other должны быть индексами всего ряда.
+        """
+        n_a, n_b = self.valid_count, other.valid_count
+        if n_b:
+            if n_a:
+                delta = other.mean - self.mean
+                n = n_a + n_b
+                self.mean += delta * n_b / n
+                self.m2 += other.m2 + delta * delta * n_a * n_b / n
+            else:
+                self.mean, self.m2 = other.mean, other.m2
+            self.total += other.total
+
+            if not n_a or other.min < self.min or (other.min == self.min and other.argmin < self.argmin):
+                self.min, self.argmin = other.min, other.argmin
+            if not n_a or other.max > self.max or (other.max == self.max and other.argmax < self.argmax):
+                self.max, self.argmax = other.max, other.argmax
+
+        self.count += other.count
+        self.nan_count += other.nan_count
+        return self
+
+    def to_dict(self) -> dict:
+        """
+        Значения статистики в виде словаря
+        """
+        return {
+            'count': self.count,
+            'nan_count': self.nan_count,
+            'sum': self.total,
+            'mean': self.mean if self.valid_count else None,
+            'variance': self.variance if self.valid_count else None,
+            'min': self.min if self.valid_count else None,
+            'argmin': self.argmin,
+            'max': self.max if self.valid_count else None,
+            'argmax': self.argmax,
+        }
+
+
+def summarize(values, finite: Optional[np.ndarray] = None,
+              chunk_size: int = CHUNK_SIZE) -> Summary:
+    """
+    Статистика значений за один проход по порциям chunk_size
+    """
+    values = np.asarray(values, dtype=float)
+    summary = Summary()
+    for start in range(0, len(values), chunk_size):
+        stop = start + chunk_size
+        summary.update(values[start:stop], start, None if finite is None else finite[start:stop])
+    return summary
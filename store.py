@@ -0,0 +1,179 @@
+import hashlib
+import inspect
+import json
+import os
+import time
+from typing import Callable, List, Optional, Tuple
+from lazy import lazy_import
+from series import Series
+
+np = lazy_import('numpy')
+
+
+# Каталог хранилища по умолчанию (можно переопределить переменной окружения)
+DEFAULT_DIRECTORY = os.environ.get(
+    'PZZ33_STORE_DIR', os.path.join(os.path.expanduser('~'), '.cache', 'pzz33'))
+
+# Ограничение объема хранилища по умолчанию: 512 МБ
+DEFAULT_MAX_BYTES = 512 * 1024 * 1024
+
+
+def function_identity(func: Callable) -> str:
+    """
+    Идентификатор функции: модуль и полное имя
+    """
+    module = getattr(func, '__module__', None) or 'builtins'
+    name = getattr(func, '__qualname__', None) or getattr(func, '__name__', repr(func))
+    return f"{module}.{name}"
+
+
+def source_hash(func: Callable) -> str:
+    """
+    Хэш исходного кода функции вместе с ее декораторами
+
+    Для встроенных функций, у которых нет исходного кода,
+    используется только идентификатор.
+    """
+    try:
+        source = inspect.getsource(func)
+    except (OSError, TypeError):
+        source = function_identity(func)
+    return hashlib.sha256(source.encode('utf-8')).hexdigest()
+
+
+class ResultStore:
+    """
+    Постоянное хранилище вычисленных сеток на диске
+
+    Ключ записи строится из идентификатора функции, хэша ее исходного кода
+    и параметров сетки (a, b, step). Массивы X и Y хранятся в формате .npy
+    и загружаются через отображение в память без разбора данных. При
+    превышении max_bytes удаляются самые старые записи.
+    """
+
+    def __init__(self, directory: Optional[str] = None,
+                 max_bytes: int = DEFAULT_MAX_BYTES):
+        if max_bytes <= 0:
+            raise ValueError(f"max_bytes должно быть положительным, получено {max_bytes}")
+        self.directory = directory or DEFAULT_DIRECTORY
+        self.max_bytes = max_bytes
+        os.makedirs(self.directory, exist_ok=True)
+
+    def key(self, func: Callable, a: float, b: float, step: float) -> str:
+        """
+        Ключ записи для функции и параметров сетки
+
+        Область определения входит в ключ: одна и та же функция
+        (например, выражение) может быть зарегистрирована с разными областями.
+        """
+        domain = getattr(func, 'domain', None)
+        text = f"{function_identity(func)}|{source_hash(func)}|{domain!r}|{a!r}|{b!r}|{step!r}"
+        return hashlib.sha256(text.encode('utf-8')).hexdigest()[:32]
+
+    def _paths(self, key: str) -> Tuple[str, str, str]:
+        base = os.path.join(self.directory, key)
+        return base + '.json', base + '.x.npy', base + '.y.npy'
+
+    def load(self, func: Callable, a: float, b: float,
+             step: float) -> Optional[Series]:
+        """
+        Загрузка ранее вычисленной сетки
+
+        Returns:
+            Ряд на массивах X и Y, отображенных в память (только для чтения),
+            или None, если записи нет
+        """
+        meta_path, x_path, y_path = self._paths(self.key(func, a, b, step))
+        try:
+            with open(meta_path, encoding='utf-8') as f:
+                meta = json.load(f)
+            x = np.load(x_path, mmap_mode='r')
+            y = np.load(y_path, mmap_mode='r')
+        except (OSError, ValueError):
+            return None
+
+        if meta.get('function') != function_identity(func) or len(x) != len(y):
+            return None
+        reasons = None
+        if meta.get('reasons'):
+            reasons = np.zeros(len(x), dtype=np.uint8)
+            indices, codes = zip(*meta['reasons'])
+            reasons[list(indices)] = codes
+        return Series(x, y, ((i, message) for i, message in meta.get('errors', [])),
+                      reasons=reasons)
+
+    def save(self, func: Callable, a: float, b: float, step: float, series: Series) -> None:
+        """
+        Сохранение вычисленного ряда с последующим вытеснением старых записей
+        """
+        x, y = series.x, series.y
+        meta = {
+            'function': function_identity(func),
+            'a': a, 'b': b, 'step': step,
+            'points': len(x),
+            'created': time.time(),
+            # Ошибки хранятся по индексу точки
+            'errors': [[i, message] for i, message in sorted(series.errors.items())],
+            # Коды причин - только для точек вне области определения
+            'reasons': ([] if series.reasons is None else
+                        [[i, int(series.reasons[i])] for i in np.flatnonzero(series.reasons).tolist()]),
+        }
+
+        meta_path, x_path, y_path = self._paths(self.key(func, a, b, step))
+        # Запись через временные файлы, чтобы не оставить неполную запись
+        for path, array in ((x_path, x), (y_path, y)):
+            with open(path + '.tmp', 'wb') as f:
+                np.save(f, array)
+            os.replace(path + '.tmp', path)
+        with open(meta_path + '.tmp', 'w', encoding='utf-8') as f:
+            json.dump(meta, f, ensure_ascii=False)
+        os.replace(meta_path + '.tmp', meta_path)
+
+        self._evict()
+
+    def _entries(self) -> List[Tuple[float, int, str]]:
+        """
+        Записи хранилища: (время создания, объем в байтах, ключ)
+        """
+        entries = []
+        for name in os.listdir(self.directory):
+            if not name.endswith('.json'):
+                continue
+            key = name[:-len('.json')]
+            try:
+                paths = self._paths(key)
+                size = sum(os.path.getsize(path) for path in paths)
+                created = os.path.getmtime(paths[0])
+            except OSError:
+                continue
+            entries.append((created, size, key))
+        return entries
+
+    def size(self) -> int:
+        """
+        Общий объем записей в байтах
+        """
+        return sum(size for _, size, _ in self._entries())
+
+    def _evict(self) -> None:
+        entries = sorted(self._entries())
+        total = sum(size for _, size, _ in entries)
+        for _, size, key in entries:
+            if total <= self.max_bytes:
+                break
+            self._remove(key)
+            total -= size
+
+    def _remove(self, key: str) -> None:
+        for path in self._paths(key):
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+
+    def clear(self) -> None:
+        """
+        Удаление всех записей хранилища
+        """
+        for _, _, key in self._entries():
+            self._remove(key)
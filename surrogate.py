@@ -0,0 +1,206 @@
+from __future__ import annotations
+import math
+from typing import Callable, List, NamedTuple, Optional, Tuple
+from lazy import lazy_import
+from adaptive import array_evaluator
+from domain import Domain, VALID
+from series import Series
+import output
+
+np = lazy_import('numpy')
+
+
+# Начальная и наибольшая проверяемая степень многочлена на одном куске
+INITIAL_DEGREE = 8
+MAX_DEGREE = 128
+
+# Наибольшая глубина деления интервала на куски (до 2**MAX_SPLITS кусков)
+MAX_SPLITS = 6
+
+# Полуширина окна прямого вычисления около особых точек (доля интервала)
+SINGULARITY_GUARD = 1e-3
+
+
+class Piece(NamedTuple):
+    """
+    Кусок аппроксимации: коэффициенты Чебышева на [lo, hi]
+    (None - точки куска вычисляются напрямую) и оценка погрешности
+    """
+    lo: float
+    hi: float
+    coefficients: Optional[np.ndarray]
+    error: float
+
+
+class SurrogateResult(NamedTuple):
+    """
+    Результат вычисления сетки через аппроксимацию
+
+    error_bound - наибольшая оценка погрешности по кускам аппроксимации,
+    evaluations - количество вычислений исходной функции (включая прямые).
+    """
+    series: Series
+    error_bound: float
+    evaluations: int
+    pieces: List[Piece]
+
+
+def chebyshev_points(n: int) -> np.ndarray:
+    """
+    Точки Чебышева - Лобатто cos(pi*k/n), k = 0..n, на [-1, 1]
+
+    Точки для 2n содержат все точки для n (с четными номерами),
+    поэтому при удвоении степени прежние вычисления не повторяются.
+    """
+    return np.cos(np.pi * np.arange(n + 1) / n)
+
+
+def chebyshev_coefficients(values: np.ndarray) -> np.ndarray:
+    """
+    Коэффициенты интерполяционного многочлена Чебышева степени n
+    по значениям в точках chebyshev_points(n) (косинусное преобразование через БПФ)
+    """
+    n = len(values) - 1
+    extended = np.concatenate((values, values[-2:0:-1]))
+    coefficients = np.fft.rfft(extended).real[:n + 1] / n
+    coefficients[0] /= 2
+    coefficients[n] /= 2
+    return coefficients
+
+
+def _nodes(t: np.ndarray, lo: float, hi: float) -> np.ndarray:
+    return (lo + hi) / 2 + (hi - lo) / 2 * t
+
+
+def fit_chebyshev(evaluate: Callable[[np.ndarray], np.ndarray], lo: float, hi: float,
+                  tolerance: float, max_degree: int = MAX_DEGREE) -> Tuple[Optional[np.ndarray], float, int]:
+    """
+    Подбор многочлена Чебышева на [lo, hi] с удвоением степени
+
+    Многочлен степени n проверяется по значениям функции в n новых точках
+    сетки степени 2n (серединах между узлами); если наибольшее отклонение
+    не больше tolerance, степень принимается, иначе эти точки становятся
+    узлами многочлена степени 2n.
+
+    Returns:
+        Коэффициенты (None, если допуск не достигнут до max_degree или функция
+        не определена в каком-то узле), оценка погрешности и число вычислений
+    """
+    n = INITIAL_DEGREE
+    values = evaluate(_nodes(chebyshev_points(n), lo, hi))
+    evaluations = n + 1
+    while n <= max_degree and np.isfinite(values).all():
+        coefficients = chebyshev_coefficients(values)
+        t_check = chebyshev_points(2 * n)[1::2]
+        check = evaluate(_nodes(t_check, lo, hi))
+        evaluations += n
+        with np.errstate(invalid='ignore'):
+            error = float(np.max(np.abs(np.polynomial.chebyshev.chebval(t_check, coefficients) - check)))
+        if error <= tolerance:
+            return coefficients, error, evaluations
+        merged = np.empty(2 * n + 1)
+        merged[::2], merged[1::2] = values, check
+        values, n = merged, 2 * n
+    return None, math.inf, evaluations
+
+
+def _breakpoints(domain: Domain, a: float, b: float) -> List[float]:
+    """
+    Точки на [a, b], около которых функция вычисляется напрямую:
+    особые точки и открытая граница области
+    """
+    points = [domain.min] if domain.open_min and a <= domain.min <= b else []
+    for singularity in domain.singularities:
+        points.extend(singularity.points(a, b))
+    return sorted(points)
+
+
+def surrogate_sample(func: Callable, x_values: np.ndarray,
+                     tolerance: float = 1e-8,
+                     max_degree: int = MAX_DEGREE,
+                     max_splits: int = MAX_SPLITS) -> SurrogateResult:
+    """
+    Вычисление функции на плотной сетке через кусочную аппроксимацию Чебышева
+
+    Функция вычисляется только в узлах Чебышева, степень на каждом куске
+    удваивается до достижения допуска tolerance (абсолютная погрешность),
+    а при недостижении кусок делится пополам. Плотная сетка вычисляется
+    по коэффициентам векторно. Около объявленных особых точек функции
+    (атрибут domain) и на кусках, где аппроксимация не сошлась или которые
+    содержат слишком мало точек сетки, функция вычисляется напрямую;
+    точки вне области определения получают NaN и код причины.
+
+    Args:
+        func: Функция (векторизованная или скалярная)
+        x_values: Упорядоченная по возрастанию сетка X
+        tolerance: Допустимая абсолютная погрешность аппроксимации
+        max_degree: Наибольшая степень многочлена на куске
+        max_splits: Наибольшая глубина деления интервала на куски
+    """
+    if tolerance <= 0:
+        raise ValueError(f"Допуск должен быть положительным, получен {tolerance}")
+
+    x = np.ascontiguousarray(x_values, dtype=float)
+    n = len(x)
+    y = np.full(n, np.nan)
+    direct = np.ones(n, dtype=bool)
+    evaluate = array_evaluator(func)
+    domain = getattr(func, 'domain', Domain())
+    pieces = []
+    evaluations = 0
+    if not n:
+        return SurrogateResult(Series(x, y), 0.0, 0, pieces)
+
+    a, b = float(x[0]), float(x[-1])
+    reasons = None
+    if not domain.contains_interval(a, b):
+        reasons = domain.reasons(x)
+        direct[reasons != VALID] = False
+
+    # Интервалы для аппроксимации: область внутри [a, b] без окон около особых точек
+    lo, hi = max(a, domain.min), min(b, domain.max)
+    guard = SINGULARITY_GUARD * (b - a)
+    intervals = []
+    for point in _breakpoints(domain, lo, hi):
+        intervals.append((lo, point - guard))
+        lo = point + guard
+    intervals.append((lo, hi))
+
+    # Куску нужно не меньше точек сетки, чем вычислений для проверки наибольшей степени
+    min_points = 2 * max_degree + 1
+    stack = [(lo, hi, max_splits) for lo, hi in reversed(intervals) if lo < hi]
+    while stack:
+        lo, hi, splits = stack.pop()
+        start = int(np.searchsorted(x, lo, side='left'))
+        stop = int(np.searchsorted(x, hi, side='right'))
+        if stop - start < min_points:
+            continue
+        coefficients, error, count = fit_chebyshev(evaluate, lo, hi, tolerance, max_degree)
+        evaluations += count
+        if coefficients is None and splits > 0:
+            middle = (lo + hi) / 2
+            stack.extend(((middle, hi, splits - 1), (lo, middle, splits - 1)))
+            continue
+        pieces.append(Piece(lo, hi, coefficients, error))
+        if coefficients is not None:
+            part = slice(start, stop)
+            y[part] = np.polynomial.chebyshev.chebval((2 * x[part] - (lo + hi)) / (hi - lo), coefficients)
+            direct[part] = False
+
+    # Прямое вычисление около особых точек и на несошедшихся кусках
+    n_direct = int(np.count_nonzero(direct))
+    if n_direct:
+        y[direct] = evaluate(x[direct])
+        evaluations += n_direct
+    if reasons is not None:
+        y[reasons != VALID] = np.nan
+
+    fitted = [piece for piece in pieces if piece.coefficients is not None]
+    error_bound = max((piece.error for piece in fitted), default=0.0)
+    if output.enabled(output.SUMMARY):
+        degree = max((len(piece.coefficients) - 1 for piece in fitted), default=0)
+        output.emit(output.SUMMARY, f"  Аппроксимация Чебышева: {len(fitted)} кусков (степень до {degree}), "
+                                    f"{evaluations} вычислений функции на {n} точек "
+                                    f"(из них {n_direct} напрямую), "
+                                    f"оценка погрешности {error_bound:.3g} (допуск {tolerance:g})")
+    return SurrogateResult(Series(x, y, reasons=reasons), error_bound, evaluations, pieces)
@@ -0,0 +1,11 @@
+import os
+import sys
+
+# Модули проекта лежат в корне репозитория и импортируются по имени
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import output
+
+# Сообщения вычислений в тестах не нужны; кроме того, буфер вывода,
+# привязанный к перехваченному pytest потоку, нельзя сбросить при выходе
+output.set_verbosity(output.SILENT)
@@ -0,0 +1,56 @@
+import numpy as np
+import pytest
+
+import decimation
+
+
+def _series(n=100_003, seed=0):
+    rng = np.random.default_rng(seed)
+    x = np.linspace(-5.0, 5.0, n)
+    y = np.sin(7 * x) + rng.normal(scale=0.1, size=n)
+    y[[17, n // 20, n - 9]] = [40.0, -40.0, 25.0]
+    return x, y
+
+
+@pytest.mark.parametrize('chunk_size', [1000, 4096, 65536, 1 << 20])
+@pytest.mark.parametrize('n_buckets', [1, 37, 800])
+def test_chunked_minmax_matches_full(chunk_size, n_buckets):
+    x, y = _series()
+    expected = decimation.decimate_minmax(x, y, n_buckets)
+    result = decimation.decimate_minmax_chunked(x, y, n_buckets, chunk_size)
+    np.testing.assert_array_equal(result[0], expected[0])
+    np.testing.assert_array_equal(result[1], expected[1])
+
+
+def test_chunked_minmax_keeps_extremes_with_nan():
+    x, y = _series()
+    y[::11] = np.nan
+    px, py = decimation.decimate_minmax_chunked(x, y, 400, chunk_size=3000)
+    assert np.isfinite(py).all()
+    assert py.max() == np.nanmax(y) and py.min() == np.nanmin(y)
+    assert np.all(np.diff(px) > 0)
+
+
+def test_minmax_short_series_is_returned_as_is():
+    x, y = np.arange(5.0), np.array([1.0, np.nan, 3.0, 4.0, 5.0])
+    px, py = decimation.decimate_minmax(x, y, 10)
+    np.testing.assert_array_equal(px, [0.0, 2.0, 3.0, 4.0])
+    np.testing.assert_array_equal(py, [1.0, 3.0, 4.0, 5.0])
+
+
+def test_minmax_bounds_point_count():
+    x, y = _series()
+    px, _ = decimation.decimate(x, y, 1200)
+    assert len(px) <= 1200
+
+
+def test_lttb_keeps_endpoints_and_size():
+    x, y = _series(10_000)
+    px, py = decimation.decimate(x, y, 500, method='lttb')
+    assert len(px) == 500
+    assert px[0] == x[0] and px[-1] == x[-1]
+
+
+def test_unknown_method():
+    with pytest.raises(ValueError):
+        decimation.decimate([0.0, 1.0], [0.0, 1.0], 10, method='median')
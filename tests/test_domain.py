@@ -0,0 +1,51 @@
+import math
+
+import numpy as np
+import pytest
+
+import function
+from domain import ABOVE_MAX, BELOW_MIN, SINGULAR, VALID, Domain, Singularity
+
+DOMAINS = [
+    Domain(),
+    Domain(0.0, open_min=True),
+    Domain(-1.0, 1.0),
+    Domain(singularities=(Singularity(math.pi / 2, math.pi),)),
+    Domain(-2.0, 5.0, singularities=(Singularity(0.0), Singularity(1.0, 2.0))),
+]
+
+
+@pytest.mark.parametrize('domain', DOMAINS)
+def test_vector_reasons_match_scalar_reason(domain):
+    x = np.concatenate((np.linspace(-6.0, 6.0, 2401), [0.0, 1.0, -1.0, math.pi / 2, 3 * math.pi / 2]))
+    np.testing.assert_array_equal(domain.reasons(x), [domain.reason(v) for v in x.tolist()])
+
+
+def test_reason_codes():
+    domain = Domain(0.0, 10.0, open_min=True, singularities=(Singularity(5.0),))
+    assert domain.reasons(np.array([-1.0, 0.0, 1.0, 5.0, 11.0])).tolist() == \
+        [BELOW_MIN, BELOW_MIN, VALID, SINGULAR, ABOVE_MAX]
+
+
+@pytest.mark.parametrize('domain', DOMAINS)
+def test_contains_interval_agrees_with_points(domain):
+    for a, b in [(-6.0, -3.0), (0.1, 0.9), (-1.0, 1.0), (2.0, 4.0), (0.0, 6.0)]:
+        x = np.linspace(a, b, 10_001)
+        if domain.contains_interval(a, b):
+            assert not domain.mask(x).any()
+            assert not domain.reasons(x).any()
+
+
+def test_singularity_points():
+    periodic = Singularity(math.pi / 2, math.pi)
+    assert periodic.points(0.0, 5.0) == pytest.approx([math.pi / 2, 3 * math.pi / 2])
+    assert Singularity(1.0).points(2.0, 3.0) == []
+
+
+def test_vectorized_path_uses_reasons():
+    _, tan = function.get_available_functions()[5]
+    x = np.linspace(-3.0, 3.0, 601)
+    reasons = tan.domain.reasons(x)
+    y = tan.vectorized(x, reasons)
+    np.testing.assert_array_equal(np.isnan(y), reasons != VALID)
+    np.testing.assert_array_equal(y, tan.vectorized(x))
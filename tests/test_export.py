@@ -0,0 +1,98 @@
+import math
+import os
+
+import numpy as np
+import pytest
+
+import export
+import grid
+import output
+
+
+def _data(n=10_007):
+    x = grid.build_grid(-3.0, 3.0, 6.0 / (n - 1))
+    y = np.tan(x)
+    y[::97] = np.nan
+    y[5] = np.inf
+    return x, y
+
+
+@pytest.mark.parametrize('chunk_size', [1, 1000, 1 << 20])
+def test_columnar_round_trip(tmp_path, chunk_size):
+    x, y = _data()
+    path = str(tmp_path / 'data.pzc')
+    meta = {'function': 'expression[tan(x)]@-3,3', 'a': -3.0}
+    written = export.export_series(path, export.array_chunks(x, y, chunk_size), len(x), meta)
+    assert written == len(x)
+
+    x_read, y_read, meta_read = export.read_columnar(path)
+    assert isinstance(x_read, np.memmap)
+    np.testing.assert_array_equal(x_read, x)
+    np.testing.assert_array_equal(y_read, y)
+    assert meta_read == meta
+
+
+def test_columnar_empty(tmp_path):
+    path = str(tmp_path / 'empty.pzc')
+    assert export.write_columnar(path, [], 0) == 0
+    x, y, meta = export.read_columnar(path)
+    assert len(x) == len(y) == 0 and meta == {}
+
+
+def test_columnar_rejects_wrong_point_count(tmp_path):
+    x, y = _data(100)
+    with pytest.raises(ValueError):
+        export.write_columnar(str(tmp_path / 'short.pzc'), export.array_chunks(x, y), 101)
+    with pytest.raises(ValueError):
+        export.write_columnar(str(tmp_path / 'long.pzc'), export.array_chunks(x, y), 99)
+
+
+def test_read_columnar_rejects_other_files(tmp_path):
+    path = tmp_path / 'other.pzc'
+    path.write_bytes(b'not a columnar file' * 10)
+    with pytest.raises(ValueError):
+        export.read_columnar(str(path))
+
+
+def test_npy_and_csv_round_trip(tmp_path):
+    x, y = _data(1000)
+    npy = str(tmp_path / 'data.npy')
+    export.export_series(npy, export.array_chunks(x, y, 300), len(x))
+    np.testing.assert_array_equal(np.load(npy), np.column_stack((x, y)))
+
+    csv = str(tmp_path / 'data.csv')
+    export.export_series(csv, export.array_chunks(x, y, 300), len(x))
+    loaded = np.loadtxt(csv, delimiter=',', skiprows=1)
+    np.testing.assert_array_equal(loaded, np.column_stack((x, y)))
+
+
+@pytest.mark.parametrize('name', ['out.cvs', 'out.txt', 'out'])
+def test_unknown_extension(tmp_path, name):
+    x, y = _data(10)
+    with pytest.raises(ValueError):
+        export.export_series(str(tmp_path / name), export.array_chunks(x, y), len(x))
+    assert not (tmp_path / name).exists()
+
+
+def test_sweep_matches_in_memory_evaluation(tmp_path):
+    path = str(tmp_path / 'sweep.pzc')
+    summary = export.export_sweep(path, math.sin, 0.0, 10.0, 0.001, chunk_size=777)
+    x, y, meta = export.read_columnar(path)
+    expected_x = grid.build_grid(0.0, 10.0, 0.001)
+    np.testing.assert_array_equal(x, expected_x)
+    np.testing.assert_allclose(y, np.sin(expected_x), rtol=0, atol=1e-15)
+    assert summary.count == len(x) and summary.nan_count == 0
+    assert summary.max == pytest.approx(1.0, abs=1e-6)
+    assert meta['function'] == 'sin' and meta['step'] == 0.001
+
+
+def test_sweep_reports_pointwise_errors(tmp_path):
+    log = tmp_path / 'output.log'
+    previous = output.get_verbosity()
+    output.configure(output.SUMMARY, str(log))
+    try:
+        summary = export.export_sweep(str(tmp_path / 'log.pzc'), math.log, -1.0, 1.0, 0.5)
+    finally:
+        output.configure(previous, os.devnull)
+    assert summary.nan_count == 3
+    assert "Ошибок при вычислении: 3" in log.read_text(encoding='utf-8')
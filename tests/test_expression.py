@@ -0,0 +1,82 @@
+import math
+
+import numpy as np
+import pytest
+
+import expression
+
+
+@pytest.mark.parametrize('text, x, expected', [
+    ('x**2 - 4', 3.0, 5.0),
+    ('2*sin(x) + cos(pi)', math.pi / 2, 1.0),
+    ('-x % 3', 1.0, 2.0),
+    ('sqrt(abs(x)) / e', -4.0, 2 / math.e),
+])
+def test_scalar_and_vectorized_agree(text, x, expected):
+    compiled = expression.compile_expression(text)
+    assert compiled.scalar(x) == pytest.approx(expected)
+    assert compiled.vectorized(np.array([x]))[0] == pytest.approx(expected)
+
+
+@pytest.mark.parametrize('text', [
+    '__import__("os")',
+    'x.__class__',
+    '(lambda: 1)()',
+    'open("f")',
+    'y + 1',
+    'sin(x, key=1)',
+    '[x]',
+    'x if x else 1',
+    'x < 1',
+    '"abc"',
+    'True',
+    'x @ x',
+    'getattr(x, "real")',
+])
+def test_rejects_constructs_outside_whitelist(text):
+    with pytest.raises(ValueError):
+        expression.parse_expression(text)
+
+
+@pytest.mark.parametrize('text', ['x +', '', ')'])
+def test_syntax_errors_are_value_errors(text):
+    with pytest.raises(ValueError):
+        expression.parse_expression(text)
+
+
+@pytest.mark.parametrize('text', ['+' * 100_000 + 'x', '-' * 900 + 'x'])
+def test_deep_nesting_is_rejected(text):
+    with pytest.raises(ValueError):
+        expression.parse_spec(text)
+
+
+def test_integer_powers_overflow_as_floats():
+    compiled = expression.compile_expression('9**9**9')
+    with pytest.raises(OverflowError):
+        compiled.scalar(0.0)
+
+
+def test_complex_result_is_an_error():
+    with pytest.raises(ValueError):
+        expression.compile_expression('(-x)**0.5').scalar(1.0)
+
+
+def test_parse_spec():
+    assert expression.parse_spec('x**2@0,1') == ('x**2', 0.0, 1.0)
+    assert expression.parse_spec('x') == ('x', -math.inf, math.inf)
+    with pytest.raises(ValueError):
+        expression.parse_spec('x@1')
+
+
+def test_registered_expressions_have_distinct_identities(tmp_path):
+    import function
+    from store import ResultStore
+
+    plain = function.register_expression('x**3 + 1')
+    bounded = function.register_expression('x**3 + 1', 0.0, 1.0)
+    functions = function.get_available_functions()
+    f_plain, f_bounded = functions[plain][1], functions[bounded][1]
+    assert plain != bounded
+    assert f_plain.__name__ != f_bounded.__name__
+    store = ResultStore(str(tmp_path))
+    assert store.key(f_plain, 0.0, 1.0, 0.1) != store.key(f_bounded, 0.0, 1.0, 0.1)
@@ -0,0 +1,91 @@
+import numpy as np
+import pytest
+
+import grid
+from gridcache import GridCache, grid_overlap
+from series import Series
+
+
+class CountingFunction:
+    def __init__(self):
+        self.evaluated = 0
+
+    def series(self, x):
+        self.evaluated += len(x)
+        y = np.sin(x)
+        y[x < 0] = np.nan
+        return Series(x, y)
+
+
+def _evaluate(cache, func, a, b, step):
+    x = grid.build_grid(a, b, step)
+    return cache.evaluate(func, a, step, x, func.series)
+
+
+def _check(series, a, b, step):
+    x = grid.build_grid(a, b, step)
+    expected = np.where(x < 0, np.nan, np.sin(x))
+    np.testing.assert_array_equal(series.x, x)
+    np.testing.assert_allclose(series.y, expected, rtol=0, atol=1e-12)
+
+
+def test_grid_overlap_shift_and_refinement():
+    new_index, old_index = grid_overlap(0.0, 0.1, 11, 0.5, 0.1, 11)
+    assert new_index.tolist() == list(range(6)) and old_index.tolist() == list(range(5, 11))
+
+    new_index, old_index = grid_overlap(0.0, 0.2, 6, 0.0, 0.1, 11)
+    assert new_index.tolist() == [0, 2, 4, 6, 8, 10] and old_index.tolist() == list(range(6))
+
+    assert grid_overlap(0.0, 0.1, 11, 0.05, 0.1, 11) is None
+    assert grid_overlap(0.0, 0.1, 11, 0.0, 0.03, 11) is None
+    assert grid_overlap(0.0, 0.1, 11, 5.0, 0.1, 11) is None
+
+
+@pytest.mark.parametrize('second, reused', [
+    ((0.5, 2.0, 0.01), 51),      # сдвиг: общий участок [0.5, 1]
+    ((0.0, 1.0, 0.005), 101),    # шаг делится на 2: каждая вторая точка
+    ((0.0, 1.0, 0.02), 51),      # шаг умножен на 2: все точки уже есть
+    ((0.3, 0.7, 0.01), 41),      # участок внутри
+    ((0.005, 1.005, 0.01), 0),   # сетки не выровнены
+])
+def test_reuse(second, reused):
+    cache = GridCache()
+    func = CountingFunction()
+    first, hits = _evaluate(cache, func, 0.0, 1.0, 0.01)
+    assert hits == 0 and func.evaluated == 101
+
+    series, hits = _evaluate(cache, func, *second)
+    _check(series, *second)
+    assert hits == reused
+    assert func.evaluated == 101 + len(series) - reused
+
+
+def test_reuse_keeps_invalid_points():
+    cache = GridCache()
+    func = CountingFunction()
+    _evaluate(cache, func, -1.0, 1.0, 0.1)
+    series, hits = _evaluate(cache, func, -2.0, 0.0, 0.1)
+    _check(series, -2.0, 0.0, 0.1)
+    assert hits == 11
+    assert series.n_errors == 20
+
+
+def test_superseded_grid_is_dropped_and_size_is_bounded():
+    cache = GridCache(max_points=250)
+    func = CountingFunction()
+    _evaluate(cache, func, 0.3, 0.7, 0.01)
+    _evaluate(cache, func, 0.0, 1.0, 0.01)
+    assert cache.info()['size'] == 1 and cache.info()['points'] == 101
+
+    _evaluate(cache, func, 5.0, 6.0, 0.01)
+    _evaluate(cache, func, 8.0, 9.0, 0.01)
+    info = cache.info()
+    assert info['points'] <= 250 and info['evictions'] == 1
+
+
+def test_functions_do_not_share_entries():
+    cache = GridCache()
+    first, second = CountingFunction(), CountingFunction()
+    _evaluate(cache, first, 0.0, 1.0, 0.01)
+    _, hits = _evaluate(cache, second, 0.0, 1.0, 0.01)
+    assert hits == 0 and second.evaluated == 101
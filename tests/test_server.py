@@ -0,0 +1,109 @@
+import asyncio
+
+import numpy as np
+
+import function
+import server
+
+SIN = 3
+
+
+def _run(coroutine):
+    return asyncio.run(coroutine)
+
+
+def test_identical_requests_share_one_computation():
+    async def scenario():
+        coalescer = server.EvaluationCoalescer()
+        results = await asyncio.gather(*[coalescer.evaluate(SIN, 0.0, 1.0, 0.001) for _ in range(5)])
+        return coalescer, results
+
+    coalescer, results = _run(scenario())
+    assert coalescer.computations == 1
+    assert coalescer.coalesced == 4
+    for x, y in results:
+        np.testing.assert_allclose(y, np.sin(x))
+
+
+def test_contained_grid_is_sliced_from_cached_result():
+    async def scenario():
+        coalescer = server.EvaluationCoalescer()
+        await coalescer.evaluate(SIN, 0.0, 10.0, 0.5)
+        x, y = await coalescer.evaluate(SIN, 2.0, 4.0, 0.5)
+        return coalescer, x, y
+
+    coalescer, x, y = _run(scenario())
+    assert coalescer.computations == 1
+    np.testing.assert_allclose(x, [2.0, 2.5, 3.0, 3.5, 4.0])
+    np.testing.assert_allclose(y, np.sin(x))
+
+
+def test_partial_overlap_computes_only_missing_points():
+    async def scenario():
+        coalescer = server.EvaluationCoalescer()
+        await coalescer.evaluate(SIN, 0.0, 1.0, 0.1)
+        x, y = await coalescer.evaluate(SIN, 0.5, 2.0, 0.1)
+        return coalescer, x, y
+
+    coalescer, x, y = _run(scenario())
+    assert coalescer.computations == 2
+    assert coalescer.reused_points == 6
+    assert len(x) == 16
+    np.testing.assert_allclose(y, np.sin(x))
+
+
+def test_misaligned_grids_are_not_reused():
+    async def scenario():
+        coalescer = server.EvaluationCoalescer()
+        await coalescer.evaluate(SIN, 0.0, 1.0, 0.1)
+        await coalescer.evaluate(SIN, 0.05, 0.55, 0.1)
+        await coalescer.evaluate(SIN, 0.0, 1.0, 0.2)
+        return coalescer
+
+    coalescer = _run(scenario())
+    assert coalescer.computations == 3
+    assert coalescer.reused_points == 0
+
+
+def test_domain_errors_are_nan():
+    log = next(number for number, (_, func) in function.get_available_functions().items()
+               if func.__name__ == 'log_function')
+    x, y = server.evaluate_grid(function.get_available_functions()[log][1], -1.0, 1.0, 0.5)
+    assert np.isnan(y[:3]).all() and y[-1] == 0.0
+
+
+def _request(path, server_instance):
+    async def scenario():
+        listener = await asyncio.start_server(server_instance.handle, '127.0.0.1', 0)
+        port = listener.sockets[0].getsockname()[1]
+        reader, writer = await asyncio.open_connection('127.0.0.1', port)
+        writer.write(f"GET {path} HTTP/1.1\r\nHost: test\r\n\r\n".encode('latin-1'))
+        await writer.drain()
+        data = await reader.read()
+        writer.close()
+        listener.close()
+        return data
+
+    return _run(scenario())
+
+
+def test_error_after_headers_aborts_response():
+    instance = server.EvaluationServer()
+    calls = []
+    original = instance._json_numbers
+
+    def failing(values):
+        calls.append(len(values))
+        if len(calls) > 1:
+            raise RuntimeError("сбой")
+        return original(values)
+
+    instance._json_numbers = failing
+    data = _request("/evaluate?function=1&a=0&b=1&step=0.5", instance)
+    assert data.count(b"HTTP/1.1") == 1
+    assert not data.endswith(b"0\r\n\r\n")
+
+
+def test_bad_request_is_json_error():
+    data = _request("/evaluate?function=1&a=1&b=0&step=0.5", server.EvaluationServer())
+    assert data.startswith(b"HTTP/1.1 400")
@@ -0,0 +1,68 @@
+import numpy as np
+import pytest
+
+from stats import Summary, summarize
+
+
+def _values(n=50_000, seed=1):
+    rng = np.random.default_rng(seed)
+    values = rng.normal(loc=1e6, scale=3.0, size=n)
+    values[rng.integers(0, n, size=n // 50)] = np.nan
+    values[[10, 20]] = [np.inf, -np.inf]
+    return values
+
+
+def _check(summary, values):
+    finite = values[np.isfinite(values)]
+    assert summary.count == len(values)
+    assert summary.nan_count == len(values) - len(finite)
+    assert summary.mean == pytest.approx(finite.mean(), rel=1e-12)
+    assert summary.variance == pytest.approx(finite.var(), rel=1e-9)
+    assert summary.total == pytest.approx(finite.sum(), rel=1e-12)
+    assert summary.min == finite.min() and summary.max == finite.max()
+    assert values[summary.argmin] == summary.min and values[summary.argmax] == summary.max
+
+
+@pytest.mark.parametrize('chunk_size', [1, 7, 4096, 1 << 20])
+def test_chunked_summary_matches_numpy(chunk_size):
+    values = _values(5000 if chunk_size == 1 else 50_000)
+    _check(summarize(values, chunk_size=chunk_size), values)
+
+
+def test_merge_of_parts_matches_single_pass():
+    values = _values()
+    bounds = [0, 3, 12_000, 12_001, 31_337, len(values)]
+    merged = Summary()
+    for start, stop in zip(bounds, bounds[1:]):
+        part = Summary().update(values[start:stop], start)
+        merged.merge(part)
+    single = summarize(values, chunk_size=len(values))
+    _check(merged, values)
+    assert merged.mean == pytest.approx(single.mean, rel=1e-14)
+    assert merged.m2 == pytest.approx(single.m2, rel=1e-9)
+    assert (merged.argmin, merged.argmax) == (single.argmin, single.argmax)
+
+
+def test_merge_order_does_not_change_result():
+    values = _values(10_000)
+    left = Summary().update(values[:4000], 0)
+    right = Summary().update(values[4000:], 4000)
+    forward = Summary().merge(left).merge(right)
+    backward = Summary().merge(Summary().update(values[4000:], 4000)).merge(
+        Summary().update(values[:4000], 0))
+    assert forward.to_dict() == pytest.approx(backward.to_dict())
+
+
+def test_ties_keep_first_index():
+    values = np.array([2.0, 1.0, 3.0, 1.0, 3.0])
+    for chunk_size in (1, 2, 5):
+        summary = summarize(values, chunk_size=chunk_size)
+        assert (summary.argmin, summary.argmax) == (1, 2)
+
+
+def test_all_invalid():
+    summary = summarize([np.nan, np.inf])
+    assert summary.valid_count == 0 and summary.nan_count == 2
+    assert summary.to_dict()['mean'] is None
+    merged = Summary().merge(summary).merge(summarize([5.0]))
+    assert merged.min == merged.max == 5.0 and merged.valid_count == 1
@@ -0,0 +1,52 @@
+import math
+
+import numpy as np
+import pytest
+
+import function
+import grid
+import surrogate
+from domain import VALID
+
+
+@pytest.mark.parametrize('func, a, b', [
+    (np.sin, 0.0, 20.0),
+    (np.exp, -3.0, 3.0),
+    (lambda x: 1.0 / (1.0 + 25.0 * x * x), -1.0, 1.0),
+])
+@pytest.mark.parametrize('tolerance', [1e-6, 1e-10])
+def test_error_within_bound(func, a, b, tolerance):
+    x = grid.build_grid(a, b, (b - a) / 20_000)
+    result = surrogate.surrogate_sample(func, x, tolerance)
+    error = np.max(np.abs(result.series.y - func(x)))
+    assert result.error_bound <= tolerance
+    # Оценка по точкам проверки; на плотной сетке допускается небольшой запас
+    assert error <= 10 * tolerance
+    assert result.evaluations < len(x)
+
+
+def test_chebyshev_coefficients_reproduce_polynomial():
+    t = surrogate.chebyshev_points(16)
+    coefficients = surrogate.chebyshev_coefficients(3 * t ** 3 - t + 0.5)
+    expected = np.polynomial.chebyshev.poly2cheb([0.5, -1.0, 0.0, 3.0])
+    np.testing.assert_allclose(coefficients[:4], expected, atol=1e-12)
+    np.testing.assert_allclose(coefficients[4:], 0.0, atol=1e-12)
+
+
+def test_singularities_and_domain_are_evaluated_directly():
+    _, tan = function.get_available_functions()[5]
+    _, log = function.get_available_functions()[6]
+    x = grid.build_grid(-4.0, 4.0, 0.0005)
+    for func in (tan, log):
+        result = surrogate.surrogate_sample(func, x, 1e-8)
+        expected = func.vectorized(x)
+        np.testing.assert_array_equal(np.isnan(result.series.y), np.isnan(expected))
+        finite = np.isfinite(expected)
+        np.testing.assert_allclose(result.series.y[finite], expected[finite], rtol=1e-6, atol=1e-6)
+        if result.series.reasons is not None:
+            np.testing.assert_array_equal(result.series.reasons != VALID, np.isnan(expected))
+
+
+def test_invalid_tolerance():
+    with pytest.raises(ValueError):
+        surrogate.surrogate_sample(math.sin, np.linspace(0.0, 1.0, 10), 0.0)
@@ -1,42 +1,207 @@
+from __future__ import annotations
+import math
+import sys
+from typing import Callable, List, Tuple, Optional, NamedTuple, Sequence, Union
+from lazy import lazy_import
+from adaptive import array_evaluator
+import decimation
+from decorate import LRUCache
+from series import Series
+from stats import Summary, summarize
 
-import matplotlib.pyplot as plt
-from typing import List, Tuple, Optional
-import numpy as np
+np = lazy_import('numpy')
 
 
-def plot_function(x_values: List[float], y_values: List[float],
-                  a: float, b: float,
+# Ряды длиннее этого порога рисуются без маркеров точек
+MARKER_THRESHOLD = 500
+
+# Пересчет при масштабировании: задержка после последнего события (мс),
+# количество кэшируемых плиток и наибольший уровень масштаба
+ZOOM_DEBOUNCE_MS = 150
+ZOOM_CACHE_TILES = 256
+ZOOM_MAX_LEVEL = 40
+
+
+def _series_arrays(x_values, y_values) -> Tuple[Sequence[float], Sequence[float]]:
+    """
+    Векторы X и Y из ряда Series или из двух отдельных векторов
+    """
+    if isinstance(x_values, Series):
+        if y_values is not None:
+            raise ValueError("Для ряда Series значения Y не передаются отдельно")
+        return x_values.x, x_values.y
+    if y_values is None:
+        raise ValueError("Не заданы значения Y")
+    if len(x_values) != len(y_values):
+        raise ValueError(f"Длины массивов не совпадают: X={len(x_values)}, Y={len(y_values)}")
+    return x_values, y_values
+
+
+class ZoomResampler:
+    """
+    Пересчет функции под видимый участок оси X при масштабировании графика
+    
+    Подписывается на событие xlim_changed осей. Когда на видимом участке
+    исходных точек меньше, чем пикселей по ширине осей, функция заново
+    вычисляется только на этом участке примерно с одной точкой на пиксель,
+    иначе рисуются прореженные исходные точки. Сетка уровня масштаба L
+    имеет шаг (b - a) / (пиксели * 2**L) и делится на плитки по ширине
+    осей, которые кэшируются (LRU), поэтому при панорамировании и возврате
+    к прежнему масштабу вычисляются только новые плитки. Пересчет
+    откладывается до паузы в событиях (debounce_ms), чтобы перетаскивание
+    оставалось плавным; новые данные передаются в on_data(x, y).
+    """
+    
+    def __init__(self, ax, func: Callable, x_values, y_values,
+                 on_data: Callable[[np.ndarray, np.ndarray], None],
+                 debounce_ms: int = ZOOM_DEBOUNCE_MS,
+                 max_tiles: int = ZOOM_CACHE_TILES):
+        self.ax = ax
+        self.evaluate = array_evaluator(func)
+        self.x = np.asarray(x_values, dtype=float)
+        self.y = np.asarray(y_values, dtype=float)
+        self.on_data = on_data
+        self.a, self.b = float(self.x[0]), float(self.x[-1])
+        self.tiles = LRUCache(max_entries=max_tiles)
+        self.evaluated = 0
+        
+        self.timer = None
+        if debounce_ms > 0:
+            self.timer = ax.figure.canvas.new_timer(interval=debounce_ms)
+            self.timer.single_shot = True
+            self.timer.add_callback(self.update)
+        self._connection = ax.callbacks.connect('xlim_changed', self._on_xlim_changed)
+    
+    def disconnect(self) -> None:
+        """
+        Отключение от событий осей
+        """
+        self.ax.callbacks.disconnect(self._connection)
+        if self.timer is not None:
+            self.timer.stop()
+    
+    def _on_xlim_changed(self, ax) -> None:
+        if self.timer is None:
+            self.update()
+        else:
+            # Каждое новое событие откладывает пересчет
+            self.timer.stop()
+            self.timer.start()
+    
+    def _tile(self, pixels: int, level: int, index: int) -> Tuple[np.ndarray, np.ndarray]:
+        key = (pixels, level, index)
+        tile = self.tiles.get(key)
+        if tile is None:
+            step = (self.b - self.a) / (pixels * 2 ** level)
+            x = self.a + np.arange(index * pixels, (index + 1) * pixels, dtype=float) * step
+            tile = (x, np.asarray(self.evaluate(x), dtype=float))
+            self.evaluated += len(x)
+            self.tiles.put(key, tile)
+        return tile
+    
+    def sample(self, lo: float, hi: float, pixels: int) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Точки для отрисовки участка [lo, hi] на ширине pixels пикселей
+        """
+        start, stop = np.searchsorted(self.x, [lo, hi])
+        if stop - start >= pixels or hi <= lo or self.b <= self.a:
+            return self.x[start:stop], self.y[start:stop]
+        
+        level = min(max(0, math.ceil(math.log2((self.b - self.a) / (hi - lo)))), ZOOM_MAX_LEVEL)
+        step = (self.b - self.a) / (pixels * 2 ** level)
+        first = math.floor((lo - self.a) / step)
+        last = math.ceil((hi - self.a) / step)
+        tiles = [self._tile(pixels, level, index)
+                 for index in range(first // pixels, last // pixels + 1)]
+        x = np.concatenate([tile[0] for tile in tiles])
+        y = np.concatenate([tile[1] for tile in tiles])
+        keep = slice(first - first // pixels * pixels, last - first // pixels * pixels + 1)
+        return x[keep], y[keep]
+    
+    def update(self) -> None:
+        """
+        Пересчет под текущие границы оси X и перерисовка
+        """
+        lo, hi = self.ax.get_xlim()
+        pixels = max(1, int(self.ax.get_window_extent().width))
+        x, y = self.sample(lo, hi, pixels)
+        self.on_data(*decimation.decimate(x, y, 2 * pixels, 'minmax'))
+        self.ax.figure.canvas.draw_idle()
+
+
+def plot_function(x_values: Union[Series, List[float]],
+                  y_values: Optional[List[float]] = None,
+                  a: Optional[float] = None, b: Optional[float] = None,
                   title: str = "График функции",
                   xlabel: str = "X",
-                  ylabel: str = "Y") -> None:
+                  ylabel: str = "Y",
+                  max_points: Optional[int] = None,
+                  decimation_method: str = 'minmax',
+                  marker_threshold: int = MARKER_THRESHOLD,
+                  func: Optional[Callable] = None,
+                  zoom_debounce_ms: int = ZOOM_DEBOUNCE_MS) -> None:
     """
-    Построение графика функции по векторам X, Y
+    Построение графика функции по векторам X, Y или по ряду Series
+    
+    Некорректные точки (NaN, бесконечности) не рисуются. Большие ряды
+    перед отрисовкой прореживаются до max_points точек (по умолчанию -
+    удвоенная ширина графика в пикселях) с сохранением пиков, а маркеры
+    точек не рисуются, если точек больше marker_threshold. Если передана
+    функция func, при масштабировании она пересчитывается на видимом
+    участке (ZoomResampler), и линия обновляется без перестроения графика.
     
     Args:
-        x_values: Список значений X
-        y_values: Список значений Y
-        a: Начало интервала
-        b: Конец интервала
+        x_values: Список значений X или ряд Series
+        y_values: Список значений Y (не задается для ряда Series)
+        a: Начало интервала (по умолчанию - первое значение X)
+        b: Конец интервала (по умолчанию - последнее значение X)
         title: Заголовок графика
         xlabel: Подпись оси X
         ylabel: Подпись оси Y
+        max_points: Максимальное количество отрисовываемых точек
+        decimation_method: Метод прореживания: 'minmax' или 'lttb'
+        marker_threshold: Максимальное количество точек, рисуемых с маркерами
+        func: Функция для пересчета при масштабировании
+        zoom_debounce_ms: Задержка пересчета после последнего изменения масштаба
     """
     
-    if len(x_values) != len(y_values):
-        raise ValueError(f"Длины массивов не совпадают: X={len(x_values)}, Y={len(y_values)}")
+    series = x_values if isinstance(x_values, Series) else None
+    x_values, y_values = _series_arrays(x_values, y_values)
     
-    if len(x_values) == 0:
+    # Статистика по всем вычисленным точкам: у ряда Series она уже посчитана
+    summary = series.summary if series is not None else summarize(y_values)
+    
+    if summary.valid_count == 0:
         print("Нет данных для построения графика")
         return
     
-    plt.figure(figsize=(12, 7))
+    if a is None:
+        a = float(x_values[0])
+    if b is None:
+        b = float(x_values[-1])
+    
+    # matplotlib загружается только при построении графика
+    import matplotlib.pyplot as plt
+    fig = plt.figure(figsize=(12, 7))
+    
+    # Прореживание под ширину графика в пикселях
+    if max_points is None:
+        max_points = 2 * int(fig.get_figwidth() * fig.dpi)
+    n_computed = len(x_values)
+    plot_x, plot_y = decimation.decimate(x_values, y_values, max_points, decimation_method)
+    n_drawn = len(plot_x)
     
     # Основной график
-    plt.plot(x_values, y_values, 'b-', linewidth=2.5, label='f(x)', alpha=0.8)
-    plt.plot(x_values, y_values, 'ro', markersize=4, alpha=0.6, label='точки')
+    line, = plt.plot(plot_x, plot_y, 'b-', linewidth=2.5, label='f(x)', alpha=0.8)
+    markers = None
+    if n_drawn <= marker_threshold:
+        markers, = plt.plot(plot_x, plot_y, 'ro', markersize=4, alpha=0.6, label='точки')
     
     # Настройки графика
-    plt.title(f"{title}\nИнтервал: [{a:.2f}, {b:.2f}]", 
+    caption = f"Интервал: [{a:.2f}, {b:.2f}]"
+    if n_drawn < n_computed:
+        caption += f", отрисовано {n_drawn} из {n_computed} точек"
+    plt.title(f"{title}\n{caption}", 
               fontsize=14, fontweight='bold', pad=15)
     plt.xlabel(xlabel, fontsize=12)
     plt.ylabel(ylabel, fontsize=12)
@@ -52,110 +217,490 @@ def plot_function(x_values: List[float], y_values: List[float],
     plt.axvline(x=0, color='black', linewidth=0.8, alpha=0.7)
     
     # Заполнение области под графиком
-    plt.fill_between(x_values, y_values, alpha=0.2, color='blue')
+    fill = plt.fill_between(plot_x, plot_y, alpha=0.2, color='blue')
     
     # Легенда
     plt.legend(loc='best', fontsize=10, framealpha=0.9)
     
     # Аннотация с информацией
-    info_text = f"Количество точек: {len(x_values)}\n"
-    info_text += f"min(y) = {min(y_values):.4f}\n"
-    info_text += f"max(y) = {max(y_values):.4f}"
+    info_text = f"Количество точек: {n_computed}\n"
+    if n_drawn < n_computed:
+        info_text += f"Отрисовано точек: {n_drawn}\n"
+    info_text += f"min(y) = {summary.min:.4f} при x = {x_values[summary.argmin]:.4f}\n"
+    info_text += f"max(y) = {summary.max:.4f} при x = {x_values[summary.argmax]:.4f}"
     plt.text(0.02, 0.98, info_text, transform=plt.gca().transAxes,
              fontsize=9, verticalalignment='top',
              bbox=dict(boxstyle='round', facecolor='wheat', alpha=0.8))
     
+    # Пересчет видимого участка при масштабировании: данные линии
+    # меняются на месте, область под графиком пересоздается
+    resampler = None
+    if func is not None:
+        ax = plt.gca()
+        
+        def redraw(new_x: np.ndarray, new_y: np.ndarray) -> None:
+            nonlocal fill
+            line.set_data(new_x, new_y)
+            if markers is not None:
+                markers.set_data(new_x, new_y)
+                markers.set_visible(len(new_x) <= marker_threshold)
+            fill.remove()
+            fill = ax.fill_between(new_x, new_y, alpha=0.2, color='blue')
+        
+        resampler = ZoomResampler(ax, func, x_values, y_values, redraw, zoom_debounce_ms)
+    
     plt.tight_layout()
     plt.show()
+    if resampler is not None:
+        resampler.disconnect()
+
+
+def plot_functions(series_list: Sequence[Series], labels: Sequence[str],
+                   a: Optional[float] = None, b: Optional[float] = None,
+                   title: str = "Сравнение функций",
+                   xlabel: str = "X",
+                   ylabel: str = "Y",
+                   max_points: Optional[int] = None,
+                   decimation_method: str = 'minmax',
+                   path: Optional[str] = None) -> None:
+    """
+    Построение нескольких рядов на одном графике
+    
+    Каждый ряд прореживается отдельно и рисуется своим цветом;
+    экстремумы в подписи берутся из готовой статистики рядов.
+    
+    Args:
+        series_list: Ряды Series (обычно на одной сетке)
+        labels: Подписи рядов в легенде
+        a: Начало интервала (по умолчанию - наименьшее значение X)
+        b: Конец интервала (по умолчанию - наибольшее значение X)
+        title: Заголовок графика
+        xlabel: Подпись оси X
+        ylabel: Подпись оси Y
+        max_points: Максимальное количество отрисовываемых точек одного ряда
+        decimation_method: Метод прореживания: 'minmax' или 'lttb'
+        path: Файл для сохранения графика вместо показа в окне
+    """
+    if len(series_list) != len(labels):
+        raise ValueError(f"Количество рядов и подписей не совпадает: "
+                         f"{len(series_list)} и {len(labels)}")
+    drawable = [(series, label) for series, label in zip(series_list, labels)
+                if series.n_valid]
+    if not drawable:
+        print("Нет данных для построения графика")
+        return
+    
+    if a is None:
+        a = min(float(series.x[0]) for series, _ in drawable)
+    if b is None:
+        b = max(float(series.x[-1]) for series, _ in drawable)
+    
+    import matplotlib.pyplot as plt
+    fig = plt.figure(figsize=(12, 7))
+    if max_points is None:
+        max_points = 2 * int(fig.get_figwidth() * fig.dpi)
+    
+    info_lines = []
+    n_drawn = 0
+    for series, label in drawable:
+        plot_x, plot_y = decimation.decimate(series.x, series.y, max_points, decimation_method)
+        n_drawn += len(plot_x)
+        plt.plot(plot_x, plot_y, '-', linewidth=2, label=label, alpha=0.85)
+        summary = series.summary
+        info_lines.append(f"{label}: [{summary.min:.4f}, {summary.max:.4f}]")
+    
+    n_computed = sum(len(series) for series, _ in drawable)
+    caption = f"Интервал: [{a:.2f}, {b:.2f}]"
+    if n_drawn < n_computed:
+        caption += f", отрисовано {n_drawn} из {n_computed} точек"
+    plt.title(f"{title}\n{caption}", fontsize=14, fontweight='bold', pad=15)
+    plt.xlabel(xlabel, fontsize=12)
+    plt.ylabel(ylabel, fontsize=12)
+    plt.xlim(a - (b - a) * 0.05, b + (b - a) * 0.05)
+    plt.grid(True, alpha=0.3, linestyle='--', linewidth=0.5)
+    plt.axhline(y=0, color='black', linewidth=0.8, alpha=0.7)
+    plt.axvline(x=0, color='black', linewidth=0.8, alpha=0.7)
+    plt.legend(loc='best', fontsize=10, framealpha=0.9)
+    plt.text(0.02, 0.98, "Диапазон Y:\n" + "\n".join(info_lines), transform=plt.gca().transAxes,
+             fontsize=9, verticalalignment='top',
+             bbox=dict(boxstyle='round', facecolor='wheat', alpha=0.8))
+    plt.tight_layout()
+    
+    if path:
+        fig.savefig(path)
+        plt.close(fig)
+    else:
+        plt.show()
+
+
+class PlotSeries(NamedTuple):
+    """
+    Ряд для пакетной отрисовки
+    
+    summary - статистика Y всего ряда (если не задана, считается при отрисовке);
+    по ней выводятся минимум и максимум, а не по прореженным точкам.
+    """
+    x_values: Sequence[float]
+    y_values: Sequence[float]
+    a: float
+    b: float
+    title: str = "График функции"
+    summary: Optional[Summary] = None
+
+
+class HeadlessRenderer:
+    """
+    Отрисовка графиков в файлы без графического интерфейса
+    
+    Использует неинтерактивный холст Agg и одну фигуру на все графики:
+    у линий, подписей и заголовка меняются только данные, а сами
+    объекты создаются один раз. Формат файла (PNG, SVG, PDF)
+    определяется по расширению пути.
+    """
+    
+    def __init__(self, figsize: Tuple[float, float] = (12, 7), dpi: int = 100,
+                 max_points: Optional[int] = None,
+                 decimation_method: str = 'minmax',
+                 marker_threshold: int = MARKER_THRESHOLD,
+                 xlabel: str = "X", ylabel: str = "Y"):
+        from matplotlib.figure import Figure
+        from matplotlib.backends.backend_agg import FigureCanvasAgg
+        
+        self.figure = Figure(figsize=figsize, dpi=dpi, layout='tight')
+        FigureCanvasAgg(self.figure)
+        self.max_points = max_points or 2 * int(figsize[0] * dpi)
+        self.decimation_method = decimation_method
+        self.marker_threshold = marker_threshold
+        
+        ax = self.axes = self.figure.add_subplot()
+        self.line, = ax.plot([], [], 'b-', linewidth=2.5, label='f(x)', alpha=0.8)
+        self.markers, = ax.plot([], [], 'ro', markersize=4, alpha=0.6, label='точки')
+        self.fill = None
+        
+        ax.set_xlabel(xlabel, fontsize=12)
+        ax.set_ylabel(ylabel, fontsize=12)
+        ax.grid(True, alpha=0.3, linestyle='--', linewidth=0.5)
+        ax.axhline(y=0, color='black', linewidth=0.8, alpha=0.7)
+        ax.axvline(x=0, color='black', linewidth=0.8, alpha=0.7)
+        self.title = ax.set_title("", fontsize=14, fontweight='bold', pad=15)
+        self.info = ax.text(0.02, 0.98, "", transform=ax.transAxes,
+                            fontsize=9, verticalalignment='top',
+                            bbox=dict(boxstyle='round', facecolor='wheat', alpha=0.8))
+    
+    def render(self, series: PlotSeries, path: str) -> None:
+        """
+        Отрисовка одного ряда в файл path
+        """
+        x_values, y_values, a, b, title, summary = series
+        if len(x_values) != len(y_values):
+            raise ValueError(f"Длины массивов не совпадают: X={len(x_values)}, Y={len(y_values)}")
+        
+        ax = self.axes
+        n_computed = len(x_values)
+        plot_x, plot_y = decimation.decimate(x_values, y_values,
+                                             self.max_points, self.decimation_method)
+        n_drawn = len(plot_x)
+        
+        self.line.set_data(plot_x, plot_y)
+        show_markers = n_drawn <= self.marker_threshold
+        if show_markers:
+            self.markers.set_data(plot_x, plot_y)
+        else:
+            self.markers.set_data([], [])
+        self.markers.set_visible(show_markers)
+        
+        # Область под графиком зависит от формы данных, поэтому пересоздается
+        if self.fill is not None:
+            self.fill.remove()
+        self.fill = ax.fill_between(plot_x, plot_y, alpha=0.2, color='blue')
+        
+        caption = f"Интервал: [{a:.2f}, {b:.2f}]"
+        if n_drawn < n_computed:
+            caption += f", отрисовано {n_drawn} из {n_computed} точек"
+        self.title.set_text(f"{title}\n{caption}")
+        
+        info_text = f"Количество точек: {n_computed}\n"
+        if n_drawn < n_computed:
+            info_text += f"Отрисовано точек: {n_drawn}\n"
+        # Экстремумы всего ряда: при LTTB или уже прореженных данных
+        # отрисованные точки могут их не содержать
+        if summary is None:
+            summary = summarize(y_values)
+        if summary.valid_count:
+            info_text += f"min(y) = {summary.min:.4f}\n"
+            info_text += f"max(y) = {summary.max:.4f}"
+        self.info.set_text(info_text)
+        
+        ax.set_xlim(a - (b - a) * 0.05, b + (b - a) * 0.05)
+        ax.relim()
+        ax.autoscale_view(scalex=False)
+        ax.legend(handles=[self.line, self.markers] if show_markers else [self.line],
+                  loc='best', fontsize=10, framealpha=0.9)
+        
+        self.figure.savefig(path)
+
+
+def _render_chunk(series_list: List[PlotSeries], paths: List[str], options: dict) -> None:
+    renderer = HeadlessRenderer(**options)
+    for series, path in zip(series_list, paths):
+        renderer.render(series, path)
+
 
+def render_batch(series_list: Sequence[PlotSeries], paths: Sequence[str],
+                 workers: int = 1, **options) -> None:
+    """
+    Пакетная отрисовка рядов в файлы за один проход
+    
+    Args:
+        series_list: Ряды для отрисовки
+        paths: Пути к файлам (по одному на ряд)
+        workers: Количество процессов; ряды делятся между ними поровну
+        **options: Параметры HeadlessRenderer (figsize, dpi, max_points, ...)
+    """
+    if len(series_list) != len(paths):
+        raise ValueError(f"Количество рядов и путей не совпадает: "
+                         f"{len(series_list)} и {len(paths)}")
+    if workers <= 0:
+        raise ValueError(f"Количество процессов должно быть положительным, получено {workers}")
+    
+    workers = min(workers, len(series_list))
+    if workers <= 1:
+        _render_chunk(list(series_list), list(paths), options)
+        return
+    
+    from concurrent.futures import ProcessPoolExecutor
+    
+    # Каждый процесс создает одну фигуру и рисует свою часть рядов
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = [pool.submit(_render_chunk, list(series_list[i::workers]),
+                               list(paths[i::workers]), options)
+                   for i in range(workers)]
+        for future in futures:
+            future.result()
 
-def print_xy_table(x_values: List[float], y_values: List[float],
+
+def _format_number(num: float, precision: int) -> str:
+    """
+    Форматирование числа для таблицы
+    """
+    if abs(num) < 1e-10:
+        num = 0.0
+    
+    # Для очень больших/маленьких чисел используем научную нотацию
+    if abs(num) > 1e6 or (0 < abs(num) < 1e-6):
+        return f"{num:.{precision}e}"
+    else:
+        return f"{num:.{precision}f}"
+
+
+def _table_indices(n: int, max_rows: int) -> List[int]:
+    """
+    Индексы строк, выводимых в сокращенной таблице
+    """
+    if n <= max_rows:
+        return list(range(n))
+    
+    # Выводим начало, середину и конец
+    start_count = max_rows // 3
+    end_count = max_rows // 3
+    middle_count = max_rows - start_count - end_count
+    
+    return (list(range(start_count)) + 
+            [n // 2 + i - middle_count // 2 for i in range(middle_count)] +
+            list(range(n - end_count, n)))
+
+
+def _value_range(values, chunk_size: int = 65536) -> Tuple[float, float]:
+    """
+    Минимум и максимум без учета NaN
+    
+    Значения просматриваются порциями по chunk_size, поэтому для массива,
+    отображенного в память, в памяти находится не больше одной порции
+    (np.fmin/np.fmax пропускают NaN без копии отфильтрованного массива).
+    """
+    lows, highs = [float('nan')], [float('nan')]
+    for start in range(0, len(values), chunk_size):
+        chunk = np.asarray(values[start:start + chunk_size], dtype=float)
+        lows.append(np.fmin.reduce(chunk))
+        highs.append(np.fmax.reduce(chunk))
+    return float(np.fmin.reduce(lows)), float(np.fmax.reduce(highs))
+
+
+def _column_width(samples: Sequence[str], reserve: str = "") -> int:
+    """
+    Ширина колонки по отформатированным значениям
+    
+    reserve - дополнительный образец, место под который нужно оставить
+    (например, запись в научной нотации для строк, которые не просматривались).
+    """
+    return max(max(len(sample) for sample in samples), len(reserve), len("X"), len("Y")) + 4
+
+
+def _table_columns(x_values, y_values,
+                   labels: Optional[Sequence[str]]) -> Tuple[Sequence[float], list, Optional[tuple]]:
+    """
+    Колонки таблицы: значения X, список (заголовок, значения Y, статистика)
+    и диапазон X, если он известен без просмотра данных
+    
+    Принимаются ряд Series, список рядов Series на общей сетке, пара
+    векторов X, Y или вектор X со списком векторов Y.
+    """
+    if isinstance(x_values, (list, tuple)) and x_values and isinstance(x_values[0], Series):
+        series_list = list(x_values)
+        if y_values is not None:
+            raise ValueError("Для рядов Series значения Y не передаются отдельно")
+        first = series_list[0]
+        for other in series_list[1:]:
+            if len(other) != len(first) or (len(first) and (other.x[0] != first.x[0]
+                                                            or other.x[-1] != first.x[-1])):
+                raise ValueError("Ряды таблицы должны быть вычислены на одной сетке")
+        x_values = first.x
+        y_columns = [(series.y, series.summary) for series in series_list]
+        x_range = (first.x[0], first.x[-1]) if len(first) else None
+    elif isinstance(x_values, Series):
+        y_columns = [(x_values.y, x_values.summary)]
+        x_range = (x_values.x[0], x_values.x[-1]) if len(x_values) else None
+        x_values, _ = _series_arrays(x_values, y_values)
+    elif y_values is not None and len(y_values) and hasattr(y_values[0], '__len__'):
+        for column in y_values:
+            _series_arrays(x_values, column)
+        y_columns = [(column, summarize(column)) for column in y_values]
+        x_range = None
+    else:
+        x_values, y_values = _series_arrays(x_values, y_values)
+        y_columns = [(y_values, summarize(y_values))]
+        x_range = None
+    
+    if labels is None:
+        labels = ["Y"] if len(y_columns) == 1 else [f"Y{i}" for i in range(1, len(y_columns) + 1)]
+    elif len(labels) != len(y_columns):
+        raise ValueError(f"Количество заголовков ({len(labels)}) не совпадает "
+                         f"с количеством колонок Y ({len(y_columns)})")
+    return x_values, [(label, y, summary) for label, (y, summary) in zip(labels, y_columns)], x_range
+
+
+def print_xy_table(x_values: Union[Series, Sequence[Series], List[float]],
+                   y_values: Optional[List[float]] = None,
                    precision: int = 4,
-                   max_rows: int = 15) -> None:
+                   max_rows: int = 15,
+                   labels: Optional[Sequence[str]] = None) -> None:
     """
-    Вывод таблицы значений X, Y в две колонки
+    Вывод таблицы значений X, Y в две или больше колонок
+    
+    Форматируются только выводимые строки, а вся таблица
+    записывается в stdout одной операцией. Несколько функций на одной
+    сетке выводятся общей колонкой X и колонкой Y для каждой функции.
     
     Args:
-        x_values: Список значений X
-        y_values: Список значений Y
+        x_values: Список значений X, ряд Series или список рядов на одной сетке
+        y_values: Список значений Y или список таких списков
+            (не задается для рядов Series)
         precision: Количество знаков после запятой
         max_rows: Максимальное количество строк для вывода
+        labels: Заголовки колонок Y (по умолчанию Y или Y1, Y2, ...)
     """
     
-    if len(x_values) != len(y_values):
-        raise ValueError(f"Длины массивов не совпадают: X={len(x_values)}, Y={len(y_values)}")
+    x_values, columns, x_range = _table_columns(x_values, y_values, labels)
     
     if len(x_values) == 0:
         print("Таблица пуста")
         return
     
-    # Форматирование чисел
-    def format_number(num: float) -> str:
-        if abs(num) < 1e-10:
-            num = 0.0
-        
-        # Для очень больших/маленьких чисел используем научную нотацию
-        if abs(num) > 1e6 or (0 < abs(num) < 1e-6):
-            return f"{num:.{precision}e}"
-        else:
-            return f"{num:.{precision}f}"
-    
-    # Определяем ширину колонок
-    x_str_list = [format_number(x) for x in x_values]
-    y_str_list = [format_number(y) for y in y_values]
+    n = len(x_values)
+    indices = _table_indices(n, max_rows)
+    rows = [(i, _format_number(x_values[i], precision),
+             [_format_number(y[i], precision) for _, y, _ in columns])
+            for i in indices]
     
-    col_width = max(
-        max(len(s) for s in x_str_list),
-        max(len(s) for s in y_str_list),
-        len("X"), len("Y")
-    ) + 4
+    # Статистика считается один раз и используется и для ширины колонок;
+    # у рядов Series она готова, а X упорядочены по возрастанию
+    x_min, x_max = x_range if x_range is not None else _value_range(x_values)
+    x_stats = [_format_number(x_min, precision), _format_number(x_max, precision)]
+    y_stats = [(_format_number(summary.min, precision), _format_number(summary.max, precision))
+               for _, _, summary in columns]
     
-    total_width = col_width * 2 + 5
+    col_width = _column_width([x_str for _, x_str, _ in rows] +
+                              [s for _, _, y_strs in rows for s in y_strs] +
+                              x_stats + [s for pair in y_stats for s in pair] +
+                              [label for label, _, _ in columns])
+    n_columns = len(columns) + 1
+    total_width = col_width * n_columns + 3 * (n_columns - 1) + 2
     
     # Вывод заголовка
-    print("\n" + "=" * total_width)
-    print(f"{'ТАБЛИЦА ЗНАЧЕНИЙ':^{total_width}}")
-    print("=" * total_width)
-    print(f"{'X':^{col_width}} | {'Y':^{col_width}}")
-    print("-" * col_width + "-+-" + "-" * col_width)
-    
-    # Определяем, какие строки выводить
-    n = len(x_values)
-    if n <= max_rows:
-        indices = list(range(n))
-    else:
-        # Выводим начало, середину и конец
-        start_count = max_rows // 3
-        end_count = max_rows // 3
-        middle_count = max_rows - start_count - end_count
-        
-        indices = (list(range(start_count)) + 
-                  [n // 2 + i - middle_count // 2 for i in range(middle_count)] +
-                  list(range(n - end_count, n)))
+    lines = ["",
+             "=" * total_width,
+             f"{'ТАБЛИЦА ЗНАЧЕНИЙ':^{total_width}}",
+             "=" * total_width,
+             " | ".join(f"{label:^{col_width}}" for label in ["X"] + [c[0] for c in columns]),
+             "-+-".join(["-" * col_width] * n_columns)]
     
     # Вывод строк
+    ellipsis = " | ".join(f"{'···':^{col_width}}" for _ in range(n_columns))
     prev_index = -1
-    for i in indices:
+    for i, x_str, y_strs in rows:
         if prev_index != -1 and i > prev_index + 1:
             # Пропущенные строки
-            ellipsis_x = "···"
-            ellipsis_y = "···"
-            print(f"{ellipsis_x:^{col_width}} | {ellipsis_y:^{col_width}}")
+            lines.append(ellipsis)
         
-        x_str = format_number(x_values[i])
-        y_str = format_number(y_values[i])
-        print(f"{x_str:>{col_width}} | {y_str:>{col_width}}")
+        lines.append(" | ".join(f"{s:>{col_width}}" for s in [x_str] + y_strs))
         prev_index = i
     
-    print("=" * total_width)
+    lines.append("=" * total_width)
     
     # Статистика
-    print(f"\n📊 СТАТИСТИКА:")
-    print(f"   Всего точек: {n}")
-    print(f"   X ∈ [{format_number(min(x_values))}, {format_number(max(x_values))}]")
-    print(f"   Y ∈ [{format_number(min(y_values))}, {format_number(max(y_values))}]")
+    lines.append(f"\n📊 СТАТИСТИКА:")
+    lines.append(f"   Всего точек: {n}")
+    lines.append(f"   X ∈ [{x_stats[0]}, {x_stats[1]}]")
+    for (label, _, summary), (y_min, y_max) in zip(columns, y_stats):
+        lines.append(f"   {label} ∈ [{y_min}, {y_max}]")
+        if summary.valid_count:
+            lines.append(f"   Среднее {label}: {_format_number(summary.mean, precision)}, "
+                         f"σ = {_format_number(summary.std, precision)}")
+        if summary.nan_count:
+            lines.append(f"   Некорректных значений {label}: {summary.nan_count}")
     
     if n > 1:
         step = x_values[1] - x_values[0]
-        print(f"   Шаг по X: {format_number(step)}")
+        lines.append(f"   Шаг по X: {_format_number(step, precision)}")
+    
+    sys.stdout.write("\n".join(lines) + "\n")
+
 
+def write_xy_table(path: str, x_values: Sequence[float], y_values: Sequence[float],
+                   precision: int = 4,
+                   chunk_size: int = 65536) -> None:
+    """
+    Потоковая запись полной таблицы X, Y в файл
+    
+    Строки форматируются и записываются порциями по chunk_size, поэтому
+    в памяти одновременно находится не больше одной порции строк.
+    
+    Args:
+        path: Путь к файлу
+        x_values: Значения X (список, массив или отображенный в память массив)
+        y_values: Значения Y
+        precision: Количество знаков после запятой
+        chunk_size: Количество строк, записываемых за одну операцию
+    """
+    
+    if len(x_values) != len(y_values):
+        raise ValueError(f"Длины массивов не совпадают: X={len(x_values)}, Y={len(y_values)}")
+    if chunk_size <= 0:
+        raise ValueError(f"Размер порции должен быть положительным, получен {chunk_size}")
+    
+    n = len(x_values)
+    stats = [_format_number(v, precision)
+             for v in (*_value_range(x_values, chunk_size), *_value_range(y_values, chunk_size))]
+    # Самые длинные записи в фиксированной нотации дают минимум и максимум,
+    # а научная нотация имеет постоянную длину, поэтому данные не просматриваются
+    col_width = _column_width(stats, reserve=f"{-1.0e-100:.{precision}e}")
+    
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write(f"{'X':^{col_width}} | {'Y':^{col_width}}\n")
+        f.write("-" * col_width + "-+-" + "-" * col_width + "\n")
+        
+        for start in range(0, n, chunk_size):
+            stop = min(start + chunk_size, n)
+            f.write("".join(
+                f"{_format_number(x, precision):>{col_width}} | {_format_number(y, precision):>{col_width}}\n"
+                for x, y in zip(x_values[start:stop], y_values[start:stop])))